@@ -0,0 +1,82 @@
+"""
+Per-call overhead of the LLMAgent lifecycle: rebuilding the model, client and
+Agent on every call versus reusing a persistent (opened) agent.
+
+Usage:
+    python -m benchmarks.agent_lifecycle --calls 200
+    python -m benchmarks.agent_lifecycle --calls 50 --live --model mistral:7b-instruct
+
+Without `--live` only the setup cost is measured (no request is sent). With
+`--live`, `generate` is called against `--base-url` in both modes so the effect
+of HTTP keep-alive is included.
+"""
+import time
+import asyncio
+import argparse
+import statistics
+
+from schemas.config import LLMConfig
+from llm.agent import LLMAgent
+
+
+SYSTEM_PROMPT = "You are an objective evaluator."
+USER_PROMPT = "Reply with the single word: Pass"
+
+
+def summarize(label, durations):
+    """Print mean / p50 / max per-call time in milliseconds."""
+    ms = [d * 1000 for d in durations]
+    print(f"{label:<28} mean={statistics.mean(ms):8.3f}ms  "
+          f"p50={statistics.median(ms):8.3f}ms  max={max(ms):8.3f}ms")
+    return statistics.mean(ms)
+
+
+async def time_setup(agent, calls):
+    """Time entering the agent context, i.e. everything but the request itself."""
+    durations = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        async with agent(SYSTEM_PROMPT):
+            pass
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+async def time_generate(agent, calls):
+    """Time full `generate` calls against a live endpoint."""
+    durations = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        await agent.generate(USER_PROMPT, system_prompt=SYSTEM_PROMPT)
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+async def main(args):
+    config = LLMConfig(
+        name=args.model,
+        base_url=args.base_url,
+        platform=args.platform,
+        max_tokens=args.max_tokens,
+    )
+    timer = time_generate if args.live else time_setup
+    kind = "generate" if args.live else "setup"
+
+    per_call = LLMAgent(config, result_type=str)
+    before = summarize(f"per-call {kind}", await timer(per_call, args.calls))
+
+    async with LLMAgent(config, result_type=str) as persistent:
+        after = summarize(f"persistent {kind}", await timer(persistent, args.calls))
+
+    print(f"{'overhead saved per call':<28} {before - after:8.3f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--calls", type=int, default=100)
+    parser.add_argument("--live", action="store_true", help="send real requests")
+    parser.add_argument("--model", default="mistral:7b-instruct")
+    parser.add_argument("--base-url", default="http://localhost:11434/v1")
+    parser.add_argument("--platform", default="ollama", choices=["ollama", "openai"])
+    parser.add_argument("--max-tokens", type=int, default=5)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,84 @@
+"""
+Judge calls and tokens saved by packing K questions per call, and how often the
+packed verdicts agree with one question per call.
+
+One question per call (prefix-stable template) is the reference; every pack
+size in `--pack-sizes` is then run on the same items. Tokens are estimated
+from prompt and output lengths (~4 characters per token).
+
+Usage:
+    python -m benchmarks.packed_questions --model mistral:7b-instruct --responses 3 --questions 10 --pack-sizes 2 5 10
+"""
+import asyncio
+import argparse
+
+from example_code import system_prompt_template
+from benchmarks.prompt_prefix import make_items
+from llm.agent import LLMAgent
+from llm.evaluator import evaluate_many, evaluate_packed
+from llm.prompts import PREFIX_STABLE_USER_PROMPT_TEMPLATE
+from llm.rate_limit import estimate_tokens
+from schemas.config import LLMConfig
+
+
+class CountingAgent:
+    """Wrap an agent to count calls and estimated tokens."""
+
+    def __init__(self, agent):
+        self.agent = agent
+        self.config = agent.config
+        self.calls = 0
+        self.tokens = 0
+
+    async def generate(self, prompt, system_prompt=None, **kwargs):
+        response = await self.agent.generate(prompt, system_prompt=system_prompt, use_cache=False)
+        self.calls += 1
+        self.tokens += estimate_tokens(prompt) + estimate_tokens(system_prompt)
+        if hasattr(response, "data"):
+            self.tokens += estimate_tokens(str(response.data))
+        return response
+
+
+def verdicts(results):
+    return {r.index: r.evaluation["verdict"] if r.ok else None for r in results}
+
+
+async def main(args):
+    config = LLMConfig(name=args.model, base_url=args.base_url, max_tokens=300 * max(args.pack_sizes), timeout=600)
+    items = make_items(args.responses, args.questions)
+
+    async with LLMAgent(config, result_type=str) as agent:
+        await agent.warmup()
+        counter = CountingAgent(agent)
+        reference = verdicts([r async for r in evaluate_many(
+            counter, items, PREFIX_STABLE_USER_PROMPT_TEMPLATE, system_prompt_template,
+            max_concurrency=args.concurrency
+        )])
+        print(f"{'K=1 (reference)':<16} calls={counter.calls:5d}  tokens~{counter.tokens:8d}  "
+              f"parsed={sum(v is not None for v in reference.values())}/{len(items)}")
+        baseline_calls, baseline_tokens = counter.calls, counter.tokens
+
+        for pack_size in args.pack_sizes:
+            counter = CountingAgent(agent)
+            packed = verdicts([r async for r in evaluate_packed(
+                counter, items, system_prompt=system_prompt_template,
+                max_concurrency=args.concurrency, pack_size=pack_size
+            )])
+            compared = [i for i, v in reference.items() if v is not None and packed[i] is not None]
+            agreement = sum(reference[i] == packed[i] for i in compared) / len(compared) if compared else 0.0
+            print(f"{f'K={pack_size}':<16} calls={counter.calls:5d}  tokens~{counter.tokens:8d}  "
+                  f"parsed={sum(v is not None for v in packed.values())}/{len(items)}  "
+                  f"calls saved={1 - counter.calls / baseline_calls:6.1%}  "
+                  f"tokens saved={1 - counter.tokens / baseline_tokens:6.1%}  "
+                  f"verdict agreement={agreement:6.1%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--model", default="mistral:7b-instruct")
+    parser.add_argument("--base-url", default="http://localhost:11434/v1")
+    parser.add_argument("--responses", type=int, default=3)
+    parser.add_argument("--questions", type=int, default=10)
+    parser.add_argument("--pack-sizes", type=int, nargs="+", default=[2, 5, 10])
+    parser.add_argument("--concurrency", type=int, default=4)
+    asyncio.run(main(parser.parse_args()))
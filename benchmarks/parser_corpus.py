@@ -0,0 +1,173 @@
+"""
+Corpus of realistic raw judge outputs for parser benchmarks.
+
+Every case is a dict {"format", "raw", "expected"} where "expected" holds the
+verdict and confidence encoded in the output, or None when the output is cut
+off before they were written and nothing should be recovered.
+
+Formats:
+    clean_json      JSON object, compact or indented, keys in any order
+    single_quoted   Python dict repr, as some models print it
+    fenced          ```json fenced object, sometimes introduced by a sentence
+    prose_blob      JSON object embedded between sentences of prose
+    sections        "Reasoning: / Verdict: / Confidence:" text sections
+    truncated       JSON object cut off at the token limit
+    long_reasoning  multi-kilobyte reasoning before the sections or a JSON object
+
+Usage:
+    python -m benchmarks.parser_corpus --per-format 200 --output corpus.jsonl
+"""
+import json
+import random
+import argparse
+
+
+FORMATS = ("clean_json", "single_quoted", "fenced", "prose_blob", "sections", "truncated", "long_reasoning")
+
+SENTENCES = (
+    "The student response addresses the main point of the instruction.",
+    "The description mentions the bottle's capacity and material.",
+    "It does not state how long drinks stay cold, which the question asks about.",
+    "The tone is appropriate for a product page.",
+    "The response stays within the requested length of three sentences.",
+    "Key features such as the leak-proof lid are listed clearly.",
+    "The answer includes an unsupported claim about \"lifetime\" durability.",
+    "There is no mention of the price, but the question doesn't require it.",
+    "The student didn't follow the requested bullet-point format.",
+    "All statements are consistent with the provided product specification.",
+    "The response repeats the same benefit twice, which adds no information.",
+    "Spelling and grammar are correct throughout.",
+)
+
+INTROS = (
+    "Here is my evaluation:",
+    "Based on the assessment question, my evaluation is below.",
+    "Sure! I've evaluated the student response.",
+    "After reviewing the instruction and the response:",
+)
+
+OUTROS = (
+    "Let me know if you need more details.",
+    "I hope this evaluation is helpful.",
+    "This concludes the evaluation.",
+)
+
+
+def _evaluation(rng, sentences):
+    return {
+        "reasoning": " ".join(rng.choice(SENTENCES) for _ in range(sentences)),
+        "verdict": rng.choice(["Pass", "Fail"]),
+        "confidence": rng.choice(["High", "High", "Medium", "Low"]),
+    }
+
+
+def _json(rng, evaluation):
+    keys = list(evaluation)
+    rng.shuffle(keys)
+    return json.dumps({key: evaluation[key] for key in keys}, indent=rng.choice([None, 2, 4]))
+
+
+def _sections(rng, evaluation):
+    style = rng.choice(["plain", "bold", "bullets"])
+    if style == "bold":
+        return (f"**Reasoning:** {evaluation['reasoning']}\n\n"
+                f"**Verdict:** {evaluation['verdict']}\n\n"
+                f"**Confidence:** {evaluation['confidence']}")
+    if style == "bullets":
+        return (f"- Reasoning: {evaluation['reasoning']}\n"
+                f"- Verdict: {evaluation['verdict']}\n"
+                f"- Confidence: {evaluation['confidence']}")
+    return (f"Reasoning: {evaluation['reasoning']}\n"
+            f"Verdict: {evaluation['verdict']}\n"
+            f"Confidence: {evaluation['confidence']}")
+
+
+def _long_reasoning(rng):
+    paragraphs = []
+    for step in range(rng.randint(6, 20)):
+        paragraphs.append(f"{step + 1}. " + " ".join(rng.choice(SENTENCES) for _ in range(rng.randint(3, 6))))
+    return "Let me think through this step by step.\n\n" + "\n\n".join(paragraphs)
+
+
+def make_case(rng, output_format):
+    """
+    Generate one judge output of the given format.
+
+    Args:
+        rng: Random generator of the corpus
+        output_format: One of FORMATS
+
+    Returns:
+        dict: {"format", "raw", "expected"}
+    """
+    evaluation = _evaluation(rng, rng.randint(1, 4))
+    expected = {"verdict": evaluation["verdict"], "confidence": evaluation["confidence"]}
+
+    if output_format == "clean_json":
+        raw = _json(rng, evaluation)
+    elif output_format == "single_quoted":
+        raw = repr(evaluation)
+    elif output_format == "fenced":
+        raw = f"```json\n{json.dumps(evaluation, indent=2)}\n```"
+        if rng.random() < 0.5:
+            raw = f"{rng.choice(INTROS)}\n\n{raw}"
+    elif output_format == "prose_blob":
+        raw = f"{rng.choice(INTROS)}\n{_json(rng, evaluation)}\n{rng.choice(OUTROS)}"
+    elif output_format == "sections":
+        raw = _sections(rng, evaluation)
+    elif output_format == "truncated":
+        text = json.dumps(evaluation)
+        end = text.index(evaluation["confidence"], text.index('"confidence"')) + len(evaluation["confidence"])
+        if rng.random() < 0.5:
+            # Cut after the confidence level, only the closing quote and brace are missing
+            raw = text[:end + rng.randint(0, 1)]
+        else:
+            # Cut somewhere before the confidence level was written
+            raw = text[:rng.randint(1, text.index('"confidence"') + len('"confidence": "'))]
+            expected = None
+    elif output_format == "long_reasoning":
+        evaluation["reasoning"] = _long_reasoning(rng)
+        if rng.random() < 0.5:
+            raw = _sections(rng, evaluation)
+        else:
+            summary = dict(evaluation, reasoning=evaluation["reasoning"].split("\n\n")[-1].split(". ", 1)[1])
+            raw = f"{evaluation['reasoning']}\n\nFinal evaluation:\n{json.dumps(summary)}"
+    else:
+        raise ValueError(f"Unknown output format: {output_format}")
+    return {"format": output_format, "raw": raw, "expected": expected}
+
+
+def build_corpus(per_format=100, seed=0, formats=FORMATS):
+    """
+    Generate a deterministic corpus.
+
+    Args:
+        per_format: Number of cases per format
+        seed: Random seed
+        formats: Formats to include
+
+    Returns:
+        list: Cases, grouped by format
+    """
+    rng = random.Random(seed)
+    return [make_case(rng, output_format) for output_format in formats for _ in range(per_format)]
+
+
+def load_corpus(path):
+    """Read cases from a JSONL file, e.g. captured judge outputs labelled by hand."""
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--per-format", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="corpus.jsonl")
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.per_format, args.seed)
+    with open(args.output, "w") as f:
+        for case in corpus:
+            f.write(json.dumps(case) + "\n")
+    print(f"Wrote {len(corpus)} cases to {args.output}")
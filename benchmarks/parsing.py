@@ -0,0 +1,121 @@
+"""
+Cost and recall of the judge output parsers on the parser corpus.
+
+Each parser in `schemas/evaluation.py` and `utils/llm_output_parser.py` runs
+on every case of the corpus (benchmarks.parser_corpus, or a JSONL file of
+captured outputs). Per parser and format it reports:
+
+    ok      verdict and confidence match the expected ones (or nothing was
+            returned for an unrecoverable output)
+    wrong   an evaluation was returned with a different verdict or confidence
+    us      mean time per call in microseconds (best of `--repeat` passes)
+
+Usage:
+    python -m benchmarks.parsing --per-format 200
+    python -m benchmarks.parsing --corpus captured.jsonl --save parsing.json
+"""
+import io
+import json
+import time
+import argparse
+import contextlib
+
+from schemas.evaluation import EvaluationResponse, IncrementalEvaluationParser
+from utils import llm_output_parser
+from benchmarks.parser_corpus import FORMATS, build_corpus, load_corpus
+
+
+def incremental(raw, chunk_size=16):
+    """Feed the output in fixed-size chunks, as a stream would deliver it."""
+    parser = IncrementalEvaluationParser()
+    for start in range(0, len(raw), chunk_size):
+        if parser.feed(raw[start:start + chunk_size]) is not None:
+            break
+    return parser.result
+
+
+PARSERS = {
+    "EvaluationResponse.parse_raw_evaluation": EvaluationResponse.parse_raw_evaluation,
+    "EvaluationResponse._parse_json": EvaluationResponse._parse_json,
+    "EvaluationResponse._extract_from_json_blob": EvaluationResponse._extract_from_json_blob,
+    "EvaluationResponse._extract_from_unstructured_text": EvaluationResponse._extract_from_unstructured_text,
+    "IncrementalEvaluationParser": incremental,
+    "llm_output_parser.parse_raw_evaluation": llm_output_parser.parse_raw_evaluation,
+    "llm_output_parser.extract_evaluation_from_json_blob": llm_output_parser.extract_evaluation_from_json_blob,
+    "llm_output_parser.extract_evaluation_from_unstructured_text": llm_output_parser.extract_evaluation_from_unstructured_text,
+}
+
+
+def call(parser, raw):
+    """Run a parser, treating exceptions like a failed parse."""
+    try:
+        return parser(raw)
+    except Exception:
+        return None
+
+
+def outcome(result, expected):
+    """Classify a parse result as "ok", "wrong" or "missed"."""
+    parsed = None
+    if isinstance(result, dict) and result.get("reasoning") and result.get("verdict") and result.get("confidence"):
+        parsed = {"verdict": result["verdict"], "confidence": result["confidence"]}
+    if parsed == expected:
+        return "ok"
+    return "missed" if parsed is None else "wrong"
+
+
+def measure(parser, cases, repeat):
+    """Return (outcome counts, mean seconds per call) of a parser on cases."""
+    counts = {"ok": 0, "wrong": 0, "missed": 0}
+    best = float("inf")
+    # The utils parsers print on failure; keep the report readable and the timing fair
+    with contextlib.redirect_stdout(io.StringIO()):
+        for case in cases:
+            counts[outcome(call(parser, case["raw"]), case["expected"])] += 1
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for case in cases:
+                call(parser, case["raw"])
+            best = min(best, time.perf_counter() - start)
+    return counts, best / len(cases)
+
+
+def main(args):
+    corpus = load_corpus(args.corpus) if args.corpus else build_corpus(args.per_format, args.seed)
+    formats = [f for f in FORMATS if any(c["format"] == f for c in corpus)]
+    formats += sorted({c["format"] for c in corpus} - set(formats))
+    by_format = {f: [c for c in corpus if c["format"] == f] for f in formats}
+    sizes = {f: sum(len(c["raw"]) for c in cases) / len(cases) for f, cases in by_format.items()}
+    print(f"{len(corpus)} cases: " + ", ".join(f"{f} ({len(by_format[f])}, ~{sizes[f]:.0f} chars)" for f in formats))
+
+    results = {}
+    for name, parser in PARSERS.items():
+        if args.parsers and not any(p in name for p in args.parsers):
+            continue
+        print(f"\n{name}")
+        results[name] = {}
+        for output_format, cases in by_format.items():
+            counts, seconds = measure(parser, cases, args.repeat)
+            results[name][output_format] = {
+                "ok_rate": counts["ok"] / len(cases),
+                "wrong_rate": counts["wrong"] / len(cases),
+                "us_per_call": seconds * 1e6,
+            }
+            print(f"  {output_format:<16} ok={counts['ok'] / len(cases):6.1%}  "
+                  f"wrong={counts['wrong'] / len(cases):6.1%}  us={seconds * 1e6:9.2f}")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"cases": {f: len(c) for f, c in by_format.items()}, "results": results}, f, indent=2)
+        print(f"\nSaved results to {args.save}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--corpus", help="JSONL corpus file, defaults to a generated corpus")
+    parser.add_argument("--per-format", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--parsers", nargs="+", help="Only run parsers whose name contains one of these")
+    parser.add_argument("--save", help="Write results to this JSON file")
+    main(parser.parse_args())
@@ -0,0 +1,99 @@
+"""
+Prompt-eval time per judge call with the original prompt layout versus the
+prefix-stable layout scheduled response by response.
+
+Requests go to the Ollama native chat API, which reports the number of prompt
+tokens actually evaluated and the time spent on them (tokens served from the
+KV cache are not re-evaluated). Only one token is generated per call.
+
+Usage:
+    python -m benchmarks.prompt_prefix --model mistral:7b-instruct --responses 4 --questions 5
+"""
+import asyncio
+import argparse
+import statistics
+
+import httpx
+
+from example_code import (
+    assessment_question,
+    student_instruction,
+    student_response,
+    system_prompt_template,
+    user_prompt_template,
+)
+from llm.agent import LLMAgentFactory
+from llm.prompts import PREFIX_STABLE_USER_PROMPT_TEMPLATE, group_by_response
+from schemas.config import LLMConfig
+from schemas.evaluation import EvaluationItem
+
+
+def make_items(responses, questions):
+    """Items in question-major order, as produced by looping over questions first."""
+    return [
+        EvaluationItem(
+            assessment_question=f"Question {q + 1}: {assessment_question}",
+            student_instruction=student_instruction,
+            student_response=f"[Response {r + 1}] {student_response}",
+        )
+        for q in range(questions)
+        for r in range(responses)
+    ]
+
+
+async def prompt_eval(client, config, prompt):
+    """Send one prompt and return (evaluated prompt tokens, prompt eval seconds)."""
+    response = await client.post(
+        f"{LLMAgentFactory.native_base_url(config)}/api/chat",
+        json={
+            "model": config.name,
+            "messages": [
+                {"role": "system", "content": system_prompt_template},
+                {"role": "user", "content": prompt},
+            ],
+            "stream": False,
+            "options": {"num_predict": 1, "temperature": 0},
+        },
+        timeout=config.timeout,
+    )
+    response.raise_for_status()
+    body = response.json()
+    return body.get("prompt_eval_count", 0), body.get("prompt_eval_duration", 0) / 1e9
+
+
+async def run(client, config, prompts):
+    counts, durations = [], []
+    for prompt in prompts:
+        count, duration = await prompt_eval(client, config, prompt)
+        counts.append(count)
+        durations.append(duration)
+    return counts, durations
+
+
+def report(label, counts, durations):
+    print(f"{label:<24} prompt tokens evaluated/call={statistics.mean(counts):8.1f}  "
+          f"prompt eval/call={statistics.mean(durations) * 1000:8.1f}ms")
+
+
+async def main(args):
+    config = LLMConfig(name=args.model, base_url=args.base_url, timeout=300)
+    items = make_items(args.responses, args.questions)
+
+    original = [item.format_prompt(user_prompt_template) for item in items]
+    grouped = [item for group in group_by_response(enumerate(items)) for _, item in group]
+    prefix_stable = [item.format_prompt(PREFIX_STABLE_USER_PROMPT_TEMPLATE) for item in grouped]
+
+    async with httpx.AsyncClient() as client:
+        # Load the model so the first measured call does not include it
+        await prompt_eval(client, config, "ping")
+        report("original layout", *await run(client, config, original))
+        report("prefix-stable, grouped", *await run(client, config, prefix_stable))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--model", default="mistral:7b-instruct")
+    parser.add_argument("--base-url", default="http://localhost:11434/v1")
+    parser.add_argument("--responses", type=int, default=4)
+    parser.add_argument("--questions", type=int, default=5)
+    asyncio.run(main(parser.parse_args()))
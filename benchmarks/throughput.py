@@ -0,0 +1,194 @@
+"""
+End-to-end throughput of the evaluation pipeline against the local mock server.
+
+Every run drives `evaluate_many`: prompt formatting, `LLMAgent.generate`,
+`EvaluationResponse.parse_raw_evaluation` and `ScoreSchemaRVC.get_score`. The
+sweep covers concurrency, batch size (items per run) and judge output length
+(words of reasoning generated by the mock). Each run reports items/s, p50/p95/
+p99 judge call latency, client CPU time per item and peak RSS. Every run
+happens in a fresh process, so the peak RSS is the run's own rather than the
+largest peak of the runs before it.
+
+Results can be saved as a JSON baseline and a later run compared against it;
+runs whose throughput, p99 latency or CPU per item got worse by more than
+`--tolerance` are flagged and the exit status is 1.
+
+Usage:
+    python -m benchmarks.throughput --concurrency 1 8 32 --batch-sizes 200 --output-lengths 20 200 --save baseline.json
+    python -m benchmarks.throughput --concurrency 1 8 32 --batch-sizes 200 --output-lengths 20 200 --compare baseline.json
+"""
+import sys
+import json
+import time
+import asyncio
+import argparse
+import platform
+import resource
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from llm.agent import LLMAgent
+from llm.evaluator import evaluate_many
+from llm.prompts import PREFIX_STABLE_USER_PROMPT_TEMPLATE
+from schemas.config import LLMConfig
+from tools.mock_server import MockServerConfig, serve_in_process
+from utils.stats import percentile
+
+
+# Metrics compared against a baseline, and whether higher is better
+COMPARED = {"items_per_second": True, "p99_latency": False, "cpu_per_item": False}
+
+
+class TimedAgent:
+    """Wrap an agent to record the latency of every judge call."""
+
+    def __init__(self, agent):
+        self.agent = agent
+        self.config = agent.config
+        self.latencies = []
+
+    async def generate(self, prompt, system_prompt=None, **kwargs):
+        start = time.perf_counter()
+        response = await self.agent.generate(prompt, system_prompt=system_prompt, **kwargs)
+        self.latencies.append(time.perf_counter() - start)
+        return response
+
+
+def make_items(batch_size):
+    return [
+        (f"Question {i}: Does the response follow the instruction?",
+         "Write a short product description for a reusable water bottle.",
+         f"[Response {i % 10}] This stainless steel bottle keeps drinks cold for 24 hours.")
+        for i in range(batch_size)
+    ]
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MiB (ru_maxrss is KiB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+async def run(config, concurrency, batch_size):
+    async with LLMAgent(config, result_type=str) as agent:
+        timed = TimedAgent(agent)
+        # Open connections before measuring
+        await agent.generate("warm up", use_cache=False)
+
+        items = make_items(batch_size)
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        results = [r async for r in evaluate_many(
+            timed, items, PREFIX_STABLE_USER_PROMPT_TEMPLATE, "You are an objective evaluator.",
+            max_concurrency=concurrency
+        )]
+        wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+
+    return {
+        "items_per_second": len(results) / wall,
+        "p50_latency": percentile(timed.latencies, 50),
+        "p95_latency": percentile(timed.latencies, 95),
+        "p99_latency": percentile(timed.latencies, 99),
+        "cpu_per_item": cpu / len(results),
+        "peak_rss_mb": peak_rss_mb(),
+        "ok_rate": sum(r.ok for r in results) / len(results),
+    }
+
+
+def run_isolated(config, concurrency, batch_size):
+    """Run one configuration in a fresh process (ru_maxrss never goes down within one)."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        return executor.submit(_run_sync, config, concurrency, batch_size).result()
+
+
+def _run_sync(config, concurrency, batch_size):
+    return asyncio.run(run(config, concurrency, batch_size))
+
+
+def report(params, metrics, flags=()):
+    print(f"c={params['concurrency']:<4d} n={params['batch_size']:<6d} out={params['output_length']:<5d} "
+          f"items/s={metrics['items_per_second']:8.1f}  p50={metrics['p50_latency'] * 1000:7.1f}ms  "
+          f"p95={metrics['p95_latency'] * 1000:7.1f}ms  p99={metrics['p99_latency'] * 1000:7.1f}ms  "
+          f"cpu/item={metrics['cpu_per_item'] * 1e6:7.0f}us  rss={metrics['peak_rss_mb']:6.1f}MiB  "
+          f"ok={metrics['ok_rate']:5.1%}" + ("  REGRESSION: " + ", ".join(flags) if flags else ""))
+
+
+def regressions(metrics, baseline, tolerance):
+    """Metrics that got worse than the baseline by more than the tolerance."""
+    flags = []
+    for name, higher_is_better in COMPARED.items():
+        old, new = baseline.get(name), metrics.get(name)
+        if not old or new is None:
+            continue
+        change = (new - old) / old
+        if (-change if higher_is_better else change) > tolerance:
+            flags.append(f"{name} {change:+.1%}")
+    return flags
+
+
+def main(args):
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = {
+                (r["params"]["concurrency"], r["params"]["batch_size"], r["params"]["output_length"]): r["metrics"]
+                for r in json.load(f)["results"]
+            }
+
+    results, regressed = [], False
+    for output_length in args.output_lengths:
+        server = serve_in_process(MockServerConfig(
+            port=args.port, output_format=args.output_format, output_tokens=output_length,
+            latency=args.latency, latency_sigma=args.latency_sigma,
+            tokens_per_second=args.tokens_per_second, slots=args.slots, seed=args.seed
+        ))
+        try:
+            config = LLMConfig(
+                name="mock", base_url=f"http://127.0.0.1:{args.port}/v1", platform="openai",
+                transport=args.transport, max_tokens=2 * output_length + 50, timeout=120
+            )
+            for concurrency in args.concurrency:
+                for batch_size in args.batch_sizes:
+                    params = {"concurrency": concurrency, "batch_size": batch_size, "output_length": output_length}
+                    metrics = run_isolated(config, concurrency, batch_size)
+                    key = (concurrency, batch_size, output_length)
+                    flags = regressions(metrics, baseline[key], args.tolerance) if key in baseline else []
+                    regressed = regressed or bool(flags)
+                    report(params, metrics, flags)
+                    results.append({"params": params, "metrics": metrics})
+        finally:
+            server.terminate()
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({
+                "meta": {
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "transport": args.transport,
+                    "mock": {"latency": args.latency, "latency_sigma": args.latency_sigma,
+                             "tokens_per_second": args.tokens_per_second, "slots": args.slots,
+                             "output_format": args.output_format, "seed": args.seed},
+                },
+                "results": results,
+            }, f, indent=2)
+        print(f"Saved {len(results)} results to {args.save}")
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[200])
+    parser.add_argument("--output-lengths", type=int, nargs="+", default=[20, 200])
+    parser.add_argument("--transport", choices=["pydantic_ai", "http"], default="pydantic_ai")
+    parser.add_argument("--output-format", choices=["json", "blob", "text", "mixed"], default="mixed")
+    parser.add_argument("--latency", type=float, default=0.02, help="Mock median seconds to first token")
+    parser.add_argument("--latency-sigma", type=float, default=0.3)
+    parser.add_argument("--tokens-per-second", type=float, default=2000.0)
+    parser.add_argument("--slots", type=int, default=0, help="Mock concurrent generations (0 = unlimited)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--port", type=int, default=18182)
+    parser.add_argument("--save", help="Write results to this JSON baseline file")
+    parser.add_argument("--compare", help="Flag regressions against this JSON baseline file")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="Relative change tolerated before flagging")
+    sys.exit(main(parser.parse_args()))
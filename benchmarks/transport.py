@@ -0,0 +1,68 @@
+"""
+Per-call client CPU time and latency of the pydantic_ai transport versus the
+direct HTTP transport (`LLMConfig.transport="http"`) on a plain-string judge.
+
+Requests go to the bundled mock server (tools.mock_server) started in a
+separate process with no latency, so the measured CPU time is the client's only.
+
+Usage:
+    python -m benchmarks.transport --calls 500 --concurrency 1
+"""
+import time
+import asyncio
+import argparse
+import statistics
+
+from llm.agent import LLMAgent
+from schemas.config import LLMConfig
+from tools.mock_server import MockServerConfig, serve_in_process
+
+
+async def measure(config, calls, concurrency):
+    """Return (client CPU seconds per call, per-call latencies)."""
+    latencies = []
+    async with LLMAgent(config, result_type=str) as agent:
+        for _ in range(10):
+            await agent.generate("warm up", system_prompt="You are an objective evaluator.")
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def call(i):
+            async with semaphore:
+                start = time.perf_counter()
+                await agent.generate(f"Evaluate item {i}", system_prompt="You are an objective evaluator.")
+                latencies.append(time.perf_counter() - start)
+
+        cpu_start = time.process_time()
+        await asyncio.gather(*(call(i) for i in range(calls)))
+        cpu = time.process_time() - cpu_start
+    return cpu / calls, latencies
+
+
+def report(label, cpu_per_call, latencies):
+    ms = sorted(latency * 1000 for latency in latencies)
+    print(f"{label:<14} cpu/call={cpu_per_call * 1e6:8.1f}us  "
+          f"p50={statistics.median(ms):7.3f}ms  p99={ms[int(0.99 * (len(ms) - 1))]:7.3f}ms")
+
+
+async def main(args):
+    for transport in ("pydantic_ai", "http"):
+        config = LLMConfig(
+            name="mock", base_url=f"http://127.0.0.1:{args.port}/v1",
+            platform="openai", transport=transport
+        )
+        report(transport, *await measure(config, args.calls, args.concurrency))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--port", type=int, default=18181)
+    args = parser.parse_args()
+
+    server = serve_in_process(MockServerConfig(port=args.port, latency=0.0, output_format="json", output_tokens=20))
+    try:
+        asyncio.run(main(args))
+    finally:
+        server.terminate()
@@ -1,14 +1,32 @@
 import os
 import json
-from typing import Dict, Any, Optional, Union
-from contextlib import asynccontextmanager
+import time
+import asyncio
+import statistics
+from collections import deque
+from typing import Dict, Any, List, Optional, Union
+from contextlib import asynccontextmanager, AsyncExitStack
+
+import httpx
 from pydantic import BaseModel, ValidationError
 
+from openai import AsyncOpenAI
 from pydantic_ai import Agent
 from pydantic_ai.models.ollama import OllamaModel
 from pydantic_ai.models.openai import OpenAIModel
 
-from schemas.config import LLMConfig
+from schemas.config import HedgingConfig, LLMConfig
+from schemas.generation import GenerationError, GenerationResult, GenerationTimeout
+from schemas.evaluation import EvaluationResponse, IncrementalEvaluationParser
+from llm.cache import ResponseCache, request_key
+from llm.singleflight import SingleFlight
+from llm.concurrency import AdaptiveConcurrency
+from llm.rate_limit import estimate_tokens, get_rate_limiter
+from llm.hedging import Hedger
+from llm.deadline import DeadlineExceeded, RequestTimeout, run_with_timeout
+from llm.errors import is_transport_error
+from llm.resilience import CircuitOpenError, Resilience
+from llm.transport import ChatCompletionsAgent, ChatCompletionsModel, chat_messages
 
 
 class LLMAgentFactory:
@@ -16,12 +34,19 @@ class LLMAgentFactory:
     Factory class for creating LLM agents across different platforms.
     """
     @staticmethod
-    def create_model(config: LLMConfig):
+    def create_model(
+        config: LLMConfig,
+        http_client: Optional[httpx.AsyncClient] = None,
+        max_retries: Optional[int] = None
+    ):
         """
         Create a model instance based on the platform.
         
         Args:
             config: LLM configuration
+            http_client: Optional shared HTTP client (connection pool) used by the model
+            max_retries: Retries of the underlying OpenAI client, None for its default.
+                         Set to 0 when retries are handled by the caller.
         
         Returns:
             Configured AI model instance
@@ -30,46 +55,139 @@ class LLMAgentFactory:
         if not isinstance(config, LLMConfig):
             raise ValueError(f"Invalid config type: {type(config)}")
 
-        # Handle API key from environment if needed
-        api_key = config.api_key
-        if api_key and api_key.startswith('${') and api_key.endswith('}'):
-            env_var = api_key[2:-1]
-            api_key = os.getenv(env_var)
-            if not api_key:
-                raise ValueError(f"Environment variable {env_var} not found")
+        api_key = LLMAgentFactory.resolve_api_key(config)
 
         # Platform-specific model creation
         platform = config.platform.lower()
+        if platform not in ('ollama', 'openai'):
+            raise ValueError(f"Unsupported platform: {platform}")
+
+        if config.transport == 'http' or config.structured_output:
+            # Direct requests; retries are left to the caller
+            return ChatCompletionsModel(config, api_key=api_key, http_client=http_client)
+
+        if max_retries is not None:
+            openai_client = AsyncOpenAI(
+                base_url=config.base_url,
+                api_key=api_key if platform == 'openai' else 'ollama',
+                http_client=http_client,
+                max_retries=max_retries
+            )
+            if platform == 'ollama':
+                return OllamaModel(model_name=config.name, base_url=None, openai_client=openai_client)
+            return OpenAIModel(model_name=config.name, openai_client=openai_client)
         
         if platform == 'ollama':
             return OllamaModel(
                 model_name=config.name, 
-                base_url=config.base_url
+                base_url=config.base_url,
+                http_client=http_client
             )
         
         elif platform == 'openai':
             return OpenAIModel(
                 model_name=config.name,
-                openai_client=OpenAIModel.create_client(
-                    base_url=config.base_url,
-                    api_key=api_key
-                )
+                base_url=config.base_url,
+                api_key=api_key,
+                http_client=http_client
             )
         
         else:
             raise ValueError(f"Unsupported platform: {platform}")
 
+    @staticmethod
+    def resolve_api_key(config: LLMConfig) -> str:
+        """
+        Resolve the API key, reading it from the environment for '${VAR}' values.
+        
+        Args:
+            config: LLM configuration
+        
+        Returns:
+            The API key
+        """
+        api_key = config.api_key
+        if api_key and api_key.startswith('${') and api_key.endswith('}'):
+            env_var = api_key[2:-1]
+            api_key = os.getenv(env_var)
+            if not api_key:
+                raise ValueError(f"Environment variable {env_var} not found")
+        return api_key
+
+    @staticmethod
+    def native_base_url(config: LLMConfig) -> str:
+        """
+        Root URL of the Ollama native API (base URL without the OpenAI '/v1' suffix).
+        
+        Args:
+            config: LLM configuration
+        
+        Returns:
+            The native API root URL
+        """
+        base_url = config.base_url
+        return base_url[:-len('/v1')] if base_url.endswith('/v1') else base_url
+
+    @staticmethod
+    def create_http_client(config: LLMConfig) -> httpx.AsyncClient:
+        """
+        Create a pooled HTTP client that keeps connections alive between calls.
+        
+        Args:
+            config: LLM configuration
+        
+        Returns:
+            Async HTTP client owned by the caller (close it with `aclose()`)
+        """
+        return httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout=config.timeout, connect=5),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+        )
+
 
 class LLMAgent:
     """
     A wrapper class for interacting with LLMs using pydantic_ai.
     Manages model connection and provides a consistent inference interface.
+
+    By default a fresh model and agent are built for every call. Call `open()`
+    (or use the agent as an async context manager) to build the model, HTTP client
+    and connection pool once and reuse them across all `generate` calls until
+    `aclose()`.
+
+    An optional ResponseCache serves repeated requests (same config and prompts)
+    without calling the model, and an optional SingleFlight makes concurrent
+    identical requests share one model call. With AdaptiveConcurrency, requests
+    wait for a slot of the AIMD limiter of the config's base URL. Requests per
+    minute and tokens per minute set on the config are enforced by a rate limiter
+    shared with every agent of the same endpoint. With a HedgingConfig, slow
+    requests are duplicated on another connection and the first answer wins.
+    With Resilience, transport errors are retried with jittered backoff behind
+    a per-endpoint circuit breaker (the OpenAI client's own retries are disabled).
+
+    `open(warmup=True)` checks that the model is available and preloads it, so
+    the model-load cost is reported as cold start rather than inflating the
+    first request. While open, Ollama agents with `keep_alive` set refresh the
+    hint periodically so idle gaps do not unload the model.
+
+    With `transport="http"` on the config, plain-string agents skip pydantic_ai
+    and post to `/chat/completions` directly (see llm.transport). With
+    `structured_output`, they also send the EvaluationResponse JSON schema as
+    `response_format` so the judge output always parses as plain JSON.
     """
 
+    # Seconds between keep-alive refreshes of an open Ollama agent
+    KEEP_ALIVE_REFRESH = 60.0
+
     def __init__(
         self, 
         config: LLMConfig, 
-        result_type: Optional[type[BaseModel]] = None
+        result_type: Optional[type[BaseModel]] = None,
+        cache: Optional[ResponseCache] = None,
+        single_flight: Optional[SingleFlight] = None,
+        concurrency: Optional[AdaptiveConcurrency] = None,
+        hedging: Optional[HedgingConfig] = None,
+        resilience: Optional[Resilience] = None
     ):
         """
         Initialize LLM agent with configuration and optional result type.
@@ -77,34 +195,274 @@ class LLMAgent:
         Args:
             config: LLM configuration
             result_type: Optional Pydantic model to validate output
+            cache: Optional response cache shared by generate calls
+            single_flight: Optional deduplication of concurrent identical requests
+            concurrency: Optional adaptive concurrency limits per endpoint
+            hedging: Optional hedging of slow requests
+            resilience: Optional retries with backoff and circuit breakers
         """
+        if config.transport == 'http' and result_type not in (None, str):
+            raise ValueError("The http transport only supports plain-string agents")
+        if config.structured_output and result_type not in (None, str):
+            raise ValueError("structured_output applies to plain-string agents (result_type is validated by pydantic_ai)")
         self.config = config
         self.result_type = result_type
+        self.cache = cache
+        self.single_flight = single_flight
+        self.concurrency = concurrency
+        self.rate_limiter = get_rate_limiter(config)
+        self.hedger = Hedger(hedging) if hedging is not None else None
+        self.resilience = resilience
         self._model = None
         self._agent = None
+        self._http_client = None
+        self._agents: Dict[Optional[str], Agent] = {}
+        self._keep_alive_task: Optional[asyncio.Task] = None
+        self._cold_start: Optional[float] = None
+        self._first_call: Optional[float] = None
+        self._latencies = deque(maxlen=1000)
+
+    @property
+    def is_open(self) -> bool:
+        """Whether the agent keeps a persistent model between calls."""
+        return self._http_client is not None
+
+    async def open(self, warmup: bool = False) -> "LLMAgent":
+        """
+        Create the HTTP client and model once, for reuse across calls.
+        
+        Args:
+            warmup: Check the model is available and preload it before returning
+        
+        Returns:
+            The opened agent
+        
+        Raises:
+            RuntimeError: If warmup is requested and the model is not available
+        """
+        if not self.is_open:
+            self._http_client = LLMAgentFactory.create_http_client(self.config)
+            self._model = self._create_model(http_client=self._http_client)
+            if self.config.keep_alive and self.config.platform == 'ollama':
+                self._keep_alive_task = asyncio.ensure_future(self._keep_alive_loop())
+
+        if warmup:
+            try:
+                if not await self.is_ready():
+                    raise RuntimeError(f"Model {self.config.name} is not available at {self.config.base_url}")
+                await self.warmup()
+            except BaseException:
+                # Do not leave the client and keep-alive refresh behind a failed open
+                await self.aclose()
+                raise
+        return self
+
+    async def aclose(self) -> None:
+        """Release the persistent model and close its connection pool."""
+        if self._keep_alive_task is not None:
+            self._keep_alive_task.cancel()
+            self._keep_alive_task = None
+        http_client, self._http_client = self._http_client, None
+        self._model = None
+        self._agent = None
+        self._agents.clear()
+        if http_client is not None:
+            await http_client.aclose()
+
+    def _create_model(self, http_client: Optional[httpx.AsyncClient] = None):
+        """Create the model, leaving transport retries to Resilience when set."""
+        return LLMAgentFactory.create_model(
+            self.config,
+            http_client=http_client,
+            max_retries=0 if self.resilience is not None else None
+        )
+
+    async def _get_models(self, timeout: float) -> Optional[httpx.Response]:
+        """GET the endpoint's model listing, or None if it is unreachable or answers with an error."""
+        headers = {"Authorization": f"Bearer {LLMAgentFactory.resolve_api_key(self.config)}"}
+        client = self._http_client or httpx.AsyncClient()
+        try:
+            response = await client.get(f"{self.config.base_url}/models", headers=headers, timeout=timeout)
+            return response if response.status_code < 400 else None
+        except httpx.HTTPError:
+            return None
+        finally:
+            if client is not self._http_client:
+                await client.aclose()
+
+    @staticmethod
+    def _model_name(name: Optional[str]) -> Optional[str]:
+        """Model name without Ollama's implicit ":latest" tag."""
+        if name is not None and name.endswith(":latest"):
+            return name[:-len(":latest")]
+        return name
+
+    async def ping(self, timeout: float = 5.0) -> bool:
+        """
+        Check that the endpoint answers its model listing.
+        
+        Args:
+            timeout: Seconds to wait for the endpoint
+        
+        Returns:
+            True if the endpoint responded successfully
+        """
+        return await self._get_models(timeout) is not None
+
+    async def is_ready(self, timeout: float = 5.0) -> bool:
+        """
+        Check that the endpoint is up and serves the configured model.
+
+        "name" and "name:latest" are the same model.
+        
+        Args:
+            timeout: Seconds to wait for the endpoint
+        
+        Returns:
+            True if the model is listed by the endpoint
+        """
+        response = await self._get_models(timeout)
+        if response is None:
+            return False
+        try:
+            models = {self._model_name(model.get("id")) for model in response.json().get("data", [])}
+        except (ValueError, AttributeError):
+            return False
+        return self._model_name(self.config.name) in models
+
+    async def warmup(self, timeout: float = 600.0) -> float:
+        """
+        Preload the model with a minimal request and record the cold-start time.
+
+        Ollama models are loaded through the native API without generating
+        anything (and with the keep-alive hint); other platforms get a one-token
+        chat completion.
+        
+        Args:
+            timeout: Seconds allowed for loading the model
+        
+        Returns:
+            Seconds the warm-up took
+        """
+        start = time.monotonic()
+        await self._preload(timeout)
+        self._cold_start = time.monotonic() - start
+        return self._cold_start
+
+    async def _preload(self, timeout: float) -> None:
+        """Send the smallest request that makes the server load the model."""
+        client = self._http_client or httpx.AsyncClient()
+        try:
+            if self.config.platform == 'ollama':
+                payload = {"model": self.config.name}
+                if self.config.keep_alive:
+                    payload["keep_alive"] = self.config.keep_alive
+                response = await client.post(
+                    f"{LLMAgentFactory.native_base_url(self.config)}/api/generate",
+                    json=payload,
+                    timeout=timeout
+                )
+            else:
+                response = await client.post(
+                    f"{self.config.base_url}/chat/completions",
+                    headers={"Authorization": f"Bearer {LLMAgentFactory.resolve_api_key(self.config)}"},
+                    json={
+                        "model": self.config.name,
+                        "messages": [{"role": "user", "content": "ping"}],
+                        "max_tokens": 1,
+                    },
+                    timeout=timeout
+                )
+            response.raise_for_status()
+        finally:
+            if client is not self._http_client:
+                await client.aclose()
+
+    async def unload(self, timeout: float = 60.0) -> None:
+        """
+        Ask the server to release the model's memory (Ollama only, no-op elsewhere).
+        
+        Args:
+            timeout: Seconds allowed for the unload request
+        """
+        if self.config.platform != 'ollama':
+            return
+        client = self._http_client or httpx.AsyncClient()
+        try:
+            response = await client.post(
+                f"{LLMAgentFactory.native_base_url(self.config)}/api/generate",
+                json={"model": self.config.name, "keep_alive": 0},
+                timeout=timeout
+            )
+            response.raise_for_status()
+        finally:
+            if client is not self._http_client:
+                await client.aclose()
+
+    async def _keep_alive_loop(self) -> None:
+        """Periodically renew the keep-alive hint (OpenAI-compatible calls reset it)."""
+        while True:
+            await asyncio.sleep(self.KEEP_ALIVE_REFRESH)
+            try:
+                await self._preload(timeout=self.config.timeout)
+            except httpx.HTTPError as e:
+                print(f"Keep-alive refresh failed: {e}")
+
+    def _record_latency(self, latency: float) -> None:
+        """Record a model call latency, keeping the first call apart."""
+        if self._first_call is None:
+            self._first_call = latency
+        else:
+            self._latencies.append(latency)
+
+    async def __aenter__(self) -> "LLMAgent":
+        return await self.open()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+
+    def _build_agent(self, model, system_prompt: Optional[str] = None) -> Union[Agent, ChatCompletionsAgent]:
+        """Create a pydantic_ai Agent (or direct-transport agent) for the given model and system prompt."""
+        temp = 0 if not hasattr(self.config, 'temperature') else self.config.temperature
+        if isinstance(model, ChatCompletionsModel):
+            model_settings = {'temperature': temp, 'max_tokens': self.config.max_tokens or 100}
+            if self.config.structured_output:
+                model_settings['response_format'] = EvaluationResponse.response_format()
+            return ChatCompletionsAgent(model, system_prompt=system_prompt, model_settings=model_settings)
+        return Agent(
+            model, 
+            # None means a plain-string agent, as in generate_stream / generate_samples
+            result_type=self.result_type or str,
+            system_prompt=system_prompt or (),
+            retries=self.config.retries or 1,
+            model_settings={'temperature': temp,
+                            'max_tokens': self.config.max_tokens or 100,
+                            }
+        )
 
     @asynccontextmanager
-    async def __call__(self):
+    async def __call__(self, system_prompt: Optional[str] = None):
         """
         Async context manager for model lifecycle management.
         
+        Args:
+            system_prompt: Optional system prompt for the agent
+        
         Yields:
             Configured Agent instance
         """
+        if self.is_open:
+            # Persistent mode: one agent per system prompt, all sharing the model
+            if system_prompt not in self._agents:
+                self._agents[system_prompt] = self._build_agent(self._model, system_prompt)
+            yield self._agents[system_prompt]
+            return
+
         try:
             # Create model instance using factory method
-            self._model = LLMAgentFactory.create_model(self.config)
-            temp = 0 if not hasattr(self.config, 'temperature') else self.config.temperature
+            self._model = self._create_model()
             # Create agent with result type
-            self._agent = Agent(
-                self._model, 
-                result_type=self.result_type,
-                retries=self.config.retries or 1,
-                model_settings={'temperature': temp,
-                                'max_tokens': self.config.max_tokens or 100,
-                                }
-            )
-            self._agent.timeout = self.config.timeout or 60
+            self._agent = self._build_agent(self._model, system_prompt)
             yield self._agent
             
         except Exception as e:
@@ -115,10 +473,52 @@ class LLMAgent:
             self._model = None
             self._agent = None
 
+    def _dump_data(self, data: Any) -> str:
+        """Serialize generated data for the response cache."""
+        if isinstance(data, BaseModel):
+            return data.model_dump_json()
+        return json.dumps(data)
+
+    def _load_data(self, value: str) -> Any:
+        """Deserialize cached data, validating it against result_type if any."""
+        if isinstance(self.result_type, type) and issubclass(self.result_type, BaseModel):
+            return self.result_type.model_validate_json(value)
+        return json.loads(value)
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Collect runtime counters of the agent.
+        
+        Returns:
+            Dictionary of metrics per component
+        """
+        metrics = {
+            "lifecycle": {
+                "cold_start": self._cold_start,
+                "first_call_latency": self._first_call,
+                "steady_state_calls": len(self._latencies),
+                "steady_state_p50_latency": statistics.median(self._latencies) if self._latencies else None,
+            }
+        }
+        if self.cache is not None:
+            metrics["cache"] = self.cache.stats()
+        if self.single_flight is not None:
+            metrics["single_flight"] = self.single_flight.stats()
+        if self.concurrency is not None:
+            metrics["concurrency"] = self.concurrency.limiter(self.config.base_url).stats()
+        if self.rate_limiter is not None:
+            metrics["rate_limit"] = self.rate_limiter.stats()
+        if self.hedger is not None:
+            metrics["hedging"] = self.hedger.stats()
+        if self.resilience is not None:
+            metrics["resilience"] = self.resilience.metrics()
+        return metrics
+
     async def generate(
         self, 
         prompt: str,
-        system_prompt: Optional[str] = None
+        system_prompt: Optional[str] = None,
+        use_cache: bool = True
     ) -> Union[Dict[str, Any], BaseModel, str]:
         """
         Generate a response from the LLM.
@@ -126,20 +526,313 @@ class LLMAgent:
         Args:
             prompt: The main user prompt
             system_prompt: Optional system prompt to set context
+            use_cache: Set to False to bypass the response cache and deduplication
             
         Returns:
-            Generated response, potentially validated against result_type
+            Generated response, potentially validated against result_type,
+            GenerationTimeout if the request timed out, or GenerationError on other errors
         """
-        # If a system_prompt is provided, modify the agent's system prompt
-        async with self() as agent:
+        if not use_cache or (self.cache is None and self.single_flight is None):
+            return await self._generate(prompt, system_prompt)
+
+        key = request_key(self.config, prompt, system_prompt, self.result_type)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                try:
+                    return GenerationResult(data=self._load_data(cached), cached=True)
+                except (ValueError, ValidationError):
+                    # Stale entry (e.g. result_type changed shape): regenerate
+                    pass
+
+        if self.single_flight is not None:
+            return await self.single_flight.do(
+                key, lambda: self._generate(prompt, system_prompt, key)
+            )
+        return await self._generate(prompt, system_prompt, key)
+
+    async def _generate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        key: Optional[str] = None
+    ) -> Union[Dict[str, Any], BaseModel, str]:
+        """Call the model and store a successful response in the cache under `key`."""
+        async with self(system_prompt) as agent:
             try:
-                if system_prompt:
-                    agent.system_prompt = system_prompt
-                
-                # Generate response
-                response = await agent.run(prompt)
-                return response
+                # Generate response, waiting for limits no longer than the deadline
+                if self.hedger is not None:
+                    # The hedge delay counts from when the primary got its slot
+                    started = asyncio.Event()
+                    response = await run_with_timeout(self.hedger.run(
+                        lambda: self._run(agent, prompt, system_prompt, started),
+                        lambda: self._run(agent, prompt, system_prompt),
+                        started=started
+                    ))
+                else:
+                    response = await run_with_timeout(self._run(agent, prompt, system_prompt))
             
+            except (RequestTimeout, DeadlineExceeded) as e:
+                print(f"Generation timed out: {e}")
+                return self._timeout_result(e)
+
+            except Exception as e:
+                print(f"Error during generation: {e}")
+                return self._error_result(e)
+
+        if key is not None and self.cache is not None:
+            self.cache.set(key, self._dump_data(response.data))
+        return response
+
+    async def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        required_keys: Optional[List[str]] = None
+    ) -> Union[GenerationResult, GenerationTimeout, GenerationError]:
+        """
+        Stream a judge response and stop generating as soon as the evaluation is parsed.
+
+        Chunks are fed to an IncrementalEvaluationParser; once all required keys are
+        complete the stream is closed, which cancels the generation on the server.
+        Only available for plain-string agents (result_type None or str).
+        
+        Args:
+            prompt: The main user prompt
+            system_prompt: Optional system prompt to set context
+            required_keys: Keys the evaluation must contain
+            
+        Returns:
+            GenerationResult with the streamed text, the parsed evaluation (if any),
+            the output tokens and the unused max_tokens budget (an upper bound on
+            what stopping early saved), GenerationTimeout on timeout, or
+            GenerationError on other errors
+        """
+        if self.result_type not in (None, str):
+            raise ValueError("Streaming is only supported for plain-string agents")
+
+        async with self(system_prompt) as agent:
+            try:
+                parser = await run_with_timeout(self._stream(agent, prompt, system_prompt, required_keys))
+
+            except (RequestTimeout, DeadlineExceeded) as e:
+                print(f"Generation timed out: {e}")
+                return self._timeout_result(e)
+
             except Exception as e:
                 print(f"Error during generation: {e}")
-                return {}
+                return self._error_result(e)
+
+        output_tokens = estimate_tokens(parser.text)
+        max_tokens = self.config.max_tokens or 100
+        return GenerationResult(
+            data=parser.text,
+            evaluation=parser.result,
+            stopped_early=parser.complete,
+            output_tokens=output_tokens,
+            max_tokens_unused=max(0, max_tokens - output_tokens) if parser.complete else 0
+        )
+
+    async def generate_samples(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        n: int = 1
+    ) -> List[str]:
+        """
+        Sample several completions of the same prompt, bypassing the cache.
+
+        On the openai platform the samples come from one request with the `n`
+        parameter; elsewhere (Ollama ignores `n`) n requests are sent concurrently.
+        Only available for plain-string agents (result_type None or str).
+
+        Args:
+            prompt: The main user prompt
+            system_prompt: Optional system prompt to set context
+            n: Number of completions to sample
+
+        Returns:
+            The sampled completions (fewer than n if some requests failed)
+        """
+        if self.result_type not in (None, str):
+            raise ValueError("Sampling is only supported for plain-string agents")
+
+        if self.config.platform != 'openai' or n == 1:
+            responses = await asyncio.gather(*(
+                self.generate(prompt, system_prompt, use_cache=False) for _ in range(n)
+            ))
+            return [str(response.data) for response in responses if hasattr(response, "data")]
+
+        try:
+            structured = {"response_format": EvaluationResponse.response_format()} if self.config.structured_output else {}
+            body = await run_with_timeout(self._chat_completion(prompt, system_prompt, n=n, **structured))
+        except Exception as e:
+            print(f"Error during sampling: {e}")
+            return []
+        return [choice["message"]["content"] for choice in body["choices"]]
+
+    async def generate_logprobs(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 3,
+        top_logprobs: int = 5
+    ) -> Union[Dict[str, Any], GenerationTimeout, GenerationError]:
+        """
+        Generate a short completion with the log probabilities of its tokens.
+
+        Sent directly to `/chat/completions` (greedy decoding, bypassing the
+        cache) since pydantic_ai does not expose logprobs. Endpoints without
+        logprob support return the choice without a "logprobs" entry.
+
+        Args:
+            prompt: The main user prompt
+            system_prompt: Optional system prompt to set context
+            max_tokens: Maximum number of generated tokens
+            top_logprobs: Number of most likely alternatives returned per token
+
+        Returns:
+            The first choice of the completion ("message", "logprobs"),
+            GenerationTimeout on timeout, or GenerationError on other errors
+        """
+        try:
+            body = await run_with_timeout(self._chat_completion(
+                prompt, system_prompt,
+                temperature=0, max_tokens=max_tokens, logprobs=True, top_logprobs=top_logprobs
+            ))
+        except (RequestTimeout, DeadlineExceeded) as e:
+            print(f"Generation timed out: {e}")
+            return self._timeout_result(e)
+        except Exception as e:
+            print(f"Error during generation: {e}")
+            return self._error_result(e)
+        return body["choices"][0]
+
+    async def _chat_completion(self, prompt: str, system_prompt: Optional[str], **params) -> Dict[str, Any]:
+        """Post one chat completion directly, within the endpoint limits, and return the response body."""
+        if isinstance(self._model, ChatCompletionsModel):
+            model = self._model
+        else:
+            model = ChatCompletionsModel(
+                self.config, api_key=LLMAgentFactory.resolve_api_key(self.config), http_client=self._http_client
+            )
+        settings = {"temperature": self.config.temperature}
+        if self.config.max_tokens is not None:
+            settings["max_tokens"] = self.config.max_tokens
+        settings.update(params)
+        messages = chat_messages(prompt, system_prompt)
+
+        async def attempt():
+            async with self._limits(prompt, system_prompt) as usage:
+                start = time.monotonic()
+                body = await run_with_timeout(model.request(messages, settings), self.config.timeout)
+                self._record_latency(time.monotonic() - start)
+                usage["total"] = (body.get("usage") or {}).get("total_tokens")
+            return body
+
+        if self.resilience is not None:
+            return await self.resilience.call(self.config.base_url, attempt)
+        return await attempt()
+
+    @asynccontextmanager
+    async def _limits(self, prompt: str, system_prompt: Optional[str] = None):
+        """
+        Hold rate-limit quota and a concurrency slot for one model request.
+
+        Yields a dict in which the caller can report the actual token usage
+        ("total") or completion tokens ("output") to correct the rate limiter.
+        """
+        usage: Dict[str, Optional[int]] = {}
+        async with AsyncExitStack() as stack:
+            estimated = None
+            if self.rate_limiter is not None:
+                prompt_tokens = estimate_tokens(prompt) + estimate_tokens(system_prompt)
+                estimated = prompt_tokens + (self.config.max_tokens or 100)
+                await self.rate_limiter.acquire(estimated)
+
+            if self.concurrency is not None:
+                await stack.enter_async_context(self.concurrency.limiter(self.config.base_url).slot())
+
+            yield usage
+
+            if estimated is not None:
+                actual = usage.get("total")
+                if actual is None and usage.get("output") is not None:
+                    actual = prompt_tokens + usage["output"]
+                self.rate_limiter.reconcile(estimated, actual)
+
+    async def _run(
+        self,
+        agent: Agent,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        started: Optional[asyncio.Event] = None
+    ):
+        """Run the agent, retrying transport errors if Resilience is set."""
+        if self.resilience is not None:
+            return await self.resilience.call(
+                self.config.base_url, lambda: self._attempt(agent, prompt, system_prompt, started)
+            )
+        return await self._attempt(agent, prompt, system_prompt, started)
+
+    async def _attempt(
+        self,
+        agent: Agent,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        started: Optional[asyncio.Event] = None
+    ):
+        """
+        Run the agent once within the endpoint limits and the request timeout,
+        setting `started` once the limits let the request through.
+        """
+        async with self._limits(prompt, system_prompt) as usage:
+            if started is not None:
+                started.set()
+            start = time.monotonic()
+            response = await run_with_timeout(agent.run(prompt), self.config.timeout)
+            self._record_latency(time.monotonic() - start)
+            usage["total"] = response.usage().total_tokens
+        return response
+
+    async def _stream(
+        self,
+        agent: Agent,
+        prompt: str,
+        system_prompt: Optional[str],
+        required_keys: Optional[List[str]] = None
+    ) -> IncrementalEvaluationParser:
+        """Stream into a parser within the endpoint limits and the request timeout, and return it."""
+        async def consume(parser: IncrementalEvaluationParser):
+            async with agent.run_stream(prompt) as result:
+                async for chunk in result.stream_text(delta=True, debounce_by=None):
+                    if parser.feed(chunk) is not None:
+                        break
+
+        async def attempt():
+            # A retried stream starts over: never mix its chunks with a failed attempt's
+            parser = IncrementalEvaluationParser(required_keys)
+            async with self._limits(prompt, system_prompt) as usage:
+                start = time.monotonic()
+                await run_with_timeout(consume(parser), self.config.timeout)
+                self._record_latency(time.monotonic() - start)
+                usage["output"] = estimate_tokens(parser.text)
+            return parser
+
+        if self.resilience is not None:
+            return await self.resilience.call(self.config.base_url, attempt)
+        return await attempt()
+
+    @staticmethod
+    def _timeout_result(error: Exception) -> GenerationTimeout:
+        return GenerationTimeout(
+            timeout=error.timeout,
+            deadline_exceeded=isinstance(error, DeadlineExceeded)
+        )
+
+    @staticmethod
+    def _error_result(error: Exception) -> GenerationError:
+        return GenerationError(
+            error=f"{type(error).__name__}: {error}",
+            transport=is_transport_error(error) or isinstance(error, CircuitOpenError)
+        )
@@ -0,0 +1,332 @@
+"""
+Offline batch evaluation through provider batch JSONL jobs.
+
+Instead of one live request per item, all judge prompts are written to a batch
+request file (OpenAI batch format), submitted through a BatchBackend, polled
+until the job finishes, and the outputs are mapped back to scored
+EvaluationResults. Backends are swappable: OpenAIBatchBackend talks to any
+OpenAI-compatible batch API, LocalBatchBackend answers the file locally.
+"""
+import os
+import json
+import uuid
+import asyncio
+import inspect
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from openai import AsyncOpenAI
+
+from llm.agent import LLMAgentFactory
+from llm.evaluator import score_output
+from schemas.config import LLMConfig
+from schemas.evaluation import EvaluationItem, EvaluationResponse, EvaluationResult
+from schemas.scoring_rvc import ScoreSchemaRVC
+
+
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+def build_batch_request(
+    custom_id: str,
+    config: LLMConfig,
+    prompt: str,
+    system_prompt: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Build one line of a batch request file.
+    
+    Args:
+        custom_id: Identifier used to match the output line
+        config: Judge configuration
+        prompt: User prompt
+        system_prompt: Optional system prompt
+    
+    Returns:
+        Batch request dictionary (chat completions endpoint)
+    """
+    messages = []
+    if system_prompt:
+        messages.append({"role": "system", "content": system_prompt})
+    messages.append({"role": "user", "content": prompt})
+    body = {
+        "model": config.name,
+        "messages": messages,
+        "temperature": config.temperature,
+        "max_tokens": config.max_tokens or 100,
+    }
+    if config.structured_output:
+        body["response_format"] = EvaluationResponse.response_format()
+    return {
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": "/v1/chat/completions",
+        "body": body,
+    }
+
+
+class BatchBackend(ABC):
+    """
+    Interface of a batch job provider.
+    """
+
+    @abstractmethod
+    async def submit(self, requests_path: str) -> str:
+        """Submit a batch request file and return the job id."""
+
+    @abstractmethod
+    async def status(self, job_id: str) -> str:
+        """Return the job status (e.g. "in_progress", "completed", "failed")."""
+
+    @abstractmethod
+    async def download(self, job_id: str, output_path: str) -> str:
+        """Write the job output file to `output_path` and return the path."""
+
+
+class OpenAIBatchBackend(BatchBackend):
+    """
+    Batch backend for OpenAI-compatible batch APIs.
+    """
+
+    def __init__(self, config: LLMConfig, completion_window: str = "24h"):
+        """
+        Args:
+            config: Judge configuration (base URL and API key)
+            completion_window: Completion window requested from the provider
+        """
+        self.completion_window = completion_window
+        self.client = AsyncOpenAI(
+            base_url=config.base_url,
+            api_key=LLMAgentFactory.resolve_api_key(config)
+        )
+
+    async def submit(self, requests_path: str) -> str:
+        with open(requests_path, "rb") as f:
+            uploaded = await self.client.files.create(file=f, purpose="batch")
+        batch = await self.client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint="/v1/chat/completions",
+            completion_window=self.completion_window
+        )
+        return batch.id
+
+    async def status(self, job_id: str) -> str:
+        batch = await self.client.batches.retrieve(job_id)
+        return batch.status
+
+    async def download(self, job_id: str, output_path: str) -> str:
+        batch = await self.client.batches.retrieve(job_id)
+        if not batch.output_file_id:
+            raise ValueError(f"Batch {job_id} has no output file (status: {batch.status})")
+        content = await self.client.files.content(batch.output_file_id)
+        with open(output_path, "wb") as f:
+            f.write(content.read())
+        return output_path
+
+
+Responder = Callable[[Dict[str, Any]], Union[str, Awaitable[str]]]
+
+
+class LocalBatchBackend(BatchBackend):
+    """
+    File-based stand-in for a batch provider.
+
+    Each request body is answered by `responder` (sync or async, returning the
+    assistant message) and written in the provider output format.
+    """
+
+    def __init__(self, responder: Responder, workdir: str = "."):
+        """
+        Args:
+            responder: Callable mapping a chat completions request body to a reply
+            workdir: Directory for the job output files
+        """
+        self.responder = responder
+        self.workdir = workdir
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+
+    async def submit(self, requests_path: str) -> str:
+        job_id = f"batch_{uuid.uuid4().hex}"
+        output_path = os.path.join(self.workdir, f"{job_id}_output.jsonl")
+        self._jobs[job_id] = {"status": "in_progress", "output_path": output_path}
+        self._jobs[job_id]["task"] = asyncio.ensure_future(self._process(job_id, requests_path, output_path))
+        return job_id
+
+    async def _process(self, job_id: str, requests_path: str, output_path: str) -> None:
+        with open(requests_path) as source, open(output_path, "w") as target:
+            for line in source:
+                if not line.strip():
+                    continue
+                request = json.loads(line)
+                target.write(json.dumps(await self._answer(request)) + "\n")
+        self._jobs[job_id]["status"] = "completed"
+
+    async def _answer(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        output = {"id": f"batch_req_{uuid.uuid4().hex}", "custom_id": request["custom_id"], "error": None}
+        try:
+            content = self.responder(request["body"])
+            if inspect.isawaitable(content):
+                content = await content
+        except Exception as e:
+            output["response"] = None
+            output["error"] = {"code": "responder_error", "message": str(e)}
+            return output
+
+        output["response"] = {
+            "status_code": 200,
+            "body": {
+                "object": "chat.completion",
+                "model": request["body"].get("model"),
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }],
+            },
+        }
+        return output
+
+    async def status(self, job_id: str) -> str:
+        job = self._jobs[job_id]
+        if job["task"].done() and job["task"].exception() is not None:
+            job["status"] = "failed"
+        return job["status"]
+
+    async def download(self, job_id: str, output_path: str) -> str:
+        source = self._jobs[job_id]["output_path"]
+        if os.path.abspath(source) != os.path.abspath(output_path):
+            with open(source) as f, open(output_path, "w") as target:
+                target.write(f.read())
+        return output_path
+
+
+class BatchJudge:
+    """
+    Evaluate items through a batch job instead of live requests.
+    """
+
+    def __init__(
+        self,
+        config: LLMConfig,
+        backend: BatchBackend,
+        user_prompt_template: str,
+        system_prompt: Optional[str] = None,
+        score_schema: Optional[ScoreSchemaRVC] = None,
+        workdir: str = ".",
+        poll_interval: float = 30.0
+    ):
+        """
+        Args:
+            config: Judge configuration
+            backend: Batch provider backend
+            user_prompt_template: Judge user prompt template
+            system_prompt: Optional judge system prompt
+            score_schema: Scoring schema, defaults to ScoreSchemaRVC()
+            workdir: Directory for request and output files
+            poll_interval: Seconds between status checks
+        """
+        self.config = config
+        self.backend = backend
+        self.user_prompt_template = user_prompt_template
+        self.system_prompt = system_prompt
+        self.score_schema = score_schema or ScoreSchemaRVC()
+        self.workdir = workdir
+        self.poll_interval = poll_interval
+
+    def write_requests(
+        self,
+        items: Iterable[Any],
+        path: str
+    ) -> Tuple[Dict[str, EvaluationResult], List[EvaluationResult]]:
+        """
+        Write the batch request file.
+        
+        Args:
+            items: EvaluationItems, dicts or (question, instruction, response) tuples
+            path: Request file path
+        
+        Returns:
+            Pending results keyed by custom id, and results of invalid items
+        """
+        pending, invalid = {}, []
+        with open(path, "w") as f:
+            for index, raw_item in enumerate(items):
+                try:
+                    item = EvaluationItem.coerce(raw_item)
+                except Exception as e:
+                    invalid.append(EvaluationResult(index=index, status="error", error=f"Invalid item: {e}"))
+                    continue
+                custom_id = f"item-{index}"
+                request = build_batch_request(
+                    custom_id, self.config, item.format_prompt(self.user_prompt_template), self.system_prompt
+                )
+                f.write(json.dumps(request) + "\n")
+                pending[custom_id] = EvaluationResult(index=index, item=item)
+        return pending, invalid
+
+    def read_results(self, path: str, pending: Dict[str, EvaluationResult]) -> List[EvaluationResult]:
+        """
+        Map a batch output file back to scored results.
+        
+        Args:
+            path: Output file path
+            pending: Results keyed by custom id, as returned by write_requests
+        
+        Returns:
+            One result per pending item
+        """
+        results = {}
+        with open(path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                output = json.loads(line)
+                result = pending.get(output.get("custom_id"))
+                if result is None:
+                    continue
+                response = output.get("response") or {}
+                if output.get("error") or response.get("status_code") != 200:
+                    error = output.get("error") or {"message": f"HTTP {response.get('status_code')}"}
+                    results[output["custom_id"]] = result.model_copy(update={"status": "error", "error": error.get("message")})
+                    continue
+                content = response["body"]["choices"][0]["message"]["content"]
+                results[output["custom_id"]] = score_output(result, content, self.score_schema, self.config.name)
+
+        for custom_id, result in pending.items():
+            if custom_id not in results:
+                results[custom_id] = result.model_copy(update={"status": "error", "error": "Missing from batch output"})
+        return list(results.values())
+
+    async def run(self, items: Iterable[Any], name: Optional[str] = None) -> List[EvaluationResult]:
+        """
+        Write, submit and wait for a batch job, then score its outputs.
+        
+        Args:
+            items: Items to evaluate
+            name: Optional file name prefix, defaults to a random id
+        
+        Returns:
+            EvaluationResults in input order
+        """
+        name = name or uuid.uuid4().hex
+        requests_path = os.path.join(self.workdir, f"{name}_requests.jsonl")
+        output_path = os.path.join(self.workdir, f"{name}_output.jsonl")
+
+        pending, results = self.write_requests(items, requests_path)
+        if pending:
+            job_id = await self.backend.submit(requests_path)
+            status = await self.backend.status(job_id)
+            while status not in TERMINAL_STATUSES:
+                await asyncio.sleep(self.poll_interval)
+                status = await self.backend.status(job_id)
+
+            if status == "completed":
+                await self.backend.download(job_id, output_path)
+                results += self.read_results(output_path, pending)
+            else:
+                results += [
+                    result.model_copy(update={"status": "error", "error": f"Batch {status}"})
+                    for result in pending.values()
+                ]
+
+        return sorted(results, key=lambda result: result.index)
@@ -0,0 +1,252 @@
+"""
+Content-addressed cache for judge responses.
+
+Judge configs usually run at temperature 0, so the same config and prompts give
+effectively the same answer. Responses are stored under a stable hash of the
+output-relevant LLMConfig fields and the prompts, in two tiers:
+
+- MemoryCache: bounded in-process LRU
+- SQLiteCache: persistent store with size- and age-based eviction
+"""
+import json
+import time
+import sqlite3
+import hashlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence
+
+from pydantic import BaseModel
+
+from schemas.config import LLMConfig
+
+
+# LLMConfig fields that change the generated output, including
+# structured_output (it constrains the answer with response_format). Secrets
+# (api_key) and transport settings (timeout, retries) are deliberately left
+# out of the key.
+KEY_FIELDS = ("name", "platform", "base_url", "max_tokens", "temperature", "structured_output")
+
+
+def request_key(
+    config: LLMConfig,
+    prompt: str,
+    system_prompt: Optional[str] = None,
+    result_type: Optional[type] = None,
+    fields: Sequence[str] = KEY_FIELDS
+) -> str:
+    """
+    Compute a stable hash identifying a judge request.
+    
+    Args:
+        config: LLM configuration
+        prompt: User prompt
+        system_prompt: Optional system prompt
+        result_type: Optional result type the output is validated against
+        fields: LLMConfig fields included in the key
+    
+    Returns:
+        Hex sha256 digest of the normalized request
+    """
+    if isinstance(result_type, type) and issubclass(result_type, BaseModel):
+        result_schema = result_type.model_json_schema()
+    else:
+        result_schema = getattr(result_type, "__name__", None)
+
+    payload = {
+        "config": {field: getattr(config, field) for field in fields},
+        "system_prompt": system_prompt,
+        "prompt": prompt,
+        "result_type": result_schema,
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class MemoryCache:
+    """
+    Bounded in-process LRU cache.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        """
+        Args:
+            max_entries: Maximum number of entries kept in memory
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[str]:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache:
+    """
+    Persistent cache stored in a SQLite file.
+
+    Entries older than `max_age` seconds are dropped, and once the stored values
+    exceed `max_bytes` the least recently used entries are evicted.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: Optional[int] = 512 * 1024 * 1024,
+        max_age: Optional[float] = None
+    ):
+        """
+        Args:
+            path: SQLite database file
+            max_bytes: Maximum total size of stored values, None for unbounded
+            max_age: Maximum entry age in seconds, None to never expire
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created REAL NOT NULL,"
+            " accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        row = self._conn.execute(
+            "SELECT value, created FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        value, created = row
+        now = time.time()
+        if self.max_age is not None and now - created > self.max_age:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._conn.commit()
+            return None
+
+        self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        self._conn.commit()
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO responses (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+            (key, value, len(value.encode("utf-8")), now, now)
+        )
+        self.evict()
+
+    def evict(self) -> None:
+        """Drop expired entries, then least recently used ones above max_bytes."""
+        if self.max_age is not None:
+            self._conn.execute("DELETE FROM responses WHERE created < ?", (time.time() - self.max_age,))
+
+        if self.max_bytes is not None:
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                rows = self._conn.execute("SELECT key, size FROM responses ORDER BY accessed").fetchall()
+                stale = []
+                for key, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    stale.append((key,))
+                    total -= size
+                self._conn.executemany("DELETE FROM responses WHERE key = ?", stale)
+
+        self._conn.commit()
+
+    def clear(self) -> None:
+        self._conn.execute("DELETE FROM responses")
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+class ResponseCache:
+    """
+    Two-tier judge response cache: in-memory LRU in front of an optional SQLite store.
+
+    Values are JSON strings. Disk hits are promoted to the memory tier.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        path: Optional[str] = None,
+        max_bytes: Optional[int] = 512 * 1024 * 1024,
+        max_age: Optional[float] = None
+    ):
+        """
+        Args:
+            max_entries: Size of the in-memory LRU tier
+            path: SQLite file for the persistent tier, None for memory only
+            max_bytes: Size limit of the persistent tier
+            max_age: Maximum age in seconds of persistent entries
+        """
+        self.memory = MemoryCache(max_entries)
+        self.disk = SQLiteCache(path, max_bytes=max_bytes, max_age=max_age) if path else None
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0}
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.memory.get(key)
+        if value is not None:
+            self._stats["memory_hits"] += 1
+            return value
+
+        if self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                self._stats["disk_hits"] += 1
+                self.memory.set(key, value)
+                return value
+
+        self._stats["misses"] += 1
+        return None
+
+    def set(self, key: str, value: str) -> None:
+        self._stats["writes"] += 1
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, value)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and hit rate."""
+        stats = dict(self._stats)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        stats["memory_entries"] = len(self.memory)
+        return stats
+
+    def clear(self) -> None:
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def close(self) -> None:
+        if self.disk is not None:
+            self.disk.close()
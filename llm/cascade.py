@@ -0,0 +1,177 @@
+"""
+Cascade judging: a cheap judge evaluates everything, uncertain items escalate.
+
+Every item is first evaluated by the first (smallest, fastest) judge of a
+CascadeConfig. Items whose verdict confidence is configured to escalate (by
+default Medium and Low), or whose output failed to parse, are re-judged by the
+next judge, and so on up to the last one. When an escalated judge fails, the
+best earlier result is kept. The run reports the escalation rate, the calls
+made to each judge and the effective cost per item.
+"""
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+
+from pydantic import BaseModel
+
+from llm.agent import LLMAgent
+from llm.evaluator import evaluate_each, evaluate_item
+from schemas.config import CascadeConfig
+from schemas.evaluation import CascadeResult, EvaluationItem, EvaluationResult
+from schemas.scoring_rvc import ConfidenceLevel, ScoreSchemaRVC
+
+
+class CascadeJudge:
+    """
+    Judges of increasing cost, called in turn until one is confident enough.
+    """
+
+    def __init__(
+        self,
+        cascade_config: CascadeConfig,
+        score_schema: Optional[ScoreSchemaRVC] = None,
+        result_type: Optional[type[BaseModel]] = None,
+        **agent_kwargs
+    ):
+        """
+        Args:
+            cascade_config: Judges, escalation policy and per-judge costs
+            score_schema: Scoring schema, defaults to ScoreSchemaRVC()
+            result_type: Optional Pydantic model to validate judge outputs
+            **agent_kwargs: Extra LLMAgent arguments (cache, single_flight, concurrency, ...)
+        """
+        self.cascade_config = cascade_config
+        self.score_schema = score_schema or ScoreSchemaRVC()
+        self.agents = [
+            LLMAgent(config, result_type=result_type, **agent_kwargs)
+            for config in cascade_config.judges
+        ]
+        self._escalate = {
+            ConfidenceLevel.from_string(level): escalate
+            for level, escalate in cascade_config.escalate.items()
+        }
+        self._stats = {
+            "items": 0,
+            "escalated": 0,
+            "calls": [0] * len(self.agents),
+            "decided": [0] * len(self.agents),
+            "cost": 0.0,
+        }
+
+    async def open(self) -> "CascadeJudge":
+        """Open every judge agent to reuse its connections."""
+        for agent in self.agents:
+            await agent.open()
+        return self
+
+    async def aclose(self) -> None:
+        for agent in self.agents:
+            await agent.aclose()
+
+    async def __aenter__(self) -> "CascadeJudge":
+        return await self.open()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+
+    def should_escalate(self, result: EvaluationResult) -> bool:
+        """
+        Apply the escalation policy to a judge result.
+
+        Args:
+            result: Result of a judge that is not the last of the cascade
+
+        Returns:
+            True if the item must be re-judged by the next judge
+        """
+        if not result.ok:
+            return self.cascade_config.escalate_on_failure
+        confidence = ConfidenceLevel.from_string(result.evaluation["confidence"])
+        return self._escalate.get(confidence, False)
+
+    async def evaluate_item(
+        self,
+        item: EvaluationItem,
+        user_prompt_template: str,
+        system_prompt: Optional[str] = None,
+        index: int = 0
+    ) -> CascadeResult:
+        """
+        Evaluate one item, escalating through the cascade as the policy requires.
+
+        Args:
+            item: Item to evaluate
+            user_prompt_template: Judge user prompt template
+            system_prompt: Optional judge system prompt
+            index: Position of the item in the input
+
+        Returns:
+            CascadeResult holding the kept result, the judge that produced it
+            and the results that were escalated
+        """
+        escalated: List[EvaluationResult] = []
+        kept: Optional[EvaluationResult] = None
+        kept_tier = 0
+        cost = 0.0
+        for tier, agent in enumerate(self.agents):
+            result = await evaluate_item(
+                agent, item, user_prompt_template, system_prompt, self.score_schema, index
+            )
+            cost += self.cascade_config.cost_of(tier)
+            self._stats["calls"][tier] += 1
+            # Keep a failed escalation's earlier successful result
+            if result.ok or kept is None or not kept.ok:
+                kept, kept_tier = result, tier
+            if tier == len(self.agents) - 1 or not self.should_escalate(result):
+                break
+            escalated.append(result)
+
+        self._stats["items"] += 1
+        self._stats["escalated"] += bool(escalated)
+        self._stats["decided"][kept_tier] += 1
+        self._stats["cost"] += cost
+        return CascadeResult(
+            **dict(kept),
+            judge=self.agents[kept_tier].config.name,
+            tier=tier,
+            escalated=escalated,
+            cost=cost,
+        )
+
+    def evaluate_many(
+        self,
+        items: Iterable[Any],
+        user_prompt_template: str,
+        system_prompt: Optional[str] = None,
+        max_concurrency: int = 8
+    ) -> AsyncIterator[CascadeResult]:
+        """
+        Evaluate many items through the cascade, yielding results as they finish.
+
+        Args:
+            items: EvaluationItems, dicts or (question, instruction, response) tuples
+            user_prompt_template: Judge user prompt template
+            system_prompt: Optional judge system prompt
+            max_concurrency: Maximum number of items evaluated at the same time
+
+        Returns:
+            Async iterator over the CascadeResult of every input item
+        """
+
+        return evaluate_each(
+            lambda item, index: self.evaluate_item(item, user_prompt_template, system_prompt, index),
+            items,
+            lambda index, error: CascadeResult(index=index, status="error", error=error),
+            max_concurrency
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Escalation rate, calls and decisions per judge, and effective cost per item."""
+        items = self._stats["items"]
+        return {
+            "items": items,
+            "escalation_rate": self._stats["escalated"] / items if items else 0.0,
+            "judges": [
+                {"judge": agent.config.name, "calls": calls, "decided": decided}
+                for agent, calls, decided in zip(self.agents, self._stats["calls"], self._stats["decided"])
+            ],
+            "cost_per_item": self._stats["cost"] / items if items else 0.0,
+        }
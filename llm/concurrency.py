@@ -0,0 +1,204 @@
+"""
+Adaptive (AIMD) concurrency limits per judge endpoint.
+
+The in-flight limit grows additively (about +1 per round of requests) while the
+median latency stays close to the best median seen, and is cut multiplicatively
+when the endpoint times out or answers 429/5xx. The limit settles at the
+concurrency the endpoint actually sustains.
+"""
+import time
+import asyncio
+import statistics
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Deque, Dict, List, Optional
+
+from llm.errors import is_overload
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limiter for a single endpoint.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        window: int = 20,
+        latency_tolerance: float = 1.5,
+        history_size: int = 1000
+    ):
+        """
+        Args:
+            initial_limit: Starting number of concurrent requests
+            min_limit: Lower bound of the limit
+            max_limit: Upper bound of the limit
+            increase: Limit increase per round of successful requests
+            decrease: Factor applied to the limit on overload errors
+            window: Number of recent latencies used for the median
+            latency_tolerance: Maximum ratio of current to best median latency
+                               for the limit to keep growing
+            history_size: Number of limit changes kept in history
+        """
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("Expected 1 <= min_limit <= initial_limit <= max_limit")
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be between 0 and 1")
+
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance
+
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._baseline_p50: Optional[float] = None
+        self._last_decrease = 0.0
+        self.history: Deque[tuple] = deque(maxlen=history_size)
+        self.history.append((time.time(), initial_limit, "initial"))
+
+    @property
+    def limit(self) -> int:
+        """Current number of requests allowed in flight."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def acquire(self) -> float:
+        """
+        Wait for a free slot.
+        
+        Returns:
+            Monotonic time at which the slot was granted
+        """
+        while self._in_flight >= self.limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # We were woken up but will not use the slot: pass it on
+                    self._wake()
+                raise
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self._in_flight += 1
+        return time.monotonic()
+
+    def release(self, started: float, error: Optional[BaseException] = None) -> None:
+        """
+        Free a slot and update the limit from the request outcome.
+        
+        Args:
+            started: Value returned by `acquire`
+            error: Exception raised by the request, if any. Cancelled requests
+                   (asyncio.CancelledError) free their slot without being recorded.
+        """
+        saturated = self._in_flight >= self.limit
+        self._in_flight -= 1
+        latency = time.monotonic() - started
+
+        if error is not None and not isinstance(error, Exception):
+            # Cancelled (hedge loser, short-circuited judge, expired deadline):
+            # the time until cancellation says nothing about the endpoint
+            pass
+        elif error is not None:
+            # Requests started before the last cut were sized for the old limit
+            if is_overload(error) and started >= self._last_decrease:
+                self._set_limit(max(self.min_limit, self._limit * self.decrease), f"overload: {type(error).__name__}")
+                self._last_decrease = time.monotonic()
+                self._latencies.clear()
+        else:
+            self._record_success(latency, saturated)
+
+        self._wake()
+
+    @asynccontextmanager
+    async def slot(self):
+        """Async context manager holding a slot for the duration of a request."""
+        started = await self.acquire()
+        error = None
+        try:
+            yield
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self.release(started, error)
+
+    def _record_success(self, latency: float, saturated: bool) -> None:
+        self._latencies.append(latency)
+        if len(self._latencies) < self._latencies.maxlen:
+            return
+
+        p50 = statistics.median(self._latencies)
+        if self._baseline_p50 is None or p50 < self._baseline_p50:
+            self._baseline_p50 = p50
+
+        # Growing an unsaturated limit would not change anything
+        if saturated and p50 <= self._baseline_p50 * self.latency_tolerance:
+            self._set_limit(min(self.max_limit, self._limit + self.increase / self._limit), "latency steady")
+
+    def _set_limit(self, value: float, reason: str) -> None:
+        previous = self.limit
+        self._limit = value
+        if self.limit != previous:
+            self.history.append((time.time(), self.limit, reason))
+
+    def _wake(self) -> None:
+        free = self.limit - self._in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Current limit, latency and history of limit changes."""
+        p50 = statistics.median(self._latencies) if self._latencies else None
+        return {
+            "limit": self.limit,
+            "in_flight": self._in_flight,
+            "waiting": len(self._waiters),
+            "p50_latency": p50,
+            "baseline_p50_latency": self._baseline_p50,
+            "history": list(self.history),
+        }
+
+
+class AdaptiveConcurrency:
+    """
+    Registry of AdaptiveLimiters, one per endpoint base URL.
+    """
+
+    def __init__(self, **limiter_kwargs):
+        """
+        Args:
+            **limiter_kwargs: Arguments passed to every AdaptiveLimiter
+        """
+        self._limiter_kwargs = limiter_kwargs
+        self._limiters: Dict[str, AdaptiveLimiter] = {}
+
+    def limiter(self, base_url: str) -> AdaptiveLimiter:
+        """Get (or create) the limiter of an endpoint."""
+        if base_url not in self._limiters:
+            self._limiters[base_url] = AdaptiveLimiter(**self._limiter_kwargs)
+        return self._limiters[base_url]
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Limiter stats keyed by base URL."""
+        return {base_url: limiter.stats() for base_url, limiter in self._limiters.items()}
+
+    def endpoints(self) -> List[str]:
+        return list(self._limiters)
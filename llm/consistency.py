@@ -0,0 +1,185 @@
+"""
+Self-consistency judging with sequential early stopping.
+
+Instead of always sampling a judge N times at nonzero temperature, samples are
+drawn in rounds and sampling stops as soon as the majority verdict is settled:
+
+- curtailment: the samples left before max_samples cannot flip the majority
+- Beta-binomial test: with a uniform prior on the judge's pass rate, the
+  posterior probability that the majority side is the judge's true majority
+  reaches `confidence`
+
+The item score is the mean ScoreSchemaRVC score of the parsed samples.
+"""
+import math
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+
+from llm.agent import LLMAgent
+from llm.evaluator import evaluate_each, score_output
+from schemas.config import SelfConsistencyConfig
+from schemas.evaluation import EvaluationItem, EvaluationResult, SelfConsistencyResult
+from schemas.scoring_rvc import ScoreSchemaRVC, Verdict
+
+
+def majority_posterior(passes: int, fails: int) -> float:
+    """
+    Posterior probability that the majority verdict is the judge's true majority.
+
+    With a Beta(1, 1) prior on the pass rate p, p | votes ~ Beta(1 + passes,
+    1 + fails), and for integer parameters P(p < 1/2) equals the probability
+    that Binomial(passes + fails + 1, 1/2) is at least passes + 1.
+
+    Args:
+        passes: Number of Pass votes
+        fails: Number of Fail votes
+
+    Returns:
+        max(P(p > 1/2), P(p < 1/2))
+    """
+    trials = passes + fails + 1
+    below = sum(math.comb(trials, k) for k in range(passes + 1, trials + 1)) / 2 ** trials
+    return max(below, 1.0 - below)
+
+
+class SelfConsistencyJudge:
+    """
+    Repeated sampling of one judge, stopped once the majority verdict is settled.
+
+    The agent must return plain strings and should use a nonzero temperature,
+    otherwise every sample is the same.
+    """
+
+    def __init__(
+        self,
+        agent: LLMAgent,
+        config: Optional[SelfConsistencyConfig] = None,
+        score_schema: Optional[ScoreSchemaRVC] = None
+    ):
+        """
+        Args:
+            agent: Judge agent (plain-string result type)
+            config: Sample counts and stopping confidence
+            score_schema: Scoring schema, defaults to ScoreSchemaRVC()
+        """
+        if agent.config.temperature == 0:
+            print("Warning: self-consistency sampling with temperature 0 repeats the same answer")
+        self.agent = agent
+        self.config = config or SelfConsistencyConfig()
+        self.score_schema = score_schema or ScoreSchemaRVC()
+        self._stats = {"items": 0, "samples": 0, "stopped_early": 0}
+
+    def should_stop(self, passes: int, fails: int, drawn: int) -> bool:
+        """
+        Sequential stopping rule.
+
+        Args:
+            passes: Pass votes so far
+            fails: Fail votes so far
+            drawn: Samples drawn so far, including unparseable ones
+
+        Returns:
+            True if no more samples are needed
+        """
+        if drawn >= self.config.max_samples:
+            return True
+        if drawn < self.config.min_samples or passes == fails:
+            return False
+        if abs(passes - fails) > self.config.max_samples - drawn:
+            return True
+        return majority_posterior(passes, fails) >= self.config.confidence
+
+    async def evaluate_item(
+        self,
+        item: EvaluationItem,
+        user_prompt_template: str,
+        system_prompt: Optional[str] = None,
+        index: int = 0
+    ) -> SelfConsistencyResult:
+        """
+        Sample the judge on one item until the stopping rule fires.
+
+        Args:
+            item: Item to evaluate
+            user_prompt_template: Judge user prompt template
+            system_prompt: Optional judge system prompt
+            index: Position of the item in the input
+
+        Returns:
+            SelfConsistencyResult with the majority evaluation, mean score and votes
+        """
+        base = EvaluationResult(index=index, item=item)
+        prompt = item.format_prompt(user_prompt_template)
+        samples: List[EvaluationResult] = []
+        votes = {"Pass": 0, "Fail": 0}
+        drawn = 0
+
+        while not self.should_stop(votes["Pass"], votes["Fail"], drawn):
+            n = self.config.min_samples if drawn == 0 else self.config.batch_size
+            n = min(n, self.config.max_samples - drawn)
+            outputs = await self.agent.generate_samples(prompt, system_prompt, n=n)
+            drawn += n
+            for output in outputs:
+                sample = score_output(base, output, self.score_schema, self.agent.config.name)
+                if sample.ok:
+                    samples.append(sample)
+                    votes[Verdict.from_string(sample.evaluation["verdict"]).value.capitalize()] += 1
+
+        stopped_early = drawn < self.config.max_samples
+        self._stats["items"] += 1
+        self._stats["samples"] += drawn
+        self._stats["stopped_early"] += stopped_early
+        if not samples:
+            return SelfConsistencyResult(
+                **{**base.model_dump(), "status": "error", "error": "No judge sample could be parsed"},
+                votes=votes, samples_used=drawn, stopped_early=stopped_early
+            )
+
+        majority = "Pass" if votes["Pass"] >= votes["Fail"] else "Fail"
+        representative = next(
+            sample for sample in samples
+            if Verdict.from_string(sample.evaluation["verdict"]).value.capitalize() == majority
+        )
+        return SelfConsistencyResult(
+            **{**representative.model_dump(), "score": sum(sample.score for sample in samples) / len(samples)},
+            votes=votes,
+            samples_used=drawn,
+            stopped_early=stopped_early,
+            agreement=majority_posterior(votes["Pass"], votes["Fail"])
+        )
+
+    def evaluate_many(
+        self,
+        items: Iterable[Any],
+        user_prompt_template: str,
+        system_prompt: Optional[str] = None,
+        max_concurrency: int = 8
+    ) -> AsyncIterator[SelfConsistencyResult]:
+        """
+        Evaluate many items with self-consistency sampling, yielding results as they finish.
+
+        Args:
+            items: EvaluationItems, dicts or (question, instruction, response) tuples
+            user_prompt_template: Judge user prompt template
+            system_prompt: Optional judge system prompt
+            max_concurrency: Maximum number of items sampled at the same time
+
+        Returns:
+            Async iterator over the SelfConsistencyResult of every input item
+        """
+
+        return evaluate_each(
+            lambda item, index: self.evaluate_item(item, user_prompt_template, system_prompt, index),
+            items,
+            lambda index, error: SelfConsistencyResult(index=index, status="error", error=error),
+            max_concurrency
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Average samples used per item and share of items stopped early."""
+        items = self._stats["items"]
+        return {
+            "items": items,
+            "samples": self._stats["samples"],
+            "avg_samples_per_item": self._stats["samples"] / items if items else 0.0,
+            "stopped_early_rate": self._stats["stopped_early"] / items if items else 0.0,
+        }
@@ -0,0 +1,99 @@
+"""
+Per-request timeouts and batch-level deadlines for judge calls.
+
+A deadline set with `deadline_scope` applies to every request started in the
+same task (and in tasks created from it): each request gets the smaller of its
+own timeout and the time left before the deadline. Timed-out requests are
+cancelled, which closes the underlying HTTP request.
+"""
+import time
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Absolute deadline (time.monotonic()) of the current task, if any
+_deadline: ContextVar[Optional[float]] = ContextVar("judge_deadline", default=None)
+
+
+class RequestTimeout(asyncio.TimeoutError):
+    """A single request exceeded its timeout."""
+
+    def __init__(self, timeout: float):
+        super().__init__(f"Request timed out after {timeout:.1f}s")
+        self.timeout = timeout
+
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """The deadline of the batch the request belongs to has passed."""
+
+    def __init__(self, timeout: float):
+        super().__init__(f"Deadline exceeded after {timeout:.1f}s")
+        self.timeout = timeout
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float] = None, at: Optional[float] = None):
+    """
+    Set a deadline for the requests made within the block.
+
+    A deadline already in effect is only ever shortened, never extended.
+    
+    Args:
+        seconds: Deadline relative to now
+        at: Absolute deadline as a time.monotonic() value
+    """
+    candidates = [d for d in (_deadline.get(), at) if d is not None]
+    if seconds is not None:
+        candidates.append(time.monotonic() + seconds)
+    token = _deadline.set(min(candidates) if candidates else None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the current deadline, or None without deadline."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+async def run_with_timeout(awaitable: Awaitable[T], timeout: Optional[float] = None) -> T:
+    """
+    Await with a timeout bounded by the current deadline.
+    
+    Args:
+        awaitable: Request to run
+        timeout: Own timeout of the request in seconds, None for deadline only
+    
+    Returns:
+        The result of the awaitable
+    
+    Raises:
+        RequestTimeout: If the request's own timeout elapsed
+        DeadlineExceeded: If the deadline passed first (or already had)
+    """
+    left = remaining()
+    if left is not None and left <= 0:
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise DeadlineExceeded(0.0)
+
+    by_deadline = left is not None and (timeout is None or left < timeout)
+    effective = left if by_deadline else timeout
+    if effective is None:
+        return await awaitable
+
+    try:
+        return await asyncio.wait_for(awaitable, effective)
+    except (RequestTimeout, DeadlineExceeded):
+        raise
+    except asyncio.TimeoutError:
+        if by_deadline:
+            raise DeadlineExceeded(effective) from None
+        raise RequestTimeout(effective) from None
@@ -0,0 +1,80 @@
+"""
+Classification of errors raised while calling a judge endpoint.
+"""
+import json
+import asyncio
+from typing import Optional
+
+import httpx
+import openai
+from pydantic import ValidationError
+from pydantic_ai.exceptions import UnexpectedModelBehavior
+
+from llm.deadline import DeadlineExceeded, RequestTimeout
+
+
+def status_code_of(error: BaseException) -> Optional[int]:
+    """
+    Get the HTTP status code carried by an error, if any.
+    
+    Args:
+        error: Exception raised by the model client
+    
+    Returns:
+        The HTTP status code or None
+    """
+    status = getattr(error, "status_code", None)
+    if status is None:
+        response = getattr(error, "response", None)
+        status = getattr(response, "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_timeout(error: BaseException) -> bool:
+    """Whether the error is a request timeout (an expired batch deadline is not)."""
+    if isinstance(error, DeadlineExceeded):
+        return False
+    return isinstance(error, (asyncio.TimeoutError, httpx.TimeoutException, openai.APITimeoutError))
+
+
+def is_overload(error: BaseException) -> bool:
+    """Whether the error signals an overloaded endpoint: timeout, 429 or 5xx."""
+    if is_timeout(error):
+        return True
+    status = status_code_of(error)
+    return status is not None and (status == 429 or status >= 500)
+
+
+def is_transport_error(error: BaseException) -> bool:
+    """
+    Whether the error comes from reaching the endpoint (connection failure,
+    timeout, 429 or 5xx) rather than from the content of its answer.
+    """
+    if isinstance(error, DeadlineExceeded):
+        return False
+    if isinstance(error, (RequestTimeout, httpx.TransportError, openai.APIConnectionError)):
+        return True
+    return is_overload(error)
+
+
+def is_answer_error(error: BaseException) -> bool:
+    """
+    Whether the endpoint answered and the problem is its answer: output that
+    fails validation or a client error status other than 429.
+    """
+    if isinstance(error, (ValidationError, UnexpectedModelBehavior, json.JSONDecodeError)):
+        return True
+    status = status_code_of(error)
+    return status is not None and 400 <= status < 500 and status != 429
+
+
+def retry_after_of(error: BaseException) -> Optional[float]:
+    """Seconds requested by a Retry-After header on the error's response, if any."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,456 @@
+"""
+Batch evaluation of (question, instruction, response) items with a judge LLMAgent.
+
+Each item goes through the same steps as `example_code.main`: format the user
+prompt, call `LLMAgent.generate`, parse with `EvaluationResponse.parse_raw_evaluation`
+and score with `ScoreSchemaRVC.get_score`. Items run concurrently with a bounded
+number of requests in flight, and a failing item never affects the others.
+
+With `group_by_response`, the questions about one response are evaluated back
+to back (and, on an LLMAgentPool, on the same endpoint) so the server can reuse
+the prompt prefix; combine it with llm.prompts.PREFIX_STABLE_USER_PROMPT_TEMPLATE.
+
+`evaluate_packed` goes further and asks up to `pack_size` questions about one
+response in a single call (llm.prompts.PACKED_USER_PROMPT_TEMPLATE); questions
+missing from the judge's JSON array are asked again, each on its own when the
+answer could not be parsed at all.
+"""
+import time
+import asyncio
+from functools import partial
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar, Union
+
+from pydantic import BaseModel
+
+from llm.agent import LLMAgent
+from llm.pool import LLMAgentPool
+from llm import prompts
+from llm.deadline import deadline_scope
+from schemas.evaluation import EvaluationItem, EvaluationResponse, EvaluationResult
+from schemas.generation import GenerationError, GenerationTimeout
+from schemas.scoring_rvc import ScoreSchemaRVC
+
+
+T = TypeVar("T")
+
+
+def score_output(
+    result: EvaluationResult,
+    output: Any,
+    score_schema: ScoreSchemaRVC,
+    model: Optional[str] = None
+) -> EvaluationResult:
+    """
+    Parse and score a judge output into an EvaluationResult.
+    
+    Args:
+        result: Result holding the index and item being evaluated
+        output: Data returned by the judge (string or validated model)
+        score_schema: Schema used to score the evaluation
+        model: Name of the judge model, for EvaluationResponse.parse_stats
+    
+    Returns:
+        The result updated with raw output, evaluation, score or error
+    """
+    if isinstance(output, BaseModel):
+        evaluation = output.model_dump()
+        raw = output.model_dump_json()
+    else:
+        raw = str(output)
+        evaluation = EvaluationResponse.parse_raw_evaluation(raw, model=model)
+
+    if evaluation is None:
+        return result.model_copy(update={"raw": raw, "status": "parse_error", "error": "Could not parse judge output"})
+    return score_evaluation(result, raw, evaluation, score_schema)
+
+
+def score_evaluation(
+    result: EvaluationResult,
+    raw: str,
+    evaluation: Dict[str, Any],
+    score_schema: ScoreSchemaRVC
+) -> EvaluationResult:
+    """
+    Score an already parsed evaluation into an EvaluationResult.
+    
+    Args:
+        result: Result holding the index and item being evaluated
+        raw: Raw judge output the evaluation was parsed from
+        evaluation: Parsed evaluation with verdict and confidence
+        score_schema: Schema used to score the evaluation
+    
+    Returns:
+        The result updated with raw output, evaluation, score or error
+    """
+    try:
+        score = score_schema.get_score(evaluation)
+    except Exception as e:
+        return result.model_copy(update={"raw": raw, "evaluation": evaluation, "status": "error", "error": f"Scoring failed: {e}"})
+
+    return result.model_copy(update={"raw": raw, "evaluation": evaluation, "score": score})
+
+
+def failure_of(response: Any) -> Dict[str, str]:
+    """
+    Status and error message of a judge response without data.
+    
+    Args:
+        response: GenerationTimeout, GenerationError or other failed response
+    
+    Returns:
+        dict: EvaluationResult "status" and "error" fields
+    """
+    if isinstance(response, GenerationTimeout):
+        reason = "Deadline exceeded" if response.deadline_exceeded else "Request timed out"
+        return {"status": "timeout", "error": f"{reason} after {response.timeout:.1f}s"}
+    if isinstance(response, GenerationError):
+        kind = "Transport error" if response.transport else "Generation failed"
+        return {"status": "error", "error": f"{kind}: {response.error}"}
+    return {"status": "error", "error": "Generation failed"}
+
+
+async def evaluate_item(
+    agent: Union[LLMAgent, LLMAgentPool],
+    item: EvaluationItem,
+    user_prompt_template: str,
+    system_prompt: Optional[str] = None,
+    score_schema: Optional[ScoreSchemaRVC] = None,
+    index: int = 0,
+    affinity: Optional[str] = None
+) -> EvaluationResult:
+    """
+    Evaluate a single item. Errors are captured in the result, never raised.
+    
+    Args:
+        agent: Judge agent or pool
+        item: Item to evaluate
+        user_prompt_template: Template with {assessment_question}, {student_instruction},
+                              {student_response} (and optionally {student_role}) fields
+        system_prompt: Optional judge system prompt
+        score_schema: Scoring schema, defaults to ScoreSchemaRVC()
+        index: Position of the item in the input
+        affinity: Optional endpoint affinity key (LLMAgentPool only)
+    
+    Returns:
+        EvaluationResult for the item
+    """
+    score_schema = score_schema or ScoreSchemaRVC()
+    result = EvaluationResult(index=index, item=item)
+    generate_kwargs = {"affinity": affinity} if affinity is not None else {}
+    try:
+        response = await agent.generate(
+            prompt=item.format_prompt(user_prompt_template),
+            system_prompt=system_prompt,
+            **generate_kwargs
+        )
+        if not hasattr(response, "data"):
+            return result.model_copy(update=failure_of(response))
+        return score_output(result, response.data, score_schema, agent.config.name)
+
+    except Exception as e:
+        return result.model_copy(update={"status": "error", "error": f"{type(e).__name__}: {e}"})
+
+
+async def _run_windowed(
+    jobs: Iterable[Callable[[], Awaitable[T]]],
+    max_concurrency: int
+) -> AsyncIterator[T]:
+    """
+    Run jobs with at most `max_concurrency` in flight and yield their results as they finish.
+
+    Jobs are pulled lazily from `jobs`, so large inputs are never fully
+    materialized as tasks. Jobs still running when the consumer stops are cancelled.
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+
+    source = iter(jobs)
+    pending = set()
+    exhausted = False
+    try:
+        while True:
+            # Top up the window of in-flight jobs
+            while not exhausted and len(pending) < max_concurrency:
+                try:
+                    job = next(source)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending.add(asyncio.ensure_future(job()))
+
+            if not pending:
+                break
+
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+
+    finally:
+        # The consumer stopped early: do not leave requests running
+        for task in pending:
+            task.cancel()
+
+
+def evaluate_each(
+    evaluate: Callable[[EvaluationItem, int], Awaitable[T]],
+    items: Iterable[Any],
+    invalid: Callable[[int, str], T],
+    max_concurrency: int = 8
+) -> AsyncIterator[T]:
+    """
+    Evaluate items with a per-item coroutine, at most `max_concurrency` at a time.
+
+    Drives the judges built on `evaluate_item` (JudgePanel, CascadeJudge,
+    SelfConsistencyJudge) with the same bounded window as `evaluate_many`.
+    
+    Args:
+        evaluate: Coroutine function called with (item, index)
+        items: EvaluationItems, dicts or (question, instruction, response) tuples
+        invalid: Builds the failure result of a malformed item from (index, error)
+        max_concurrency: Maximum number of items evaluated at the same time
+    
+    Returns:
+        Async iterator over the result of every input item, in completion order
+    """
+    async def one(index: int, raw_item: Any) -> T:
+        try:
+            item = EvaluationItem.coerce(raw_item)
+        except Exception as e:
+            return invalid(index, f"Invalid item: {e}")
+        return await evaluate(item, index)
+
+    return _run_windowed(
+        (partial(one, index, raw_item) for index, raw_item in enumerate(items)), max_concurrency
+    )
+
+
+async def _evaluate_group(
+    agent: Union[LLMAgent, LLMAgentPool],
+    group: List[Tuple[int, Any]],
+    user_prompt_template: str,
+    system_prompt: Optional[str],
+    score_schema: ScoreSchemaRVC,
+    deadline_at: Optional[float] = None,
+    affinity: Optional[str] = None
+) -> List[EvaluationResult]:
+    """Evaluate (index, item) entries one after the other, coercing malformed items to failures."""
+    results = []
+    with deadline_scope(at=deadline_at):
+        for index, raw_item in group:
+            try:
+                item = EvaluationItem.coerce(raw_item)
+            except Exception as e:
+                results.append(EvaluationResult(index=index, status="error", error=f"Invalid item: {e}"))
+                continue
+            results.append(await evaluate_item(
+                agent, item, user_prompt_template, system_prompt, score_schema, index, affinity
+            ))
+    return results
+
+
+async def evaluate_many(
+    agent: Union[LLMAgent, LLMAgentPool],
+    items: Iterable[Any],
+    user_prompt_template: str,
+    system_prompt: Optional[str] = None,
+    score_schema: Optional[ScoreSchemaRVC] = None,
+    max_concurrency: int = 8,
+    ordered: bool = False,
+    deadline: Optional[float] = None,
+    group_by_response: bool = False
+) -> AsyncIterator[EvaluationResult]:
+    """
+    Evaluate many items concurrently and yield results as they finish.
+
+    Items are pulled lazily from `items`, so at most `max_concurrency` requests
+    are in flight and large inputs are never fully materialized as tasks.
+    
+    Args:
+        agent: Judge agent or pool (open it first to reuse its connections)
+        items: EvaluationItems, dicts or (question, instruction, response) tuples
+        user_prompt_template: Judge user prompt template
+        system_prompt: Optional judge system prompt
+        score_schema: Scoring schema, defaults to ScoreSchemaRVC()
+        max_concurrency: Maximum number of items evaluated at the same time
+        ordered: Yield results in input order instead of completion order.
+                 Finished results are buffered until all earlier items are done.
+        deadline: Optional time budget in seconds for the whole batch. Requests
+                  are cut short when it expires and the remaining items come back
+                  with status "timeout".
+        group_by_response: Evaluate the items about the same response back to back
+                           in one slot (reads all items upfront). max_concurrency
+                           then bounds the number of responses in progress.
+    
+    Yields:
+        EvaluationResult for every input item
+    """
+    score_schema = score_schema or ScoreSchemaRVC()
+    deadline_at = time.monotonic() + deadline if deadline is not None else None
+    if group_by_response:
+        groups = prompts.group_by_response(enumerate(items))
+    else:
+        groups = ([entry] for entry in enumerate(items))
+    use_affinity = group_by_response and isinstance(agent, LLMAgentPool)
+    jobs = (
+        partial(
+            _evaluate_group, agent, group, user_prompt_template, system_prompt, score_schema, deadline_at,
+            f"response-{group[0][0]}" if use_affinity else None
+        )
+        for group in groups
+    )
+    buffered = {}
+    next_index = 0
+
+    windowed = _run_windowed(jobs, max_concurrency)
+    try:
+        async for results in windowed:
+            for result in results:
+                if not ordered:
+                    yield result
+                    continue
+                buffered[result.index] = result
+            while next_index in buffered:
+                yield buffered.pop(next_index)
+                next_index += 1
+    finally:
+        # The consumer stopped early: cancel the requests in flight now
+        await windowed.aclose()
+
+
+async def _ask_pack(
+    agent: Union[LLMAgent, LLMAgentPool],
+    pending: List[EvaluationResult],
+    user_prompt_template: str,
+    system_prompt: Optional[str],
+    score_schema: ScoreSchemaRVC,
+    generate_kwargs: Dict[str, Any]
+) -> Tuple[List[EvaluationResult], List[EvaluationResult], Dict[str, str]]:
+    """Ask the questions of `pending` in one call; returns (scored, missing, failure of the missing)."""
+    try:
+        response = await agent.generate(
+            prompt=prompts.build_packed_prompt([result.item for result in pending], user_prompt_template),
+            system_prompt=system_prompt,
+            **generate_kwargs
+        )
+    except Exception as e:
+        return [], pending, {"status": "error", "error": f"{type(e).__name__}: {e}"}
+    if not hasattr(response, "data"):
+        return [], pending, failure_of(response)
+
+    raw = str(response.data)
+    evaluations = EvaluationResponse.parse_raw_evaluations(raw, len(pending))
+    scored, missing = [], []
+    for position, result in enumerate(pending):
+        if position in evaluations:
+            scored.append(score_evaluation(result, raw, evaluations[position], score_schema))
+        else:
+            missing.append(result.model_copy(update={"raw": raw}))
+    return scored, missing, {"status": "parse_error", "error": "Question missing from packed judge output"}
+
+
+async def _evaluate_pack(
+    agent: Union[LLMAgent, LLMAgentPool],
+    pack: List[Tuple[int, Any]],
+    user_prompt_template: str,
+    system_prompt: Optional[str],
+    score_schema: ScoreSchemaRVC,
+    max_reasks: int,
+    affinity: Optional[str] = None
+) -> List[EvaluationResult]:
+    """Evaluate (index, item) entries about one response in packed calls, re-asking missing questions."""
+    results = {}
+    remaining = []
+    for index, raw_item in pack:
+        try:
+            remaining.append(EvaluationResult(index=index, item=EvaluationItem.coerce(raw_item)))
+        except Exception as e:
+            results[index] = EvaluationResult(index=index, status="error", error=f"Invalid item: {e}")
+
+    generate_kwargs = {"affinity": affinity} if affinity is not None else {}
+    failed = {}
+    batches = [remaining] if remaining else []
+    for attempt in range(max_reasks + 1):
+        if not batches:
+            break
+        # A re-ask must reach the judge, not the cached or coalesced first answer
+        kwargs = generate_kwargs if attempt == 0 else dict(generate_kwargs, use_cache=False)
+        retry, timed_out = [], False
+        for batch in batches:
+            scored, missing, failure = await _ask_pack(
+                agent, batch, user_prompt_template, system_prompt, score_schema, kwargs
+            )
+            for result in scored:
+                results[result.index] = result
+                failed.pop(result.index, None)
+            for result in missing:
+                failed[result.index] = result.model_copy(update=failure)
+            if failure["status"] == "timeout":
+                timed_out = True
+                break
+            if failure["status"] == "parse_error" and len(missing) == len(batch) > 1:
+                # Nothing parsed: the same prompt would get the same answer,
+                # so ask each question on its own
+                retry.extend([result] for result in missing)
+            elif missing:
+                retry.append(missing)
+        if timed_out:
+            break
+        batches = retry
+
+    results.update(failed)
+    return [results[index] for index, _ in pack]
+
+
+async def evaluate_packed(
+    agent: Union[LLMAgent, LLMAgentPool],
+    items: Iterable[Any],
+    user_prompt_template: str = prompts.PACKED_USER_PROMPT_TEMPLATE,
+    system_prompt: Optional[str] = None,
+    score_schema: Optional[ScoreSchemaRVC] = None,
+    max_concurrency: int = 8,
+    pack_size: Optional[int] = None,
+    max_reasks: int = 1
+) -> AsyncIterator[EvaluationResult]:
+    """
+    Evaluate items with several questions about the same response per judge call.
+
+    Items are grouped by response (reads all items upfront) and split into packs
+    of `pack_size` questions. The judge must answer with a JSON array; elements
+    are validated one by one and only the questions missing or invalid in the
+    answer are asked again, bypassing the response cache, up to `max_reasks`
+    times. When no element of an answer parsed, its questions are re-asked one
+    per call, since the same prompt would get the same answer. The agent must
+    return plain strings (result_type None or str).
+    
+    Args:
+        agent: Judge agent or pool (open it first to reuse its connections)
+        items: EvaluationItems, dicts or (question, instruction, response) tuples
+        user_prompt_template: Packed judge user prompt template
+        system_prompt: Optional judge system prompt
+        score_schema: Scoring schema, defaults to ScoreSchemaRVC()
+        max_concurrency: Maximum number of packs evaluated at the same time
+        pack_size: Questions per call, defaults to the judge's LLMConfig.pack_size
+        max_reasks: Maximum follow-up rounds for questions missing from an answer
+    
+    Yields:
+        EvaluationResult for every input item, in completion order
+    """
+    score_schema = score_schema or ScoreSchemaRVC()
+    pack_size = pack_size or agent.config.pack_size
+    use_affinity = isinstance(agent, LLMAgentPool)
+    jobs = [
+        partial(
+            _evaluate_pack, agent, group[start:start + pack_size], user_prompt_template, system_prompt,
+            score_schema, max_reasks, f"response-{group[start][0]}" if use_affinity else None
+        )
+        for group in prompts.group_by_response(enumerate(items))
+        for start in range(0, len(group), pack_size)
+    ]
+
+    windowed = _run_windowed(jobs, max_concurrency)
+    try:
+        async for results in windowed:
+            for result in results:
+                yield result
+    finally:
+        await windowed.aclose()
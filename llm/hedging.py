@@ -0,0 +1,127 @@
+"""
+Hedged requests: when a request runs longer than a percentile of recent
+latencies, a duplicate is sent (to another endpoint or slot). The first good
+answer wins and the other request is cancelled, freeing its server slot.
+"""
+import time
+import asyncio
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from schemas.config import HedgingConfig
+from utils.stats import percentile
+
+
+class Hedger:
+    """
+    Runs calls with an optional hedge and tracks hedge rate and tail latency.
+    """
+
+    def __init__(self, config: Optional[HedgingConfig] = None, stats_window: int = 10000):
+        """
+        Args:
+            config: Hedging configuration, defaults to HedgingConfig()
+            stats_window: Number of latencies kept for reporting
+        """
+        self.config = config or HedgingConfig()
+        self._recent = deque(maxlen=self.config.window)
+        self._latencies = deque(maxlen=stats_window)
+        self._stats = {"calls": 0, "hedges": 0, "hedge_wins": 0}
+
+    def delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, or None while there are too few samples."""
+        if len(self._recent) < self.config.min_samples:
+            return None
+        return max(self.config.min_delay, percentile(self._recent, self.config.percentile))
+
+    async def run(
+        self,
+        primary: Callable[[], Awaitable[Any]],
+        backup: Callable[[], Awaitable[Any]],
+        is_success: Callable[[Any], bool] = lambda result: True,
+        started: Optional[asyncio.Event] = None
+    ) -> Any:
+        """
+        Run `primary`, hedging with `backup` if it is slower than the hedge delay.
+        
+        Args:
+            primary: Coroutine function making the request
+            backup: Coroutine function making the duplicate request
+            is_success: Whether a result is a good answer
+            started: Optional event set by `primary` once the request is sent
+                     (e.g. after waiting for rate limits and a concurrency
+                     slot); the hedge delay only counts from then on
+        
+        Returns:
+            The first good result, else the last result (or error) received
+        """
+        self._stats["calls"] += 1
+        start = served = time.monotonic()
+        first = asyncio.ensure_future(primary())
+
+        try:
+            if started is not None:
+                # Time queued behind a saturated endpoint is not worth a hedge,
+                # which would only add to its load
+                waiter = asyncio.ensure_future(started.wait())
+                try:
+                    await asyncio.wait({first, waiter}, return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    waiter.cancel()
+                served = time.monotonic()
+            done, _ = await asyncio.wait({first}, timeout=self.delay())
+        except asyncio.CancelledError:
+            first.cancel()
+            raise
+
+        if done:
+            self._record(start, served, first)
+            return first.result()
+
+        self._stats["hedges"] += 1
+        second = asyncio.ensure_future(backup())
+        pending = {first, second}
+        winner = last = None
+        try:
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    last = task
+                    if task.exception() is None and is_success(task.result()):
+                        winner = task
+                        break
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if winner is second:
+            self._stats["hedge_wins"] += 1
+        self._record(start, served, winner or last)
+        return (winner or last).result()
+
+    def _record(self, start: float, served: float, task: asyncio.Future) -> None:
+        # Callers see the latency from `start`; the hedge delay is compared
+        # with the latency from `served`
+        now = time.monotonic()
+        self._latencies.append(now - start)
+        if task.exception() is None:
+            self._recent.append(now - served)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Hedge rate, hedge win rate and latency seen by callers.
+
+        The latency a cancelled request would have had is unknown, so the p99
+        improvement is measured by comparing runs with and without hedging
+        (see benchmarks/hedging.py).
+        """
+        calls = self._stats["calls"]
+        hedges = self._stats["hedges"]
+        return dict(
+            self._stats,
+            hedge_rate=hedges / calls if calls else 0.0,
+            hedge_win_rate=self._stats["hedge_wins"] / hedges if hedges else 0.0,
+            hedge_delay=self.delay(),
+            p50_latency=percentile(self._latencies, 50),
+            p99_latency=percentile(self._latencies, 99),
+        )
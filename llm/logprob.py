@@ -0,0 +1,144 @@
+"""
+Verdict-only judging from token log probabilities.
+
+For gating checks the reasoning is not needed. The judge is asked for a single
+word (llm.prompts.VERDICT_ONLY_USER_PROMPT_TEMPLATE), generation is capped at a
+few tokens, and the verdict is read from the probabilities of the Pass and Fail
+alternatives of the first verdict token. The probability of the chosen verdict
+maps to the High/Medium/Low confidence expected by ScoreSchemaRVC; with
+ProbabilityScoreSchema, p(Pass) is used as a continuous score instead.
+
+`LogprobJudge` exposes the LLMAgent `generate` interface, so it can be passed
+to `evaluate_item` / `evaluate_many` in place of an agent.
+"""
+import re
+import json
+import math
+from typing import Any, Dict, Optional, Union
+
+from llm.agent import LLMAgent
+from schemas.config import LogprobConfig
+from schemas.generation import GenerationError, GenerationResult, GenerationTimeout
+
+
+def _normalize(token: str) -> str:
+    return token.strip().strip('"\'*`#:.').lower()
+
+
+def _matches(token: str, word: str) -> bool:
+    """Whether a token is the word or the start of it (e.g. 'Pass', ' pass', 'Pa')."""
+    token = _normalize(token)
+    return bool(token) and (word.startswith(token) or token.startswith(word))
+
+
+def verdict_probability(choice: Dict[str, Any]) -> Optional[float]:
+    """
+    Probability of Pass relative to Fail at the first verdict token of a completion.
+
+    Leading tokens without any Pass/Fail alternative that are only whitespace
+    or punctuation are skipped.
+
+    Args:
+        choice: Chat completion choice with OpenAI-style "logprobs"
+
+    Returns:
+        p(Pass) / (p(Pass) + p(Fail)), or None without usable log probabilities
+    """
+    tokens = (choice.get("logprobs") or {}).get("content") or []
+    for token in tokens:
+        candidates = token.get("top_logprobs") or [token]
+        p_pass = sum(math.exp(c["logprob"]) for c in candidates if _matches(c["token"], "pass"))
+        p_fail = sum(math.exp(c["logprob"]) for c in candidates if _matches(c["token"], "fail"))
+        if p_pass + p_fail > 0:
+            return p_pass / (p_pass + p_fail)
+        if _normalize(token["token"]):
+            return None
+    return None
+
+
+class LogprobJudge:
+    """
+    Fast Pass/Fail judge deriving its confidence from token probabilities.
+    """
+
+    # Confidence given when the endpoint returns no logprobs and the verdict is read from the text
+    FALLBACK_CONFIDENCE = "Medium"
+
+    def __init__(self, agent: LLMAgent, logprob_config: Optional[LogprobConfig] = None):
+        """
+        Args:
+            agent: Judge agent (plain-string result type)
+            logprob_config: Token budget and confidence thresholds
+        """
+        self.agent = agent
+        self.logprob_config = logprob_config or LogprobConfig()
+        self._stats = {"calls": 0, "logprobs": 0, "text_fallback": 0, "unparsed": 0}
+
+    @property
+    def config(self):
+        """Configuration of the underlying judge."""
+        return self.agent.config
+
+    def confidence(self, p_verdict: float) -> str:
+        """Confidence bucket of the probability of the chosen verdict."""
+        if p_verdict >= self.logprob_config.high_threshold:
+            return "High"
+        if p_verdict >= self.logprob_config.medium_threshold:
+            return "Medium"
+        return "Low"
+
+    async def generate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        **kwargs
+    ) -> Union[GenerationResult, GenerationTimeout, GenerationError]:
+        """
+        Ask for the verdict and derive it from the token probabilities.
+
+        Args:
+            prompt: Verdict-only user prompt
+            system_prompt: Optional system prompt to set context
+            **kwargs: Ignored LLMAgent.generate options (use_cache, affinity)
+
+        Returns:
+            GenerationResult whose data is the evaluation as JSON (reasoning,
+            verdict, confidence and p_pass), GenerationTimeout on timeout, or
+            GenerationError on other errors
+        """
+        choice = await self.agent.generate_logprobs(
+            prompt, system_prompt,
+            max_tokens=self.logprob_config.max_tokens,
+            top_logprobs=self.logprob_config.top_logprobs
+        )
+        self._stats["calls"] += 1
+        if not isinstance(choice, dict):
+            return choice
+
+        text = (choice.get("message") or {}).get("content") or ""
+        p_pass = verdict_probability(choice)
+        if p_pass is not None:
+            self._stats["logprobs"] += 1
+            verdict = "Pass" if p_pass >= 0.5 else "Fail"
+            evaluation = {
+                "reasoning": f"Verdict from token probabilities (p_pass={p_pass:.3f})",
+                "verdict": verdict,
+                "confidence": self.confidence(max(p_pass, 1 - p_pass)),
+                "p_pass": p_pass,
+            }
+        else:
+            match = re.search(r'\b(pass|fail)\b', text, re.IGNORECASE)
+            if match is None:
+                self._stats["unparsed"] += 1
+                return GenerationResult(data=text)
+            self._stats["text_fallback"] += 1
+            evaluation = {
+                "reasoning": "Verdict read from the text (no token probabilities returned)",
+                "verdict": match.group(1).capitalize(),
+                "confidence": self.FALLBACK_CONFIDENCE,
+            }
+        return GenerationResult(data=json.dumps(evaluation), evaluation=evaluation)
+
+    def stats(self) -> Dict[str, Any]:
+        """How often the verdict came from logprobs, from the text, or could not be read."""
+        return dict(self._stats)
@@ -0,0 +1,229 @@
+"""
+Evaluation of items by a panel of judges with vote aggregation.
+
+A JudgePanel holds one LLMAgent per judge configuration. Every item is sent to
+all judges concurrently; each judge output is parsed and scored like a single
+judge (`llm.evaluator.evaluate_item`), then the verdicts are combined:
+
+- "majority": the verdict with the most votes wins
+- "weighted": the verdict with the largest total judge weight wins
+- "score_mean": the weighted mean of the ScoreSchemaRVC scores decides
+  (Pass at or above `threshold`)
+
+Judges that fail (timeout, unparseable output, error) abstain. With
+`short_circuit`, the outstanding judge requests are cancelled as soon as they
+can no longer change the outcome.
+"""
+import asyncio
+from typing import Any, AsyncIterator, Dict, Iterable, Literal, Optional, Sequence
+
+from pydantic import BaseModel
+
+from llm.agent import LLMAgent
+from llm.evaluator import evaluate_each, evaluate_item
+from schemas.config import LLMConfig
+from schemas.evaluation import EvaluationItem, EvaluationResult, PanelResult
+from schemas.scoring_rvc import ScoreSchemaRVC, Verdict
+
+
+Voting = Literal["majority", "weighted", "score_mean"]
+
+
+class JudgePanel:
+    """
+    Several judges evaluating the same items, combined into one verdict per item.
+    """
+
+    def __init__(
+        self,
+        judges: Sequence[LLMConfig],
+        weights: Optional[Sequence[float]] = None,
+        voting: Voting = "majority",
+        short_circuit: bool = True,
+        threshold: float = 0.5,
+        score_schema: Optional[ScoreSchemaRVC] = None,
+        result_type: Optional[type[BaseModel]] = None,
+        **agent_kwargs
+    ):
+        """
+        Args:
+            judges: Configuration of every judge of the panel
+            weights: Optional weight per judge (defaults to 1.0 each). Used by
+                     "weighted" and "score_mean" voting.
+            voting: Aggregation method: "majority", "weighted" or "score_mean"
+            short_circuit: Cancel the remaining judges once the outcome is decided
+            threshold: Minimum mean score for a Pass with "score_mean" voting
+            score_schema: Scoring schema, defaults to ScoreSchemaRVC()
+            result_type: Optional Pydantic model to validate judge outputs
+            **agent_kwargs: Extra LLMAgent arguments (cache, single_flight, concurrency, ...)
+        """
+        if not judges:
+            raise ValueError("A panel needs at least one judge")
+        if weights is None:
+            weights = [1.0] * len(judges)
+        if len(weights) != len(judges):
+            raise ValueError("weights must have one entry per judge")
+        if any(weight <= 0 for weight in weights):
+            raise ValueError("weights must be positive")
+
+        self.voting = voting
+        self.short_circuit = short_circuit
+        self.threshold = threshold
+        self.score_schema = score_schema or ScoreSchemaRVC()
+        self.agents: Dict[str, LLMAgent] = {}
+        self.weights: Dict[str, float] = {}
+        for config, weight in zip(judges, weights):
+            name = self._unique_name(config.name)
+            self.agents[name] = LLMAgent(config, result_type=result_type, **agent_kwargs)
+            self.weights[name] = weight if voting != "majority" else 1.0
+        self._stats = {"items": 0, "calls": 0, "skipped": 0}
+
+    def _unique_name(self, name: str) -> str:
+        """Judge name, suffixed when the same model sits on the panel more than once."""
+        candidate, suffix = name, 2
+        while candidate in self.agents:
+            candidate = f"{name}#{suffix}"
+            suffix += 1
+        return candidate
+
+    async def open(self) -> "JudgePanel":
+        """Open every judge agent to reuse its connections."""
+        for agent in self.agents.values():
+            await agent.open()
+        return self
+
+    async def aclose(self) -> None:
+        for agent in self.agents.values():
+            await agent.aclose()
+
+    async def __aenter__(self) -> "JudgePanel":
+        return await self.open()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+
+    def _tally(self, votes: Dict[str, EvaluationResult]) -> Dict[str, float]:
+        """Sum the weights and weighted scores of the judges that voted."""
+        tally = {"pass": 0.0, "fail": 0.0, "score": 0.0}
+        for name, result in votes.items():
+            if not result.ok:
+                continue
+            weight = self.weights[name]
+            verdict = Verdict.from_string(result.evaluation["verdict"])
+            tally[verdict.value] += weight
+            tally["score"] += weight * result.score
+        return tally
+
+    def _verdict(self, tally: Dict[str, float]) -> Optional[str]:
+        """Panel verdict from the votes so far."""
+        voted = tally["pass"] + tally["fail"]
+        if voted == 0:
+            return None
+        if self.voting == "score_mean":
+            return "Pass" if tally["score"] / voted >= self.threshold else "Fail"
+        if tally["pass"] == tally["fail"]:
+            return None
+        return "Pass" if tally["pass"] > tally["fail"] else "Fail"
+
+    def _decided(self, tally: Dict[str, float], remaining: float) -> bool:
+        """
+        Whether the judges still pending (total weight `remaining`) can no
+        longer change the verdict, whatever they vote or if they abstain.
+        """
+        voted = tally["pass"] + tally["fail"]
+        if voted == 0:
+            return False
+        if self.voting == "score_mean":
+            lowest = tally["score"] / (voted + remaining)
+            highest = (tally["score"] + remaining) / (voted + remaining)
+            return lowest >= self.threshold or highest < self.threshold
+        return abs(tally["pass"] - tally["fail"]) > remaining
+
+    async def evaluate_item(
+        self,
+        item: EvaluationItem,
+        user_prompt_template: str,
+        system_prompt: Optional[str] = None,
+        index: int = 0
+    ) -> PanelResult:
+        """
+        Evaluate one item with every judge concurrently and aggregate the votes.
+
+        Args:
+            item: Item to evaluate
+            user_prompt_template: Judge user prompt template
+            system_prompt: Optional judge system prompt
+            index: Position of the item in the input
+
+        Returns:
+            PanelResult with the verdict, score and individual votes
+        """
+        tasks = {
+            asyncio.ensure_future(evaluate_item(
+                agent, item, user_prompt_template, system_prompt, self.score_schema, index
+            )): name
+            for name, agent in self.agents.items()
+        }
+        pending = set(tasks)
+        votes: Dict[str, EvaluationResult] = {}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    votes[tasks[task]] = task.result()
+                remaining = sum(self.weights[tasks[task]] for task in pending)
+                if pending and self.short_circuit and self._decided(self._tally(votes), remaining):
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+
+        tally = self._tally(votes)
+        voted = tally["pass"] + tally["fail"]
+        skipped = [tasks[task] for task in pending]
+        self._stats["items"] += 1
+        self._stats["calls"] += len(votes)
+        self._stats["skipped"] += len(skipped)
+        return PanelResult(
+            index=index,
+            item=item,
+            verdict=self._verdict(tally),
+            score=tally["score"] / voted if voted else None,
+            votes=votes,
+            skipped=skipped,
+        )
+
+    def evaluate_many(
+        self,
+        items: Iterable[Any],
+        user_prompt_template: str,
+        system_prompt: Optional[str] = None,
+        max_concurrency: int = 8
+    ) -> AsyncIterator[PanelResult]:
+        """
+        Evaluate many items with the panel, yielding results as they finish.
+
+        Args:
+            items: EvaluationItems, dicts or (question, instruction, response) tuples
+            user_prompt_template: Judge user prompt template
+            system_prompt: Optional judge system prompt
+            max_concurrency: Maximum number of items evaluated at the same time
+                             (each fans out to every judge)
+
+        Returns:
+            Async iterator over the PanelResult of every input item
+        """
+
+        return evaluate_each(
+            lambda item, index: self.evaluate_item(item, user_prompt_template, system_prompt, index),
+            items,
+            lambda index, error: PanelResult(index=index, error=error),
+            max_concurrency
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Judge calls made and saved by short-circuiting."""
+        stats = dict(self._stats)
+        possible = stats["calls"] + stats["skipped"]
+        stats["calls_saved_rate"] = stats["skipped"] / possible if possible else 0.0
+        return stats
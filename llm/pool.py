@@ -0,0 +1,321 @@
+"""
+Load balancing of one logical judge across several endpoints.
+
+An LLMAgentPool holds one LLMAgent per base URL of an LLMPoolConfig and routes
+every request to the endpoint with the fewest outstanding requests, or to the
+lowest load-weighted EWMA latency. Endpoints failing `max_failures` times in a
+row are ejected for `cooldown` seconds, then tried again; a failed request is
+retried once on each other endpoint, as long as neither the batch deadline nor
+the pool's failover timeout has passed. With a SingleFlight, concurrent identical
+requests are coalesced before routing, whichever endpoint they would go to. With
+a HedgingConfig, requests slower than the hedge delay are duplicated on a second
+endpoint. Requests sharing an
+affinity key (e.g. all questions about one response) stick to the same
+endpoint while it is available, so its prompt cache can be reused.
+"""
+import time
+import asyncio
+import hashlib
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from pydantic import BaseModel
+
+from llm.agent import LLMAgent
+from llm.cache import KEY_FIELDS, request_key
+from llm.deadline import deadline_scope, remaining
+from llm.hedging import Hedger
+from llm.singleflight import SingleFlight
+from schemas.config import HedgingConfig, LLMPoolConfig
+from schemas.generation import GenerationError, GenerationTimeout
+
+
+class Endpoint:
+    """
+    Routing state of one endpoint of the pool.
+    """
+
+    def __init__(self, agent: LLMAgent):
+        self.agent = agent
+        self.outstanding = 0
+        self.ewma_latency: Optional[float] = None
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self._stats = {"requests": 0, "failures": 0, "ejections": 0}
+
+    @property
+    def base_url(self) -> str:
+        return self.agent.config.base_url
+
+    def is_available(self, now: float) -> bool:
+        return now >= self.ejected_until
+
+    def record_success(self, latency: float, alpha: float) -> None:
+        self.consecutive_failures = 0
+        if self.ewma_latency is None:
+            self.ewma_latency = latency
+        else:
+            self.ewma_latency = alpha * latency + (1 - alpha) * self.ewma_latency
+
+    def record_failure(self, max_failures: int, cooldown: float) -> None:
+        self._stats["failures"] += 1
+        self.consecutive_failures += 1
+        now = time.monotonic()
+        if self.consecutive_failures >= max_failures and self.is_available(now):
+            self.ejected_until = now + cooldown
+            self._stats["ejections"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(
+            self._stats,
+            outstanding=self.outstanding,
+            ewma_latency=self.ewma_latency,
+            consecutive_failures=self.consecutive_failures,
+            ejected=not self.is_available(time.monotonic()),
+        )
+
+
+class LLMAgentPool:
+    """
+    One judge served by several endpoints, behind the LLMAgent `generate` interface.
+    """
+
+    # Request key fields: every endpoint serves the same model, so the endpoint
+    # a request is routed to does not change its answer
+    KEY_FIELDS = tuple(field for field in KEY_FIELDS if field != "base_url")
+
+    def __init__(
+        self,
+        pool_config: LLMPoolConfig,
+        result_type: Optional[type[BaseModel]] = None,
+        hedging: Optional[HedgingConfig] = None,
+        single_flight: Optional[SingleFlight] = None,
+        **agent_kwargs
+    ):
+        """
+        Args:
+            pool_config: Judge and endpoints configuration
+            result_type: Optional Pydantic model to validate output
+            hedging: Optional hedging of slow requests on another endpoint
+            single_flight: Optional deduplication of concurrent identical
+                           requests across all endpoints
+            **agent_kwargs: Extra LLMAgent arguments (cache, concurrency, ...)
+        """
+        self.pool_config = pool_config
+        self.result_type = result_type
+        self.single_flight = single_flight
+        self.endpoints = [
+            Endpoint(LLMAgent(config, result_type=result_type, **agent_kwargs))
+            for config in pool_config.endpoint_configs()
+        ]
+        self.hedger = Hedger(hedging) if hedging is not None else None
+        self._health_task: Optional[asyncio.Task] = None
+
+    @property
+    def config(self):
+        """Judge configuration shared by all endpoints."""
+        return self.pool_config.judge
+
+    async def open(self) -> "LLMAgentPool":
+        """Open every endpoint agent and start background health checks if configured."""
+        for endpoint in self.endpoints:
+            await endpoint.agent.open()
+        if self.pool_config.health_check_interval and self._health_task is None:
+            self._health_task = asyncio.ensure_future(self._health_loop())
+        return self
+
+    async def aclose(self) -> None:
+        if self._health_task is not None:
+            self._health_task.cancel()
+            self._health_task = None
+        for endpoint in self.endpoints:
+            await endpoint.agent.aclose()
+
+    async def __aenter__(self) -> "LLMAgentPool":
+        return await self.open()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+
+    def select(self, exclude: Iterable[Endpoint] = (), affinity: Optional[str] = None) -> Optional[Endpoint]:
+        """
+        Pick the endpoint for the next request.
+        
+        Args:
+            exclude: Endpoints not to use (e.g. already tried)
+            affinity: Optional key; requests with the same key go to the same
+                      available endpoint (rendezvous hashing)
+        
+        Returns:
+            The selected endpoint, or None if all are excluded
+        """
+        candidates = [endpoint for endpoint in self.endpoints if endpoint not in exclude]
+        if not candidates:
+            return None
+
+        now = time.monotonic()
+        available = [endpoint for endpoint in candidates if endpoint.is_available(now)]
+        if not available:
+            # Everything is ejected: try the endpoint due back first
+            return min(candidates, key=lambda endpoint: endpoint.ejected_until)
+
+        if affinity is not None:
+            return max(available, key=lambda endpoint: hashlib.sha1(
+                f"{affinity}|{endpoint.base_url}".encode("utf-8")).digest())
+
+        if self.pool_config.routing == "ewma":
+            # Unmeasured endpoints go first so every endpoint gets a latency,
+            # spread by their outstanding requests
+            return min(available, key=lambda endpoint: (
+                (endpoint.ewma_latency or 0.0) * (endpoint.outstanding + 1), endpoint.outstanding
+            ))
+        return min(available, key=lambda endpoint: (endpoint.outstanding, endpoint.ewma_latency or 0.0))
+
+    async def generate_on(
+        self,
+        endpoint: Endpoint,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        **generate_kwargs
+    ) -> Union[Dict[str, Any], BaseModel, str]:
+        """Generate on a given endpoint and update its routing state."""
+        endpoint.outstanding += 1
+        endpoint._stats["requests"] += 1
+        start = time.monotonic()
+        try:
+            response = await endpoint.agent.generate(prompt, system_prompt, **generate_kwargs)
+        finally:
+            endpoint.outstanding -= 1
+
+        if hasattr(response, "data"):
+            if not getattr(response, "cached", False):
+                endpoint.record_success(time.monotonic() - start, self.pool_config.ewma_alpha)
+        elif self._endpoint_failed(response):
+            endpoint.record_failure(self.pool_config.max_failures, self.pool_config.cooldown)
+        return response
+
+    @staticmethod
+    def _deadline_exceeded(response: Any) -> bool:
+        return isinstance(response, GenerationTimeout) and response.deadline_exceeded
+
+    @classmethod
+    def _endpoint_failed(cls, response: Any) -> bool:
+        """
+        Whether a failed response is the endpoint's fault: a transport error or
+        a request timeout. An expired batch deadline or an unusable answer
+        (e.g. output failing validation) says nothing about the endpoint.
+        """
+        if isinstance(response, GenerationTimeout):
+            return not response.deadline_exceeded
+        return isinstance(response, GenerationError) and response.transport
+
+    async def generate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        affinity: Optional[str] = None,
+        **generate_kwargs
+    ) -> Union[Dict[str, Any], BaseModel, str]:
+        """
+        Generate a response on the best endpoint, failing over to the others.
+        
+        Args:
+            prompt: The main user prompt
+            system_prompt: Optional system prompt to set context
+            affinity: Optional key routing related requests to the same endpoint
+            **generate_kwargs: Extra LLMAgent.generate arguments
+            
+        Returns:
+            Generated response, or the last failure (GenerationTimeout or
+            GenerationError) if every endpoint failed, the failure was not the
+            endpoint's fault, or no time was left to fail over
+        """
+        if self.single_flight is None or not generate_kwargs.get("use_cache", True):
+            return await self._generate(prompt, system_prompt, affinity, **generate_kwargs)
+
+        key = request_key(self.config, prompt, system_prompt, self.result_type, fields=self.KEY_FIELDS)
+        return await self.single_flight.do(
+            key, lambda: self._generate(prompt, system_prompt, affinity, **generate_kwargs)
+        )
+
+    async def _generate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        affinity: Optional[str] = None,
+        **generate_kwargs
+    ) -> Union[Dict[str, Any], BaseModel, str]:
+        """Route the request and fail over, see `generate`."""
+        failover_at = time.monotonic() + (self.pool_config.failover_timeout or self.config.timeout)
+        tried: List[Endpoint] = []
+        if self.hedger is not None:
+            first = self.select(affinity=affinity)
+            tried.append(first)
+
+            def backup():
+                # Prefer another endpoint; with a single one, use another slot
+                second = self.select(exclude=tried) or first
+                tried.append(second)
+                return self.generate_on(second, prompt, system_prompt, **generate_kwargs)
+
+            response = await self.hedger.run(
+                lambda: self.generate_on(first, prompt, system_prompt, **generate_kwargs),
+                backup,
+                is_success=lambda result: hasattr(result, "data")
+            )
+            if hasattr(response, "data"):
+                return response
+
+            last = response
+        else:
+            last = {}
+
+        while True:
+            if self._deadline_exceeded(last) or (tried and not self._endpoint_failed(last)):
+                # Another endpoint would not do better
+                return last
+            left = remaining()
+            if tried and (time.monotonic() >= failover_at or (left is not None and left <= 0)):
+                return last
+            endpoint = self.select(exclude=tried, affinity=affinity)
+            if endpoint is None:
+                return last
+            # Failover attempts only get the time left before failover_at
+            with deadline_scope(at=failover_at if tried else None):
+                last = await self.generate_on(endpoint, prompt, system_prompt, **generate_kwargs)
+            if hasattr(last, "data"):
+                return last
+            tried.append(endpoint)
+
+    async def check_health(self) -> Dict[str, bool]:
+        """
+        Ping every endpoint, ejecting the ones that keep failing and
+        reinstating ejected ones that answer again.
+        
+        Returns:
+            Health status keyed by base URL
+        """
+        results = await asyncio.gather(*(endpoint.agent.ping() for endpoint in self.endpoints))
+        for endpoint, healthy in zip(self.endpoints, results):
+            if healthy:
+                endpoint.consecutive_failures = 0
+                endpoint.ejected_until = 0.0
+            else:
+                endpoint.record_failure(self.pool_config.max_failures, self.pool_config.cooldown)
+        return {endpoint.base_url: healthy for endpoint, healthy in zip(self.endpoints, results)}
+
+    async def _health_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.pool_config.health_check_interval)
+            await self.check_health()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Routing stats and agent metrics per endpoint, hedging and single-flight stats."""
+        metrics = {
+            endpoint.base_url: dict(endpoint.stats(), agent=endpoint.agent.metrics())
+            for endpoint in self.endpoints
+        }
+        if self.hedger is not None:
+            metrics["hedging"] = self.hedger.stats()
+        if self.single_flight is not None:
+            metrics["single_flight"] = self.single_flight.stats()
+        return metrics
@@ -0,0 +1,159 @@
+"""
+Prefix-stable judge prompt assembly.
+
+Inference servers such as Ollama reuse the KV cache of the longest prompt prefix
+shared with the previous request of a slot. The template in `example_code.py`
+starts with the per-question text, so consecutive calls over the same response
+share almost nothing. Here segments are ordered from most to least shared:
+the system prompt (sent separately), the task and output format (same for every
+call), the instruction and response (same for all questions about a response),
+and finally the assessment question.
+
+The packed template asks several questions about one response in a single
+call; the judge answers with a JSON array of evaluations. The verdict-only
+template asks for a single word so the verdict can be read from the first
+token's log probabilities (llm.logprob).
+"""
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from schemas.evaluation import EvaluationItem
+
+
+PREFIX_STABLE_USER_PROMPT_TEMPLATE = """
+Answer the assessment question at the end by comparing Instruction to Student and Student Response for Evaluation.
+Analyze the 2 texts step by step.
+
+### **Output Format**
+Example format:
+{{
+    "reasoning": "Explanation and reasoning to answer the question",
+    "verdict": "Pass/Fail",
+    "confidence": "High/Medium/Low"
+}}
+
+### **Instruction to Student**
+{student_instruction}
+
+### **Student Response for Evaluation:**
+{student_response}
+
+### **Assessment Question:**
+{assessment_question}
+"""
+
+
+PACKED_USER_PROMPT_TEMPLATE = """
+Answer each assessment question at the end by comparing Instruction to Student and Student Response for Evaluation.
+Analyze the 2 texts step by step, separately for every question.
+
+### **Output Format**
+Return a JSON array with one object per question, in the order of the questions.
+Example format:
+[
+    {{
+        "question": 1,
+        "reasoning": "Explanation and reasoning to answer the question",
+        "verdict": "Pass/Fail",
+        "confidence": "High/Medium/Low"
+    }}
+]
+
+### **Instruction to Student**
+{student_instruction}
+
+### **Student Response for Evaluation:**
+{student_response}
+
+### **Assessment Questions:**
+{assessment_questions}
+"""
+
+
+VERDICT_ONLY_USER_PROMPT_TEMPLATE = """
+Answer the assessment question at the end by comparing Instruction to Student and Student Response for Evaluation.
+
+### **Output Format**
+Reply with exactly one word: Pass or Fail. Do not explain.
+
+### **Instruction to Student**
+{student_instruction}
+
+### **Student Response for Evaluation:**
+{student_response}
+
+### **Assessment Question:**
+{assessment_question}
+"""
+
+
+def build_prompt(item: Any, user_prompt_template: str = PREFIX_STABLE_USER_PROMPT_TEMPLATE) -> str:
+    """
+    Build the judge user prompt of an item.
+    
+    Args:
+        item: EvaluationItem, dict or (question, instruction, response) tuple
+        user_prompt_template: Template, prefix-stable by default
+    
+    Returns:
+        The user prompt
+    """
+    return EvaluationItem.coerce(item).format_prompt(user_prompt_template)
+
+
+def build_packed_prompt(
+    items: List[EvaluationItem],
+    user_prompt_template: str = PACKED_USER_PROMPT_TEMPLATE
+) -> str:
+    """
+    Build one judge user prompt asking all the questions of items about the same response.
+    
+    Args:
+        items: Items sharing the same instruction and response
+        user_prompt_template: Template with {student_instruction}, {student_response},
+                              {assessment_questions} (and optionally {student_role}) fields
+    
+    Returns:
+        The user prompt, with questions numbered from 1
+    """
+    first = items[0]
+    if any(response_key(item) != response_key(first) for item in items):
+        raise ValueError("Packed items must share the same instruction and response")
+    questions = "\n".join(
+        f"{number}. {item.assessment_question}" for number, item in enumerate(items, start=1)
+    )
+    return user_prompt_template.format(
+        assessment_questions=questions,
+        student_instruction=first.student_instruction,
+        student_response=first.student_response,
+        student_role=first.student_role
+    )
+
+
+def response_key(item: EvaluationItem) -> Tuple[str, str, str]:
+    """Key shared by all items about the same student response."""
+    return (item.student_role, item.student_instruction, item.student_response)
+
+
+def group_by_response(entries: Iterable[Tuple[int, Any]]) -> List[List[Tuple[int, Any]]]:
+    """
+    Group (index, item) entries about the same response, so their calls can run
+    back to back on one endpoint.
+
+    Groups keep the order in which their response first appears, and items keep
+    their order within a group. Items that cannot be coerced to EvaluationItem
+    form their own group.
+    
+    Args:
+        entries: (index, item) pairs
+    
+    Returns:
+        List of groups of (index, item) pairs
+    """
+    groups: Dict[Hashable, List[Tuple[int, Any]]] = {}
+    for index, raw_item in entries:
+        try:
+            key: Optional[Hashable] = response_key(EvaluationItem.coerce(raw_item))
+        except Exception:
+            key = ("invalid", index)
+        groups.setdefault(key, []).append((index, raw_item))
+    return list(groups.values())
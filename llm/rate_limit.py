@@ -0,0 +1,185 @@
+"""
+Token-bucket rate limiting of requests/min and tokens/min per endpoint.
+
+Limits come from `LLMConfig.requests_per_minute` / `LLMConfig.tokens_per_minute`.
+A single RateLimiter is shared by every LLMAgent using the same model of the
+same base URL, so concurrent agents together stay under the provider quota
+instead of relying on retries.
+"""
+import time
+import asyncio
+from typing import Any, Dict, Optional, Tuple
+
+from schemas.config import LLMConfig
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """
+    Rough token count of a text (about 4 characters per token).
+    
+    Args:
+        text: Text to estimate
+    
+    Returns:
+        Estimated number of tokens
+    """
+    if not text:
+        return 0
+    return max(1, len(text) // 4)
+
+
+class TokenBucket:
+    """
+    Async token bucket refilled continuously at `rate_per_minute`.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        """
+        Args:
+            rate_per_minute: Tokens added per minute
+            capacity: Maximum burst size, defaults to one minute of tokens
+        """
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be positive")
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(capacity or rate_per_minute)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_lock(self) -> asyncio.Lock:
+        # A lock is bound to the loop that first waits on it, and the bucket
+        # outlives the loop when it is shared across asyncio.run calls
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._loop is not loop:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+        return self._lock
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1) -> float:
+        """
+        Take `amount` tokens, waiting until they are available.
+        Requests are served first come, first served.
+        
+        Args:
+            amount: Number of tokens, capped at the bucket capacity
+        
+        Returns:
+            Seconds spent waiting
+        """
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        async with self._get_lock():
+            self._refill()
+            while self._tokens < amount:
+                delay = (amount - self._tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+                self._refill()
+            self._tokens -= amount
+        return waited
+
+    def adjust(self, amount: float) -> None:
+        """Give back (positive) or take (negative) tokens after the fact."""
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens + amount)
+
+    @property
+    def available(self) -> float:
+        self._refill()
+        return self._tokens
+
+
+class RateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute limits of one endpoint.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None
+    ):
+        """
+        Args:
+            requests_per_minute: Request quota, None for unlimited
+            tokens_per_minute: Token quota (prompt + completion), None for unlimited
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self._stats = {"requests": 0, "tokens_reserved": 0, "wait_seconds": 0.0}
+
+    async def acquire(self, tokens: int) -> float:
+        """
+        Wait until a request using `tokens` tokens fits in both quotas.
+        
+        Args:
+            tokens: Estimated tokens of the request
+        
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        if self.requests is not None:
+            waited += await self.requests.acquire(1)
+        if self.tokens is not None:
+            waited += await self.tokens.acquire(tokens)
+
+        self._stats["requests"] += 1
+        self._stats["tokens_reserved"] += tokens
+        self._stats["wait_seconds"] += waited
+        return waited
+
+    def reconcile(self, estimated: int, actual: Optional[int]) -> None:
+        """Correct the token bucket once the real usage of a request is known."""
+        if self.tokens is not None and actual:
+            self.tokens.adjust(estimated - actual)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        if self.tokens is not None:
+            stats["tokens_available"] = self.tokens.available
+        if self.requests is not None:
+            stats["requests_available"] = self.requests.available
+        return stats
+
+
+# Shared limiters keyed by (base URL, model name), as provider quotas are per model
+_rate_limiters: Dict[Tuple[str, str], RateLimiter] = {}
+
+
+def get_rate_limiter(config: LLMConfig) -> Optional[RateLimiter]:
+    """
+    Get the limiter shared by all agents of the config's endpoint and model.
+
+    The first config seen for an endpoint and model sets its limits; a later
+    config with different limits gets the existing limiter and a warning.
+    
+    Args:
+        config: LLM configuration
+    
+    Returns:
+        The shared RateLimiter, or None if the config sets no limit
+    """
+    if not config.requests_per_minute and not config.tokens_per_minute:
+        return None
+    key = (config.base_url, config.name)
+    limiter = _rate_limiters.get(key)
+    if limiter is None:
+        limiter = _rate_limiters[key] = RateLimiter(
+            requests_per_minute=config.requests_per_minute,
+            tokens_per_minute=config.tokens_per_minute
+        )
+    elif (limiter.requests_per_minute, limiter.tokens_per_minute) != (config.requests_per_minute, config.tokens_per_minute):
+        print(f"Warning: rate limits of {config.name} at {config.base_url} are already set to "
+              f"requests_per_minute={limiter.requests_per_minute}, tokens_per_minute={limiter.tokens_per_minute}; "
+              f"ignoring requests_per_minute={config.requests_per_minute}, tokens_per_minute={config.tokens_per_minute}")
+    return limiter
@@ -0,0 +1,191 @@
+"""
+Circuit breakers and jittered exponential backoff for judge endpoints.
+
+Transport errors (connection failures, timeouts, 429, 5xx) are retried with
+capped exponential backoff and full jitter, and count towards the endpoint's
+circuit breaker. Errors about the answer, e.g. output that fails validation,
+mean the endpoint answered: they are raised at once and count as a success.
+Calls given up locally (cancelled, or past the batch deadline) and any other
+error are raised without recording anything.
+
+While a breaker is open, requests to its endpoint fail fast with
+CircuitOpenError so an overloaded or down host gets time to recover.
+"""
+import time
+import random
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from llm.errors import is_answer_error, is_transport_error, retry_after_of
+from schemas.config import ResilienceConfig
+
+
+class CircuitOpenError(Exception):
+    """Request rejected because the endpoint's circuit is open."""
+
+    def __init__(self, base_url: str, retry_in: float):
+        super().__init__(f"Circuit open for {base_url}, retry in {retry_in:.1f}s")
+        self.base_url = base_url
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open circuit breaker of one endpoint.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, base_url: str, config: ResilienceConfig):
+        self.base_url = base_url
+        self.config = config
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._consecutive_failures = 0
+        self._half_open_calls = 0
+        self._stats = {"successes": 0, "failures": 0, "rejected": 0, "opened": 0}
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.config.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._half_open_calls = 0
+        return self._state
+
+    def before_call(self) -> bool:
+        """
+        Admit a request or reject it.
+        
+        Returns:
+            Whether the request is a half-open trial, whose slot must be
+            given back with `release` if it ends without an outcome
+        
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with its
+                              trial requests already in flight
+        """
+        state = self.state
+        if state == self.CLOSED:
+            return False
+        if state == self.HALF_OPEN and self._half_open_calls < self.config.half_open_max_calls:
+            self._half_open_calls += 1
+            return True
+
+        self._stats["rejected"] += 1
+        retry_in = max(0.0, self._opened_at + self.config.reset_timeout - time.monotonic())
+        raise CircuitOpenError(self.base_url, retry_in)
+
+    def release(self, trial: bool) -> None:
+        """Give back the slot of a request that ended without success or failure."""
+        if trial and self._state == self.HALF_OPEN and self._half_open_calls > 0:
+            self._half_open_calls -= 1
+
+    def record_success(self) -> None:
+        self._stats["successes"] += 1
+        self._consecutive_failures = 0
+        if self._state != self.CLOSED:
+            self._state = self.CLOSED
+
+    def record_failure(self) -> None:
+        self._stats["failures"] += 1
+        self._consecutive_failures += 1
+        state = self.state
+        if state == self.HALF_OPEN or (state == self.CLOSED and self._consecutive_failures >= self.config.failure_threshold):
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
+            self._stats["opened"] += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        return dict(
+            self._stats,
+            state=self.state,
+            consecutive_failures=self._consecutive_failures,
+        )
+
+
+def backoff_delay(attempt: int, config: ResilienceConfig, rng: random.Random = random) -> float:
+    """
+    Full-jitter exponential backoff before retry number `attempt` (starting at 0).
+    
+    Args:
+        attempt: Number of the retry
+        config: Resilience configuration
+        rng: Random generator
+    
+    Returns:
+        Seconds to wait
+    """
+    return rng.uniform(0, min(config.backoff_max, config.backoff_base * 2 ** attempt))
+
+
+class Resilience:
+    """
+    Retries with backoff and circuit breakers, one breaker per endpoint base URL.
+    """
+
+    def __init__(self, config: Optional[ResilienceConfig] = None):
+        """
+        Args:
+            config: Resilience configuration, defaults to ResilienceConfig()
+        """
+        self.config = config or ResilienceConfig()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._stats = {"calls": 0, "retries": 0, "backoff_seconds": 0.0}
+
+    def breaker(self, base_url: str) -> CircuitBreaker:
+        """Get (or create) the circuit breaker of an endpoint."""
+        if base_url not in self._breakers:
+            self._breakers[base_url] = CircuitBreaker(base_url, self.config)
+        return self._breakers[base_url]
+
+    async def call(self, base_url: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Call an endpoint through its breaker, retrying transport errors.
+        
+        Args:
+            base_url: Endpoint the call goes to
+            fn: Coroutine function making one attempt
+        
+        Returns:
+            The result of the first successful attempt
+        
+        Raises:
+            CircuitOpenError: If the circuit is (or becomes) open
+            Exception: The last transport error, or any other error at once
+        """
+        breaker = self.breaker(base_url)
+        self._stats["calls"] += 1
+        for attempt in range(self.config.max_attempts):
+            trial = breaker.before_call()
+            try:
+                result = await fn()
+            except Exception as e:
+                if not is_transport_error(e):
+                    if is_answer_error(e):
+                        # The endpoint answered; the problem is the answer
+                        breaker.record_success()
+                    else:
+                        breaker.release(trial)
+                    raise
+                breaker.record_failure()
+                if attempt + 1 >= self.config.max_attempts or breaker.state == CircuitBreaker.OPEN:
+                    raise
+                delay = max(backoff_delay(attempt, self.config), retry_after_of(e) or 0.0)
+                self._stats["retries"] += 1
+                self._stats["backoff_seconds"] += delay
+                await asyncio.sleep(min(delay, self.config.backoff_max))
+            except BaseException:
+                # Cancelled before the endpoint answered
+                breaker.release(trial)
+                raise
+            else:
+                breaker.record_success()
+                return result
+
+    def metrics(self) -> Dict[str, Any]:
+        """Retry counters and breaker state per endpoint."""
+        return dict(
+            self._stats,
+            breakers={base_url: breaker.metrics() for base_url, breaker in self._breakers.items()},
+        )
@@ -0,0 +1,191 @@
+"""
+Model-swap-aware scheduling of work across several models on one host.
+
+A single Ollama server keeps a limited number of models in memory. Interleaving
+requests for different models makes it load and unload weights over and over,
+so `ModelSwapScheduler` queues work per model (`LLMConfig.name`) and drains one
+model's queue before switching. At most `max_resident` models are loaded at
+once; the least recently used one is unloaded to make room for the next. Time
+spent unloading and warming up models is reported as swap time.
+"""
+import time
+import asyncio
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, Tuple
+
+from llm.agent import LLMAgent
+
+
+Job = Callable[[LLMAgent], Awaitable[Any]]
+
+
+class ModelSwapScheduler:
+    """
+    Run queued jobs grouped by model, limiting the number of co-resident models.
+
+    Jobs are callables taking the model's LLMAgent (e.g. a `lambda agent:
+    evaluate_item(agent, ...)`). The scheduler owns the agents' lifecycle: an
+    agent is opened and warmed up when its model is swapped in, and closed and
+    unloaded when it is swapped out.
+    """
+
+    def __init__(
+        self,
+        agents: Iterable[LLMAgent],
+        max_resident: int = 1,
+        max_concurrency: int = 8
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            agents: One agent per model, keyed by their config name
+            max_resident: Maximum number of models loaded at the same time
+            max_concurrency: Maximum number of jobs in flight for the active model
+        """
+        if max_resident < 1:
+            raise ValueError("max_resident must be at least 1")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        self.agents: Dict[str, LLMAgent] = {agent.config.name: agent for agent in agents}
+        self.max_resident = max_resident
+        self.max_concurrency = max_concurrency
+        self._queues: Dict[str, Deque[Tuple[Job, asyncio.Future]]] = {name: deque() for name in self.agents}
+        # Loaded models, least recently used first
+        self._resident: "OrderedDict[str, None]" = OrderedDict()
+        self._swaps = 0
+        self._swap_seconds = 0.0
+        self._completed: Dict[str, int] = {name: 0 for name in self.agents}
+
+    def submit(self, model: str, job: Job) -> asyncio.Future:
+        """
+        Queue a job for a model.
+
+        Args:
+            model: Name of the model (LLMConfig.name) the job must run on
+            job: Callable receiving the model's agent and returning an awaitable
+
+        Returns:
+            Future resolved with the job's result once `run` executes it
+        """
+        if model not in self.agents:
+            raise KeyError(f"Unknown model: {model}")
+        future = asyncio.get_running_loop().create_future()
+        self._queues[model].append((job, future))
+        return future
+
+    def pending(self) -> Dict[str, int]:
+        """Number of queued jobs per model."""
+        return {name: len(queue) for name, queue in self._queues.items() if queue}
+
+    def _next_model(self) -> str:
+        """Prefer a loaded model with queued work, otherwise the largest queue."""
+        waiting = self.pending()
+        for name in reversed(self._resident):
+            if name in waiting:
+                return name
+        return max(waiting, key=waiting.get)
+
+    async def _swap_in(self, model: str) -> None:
+        """Make room for the model if needed, then open and warm it up."""
+        if model in self._resident:
+            self._resident.move_to_end(model)
+            return
+
+        start = time.monotonic()
+        try:
+            while len(self._resident) >= self.max_resident:
+                evicted, _ = self._resident.popitem(last=False)
+                await self._swap_out(evicted)
+            await self.agents[model].open(warmup=True)
+            self._resident[model] = None
+        finally:
+            self._swaps += 1
+            self._swap_seconds += time.monotonic() - start
+
+    async def _swap_out(self, model: str) -> None:
+        """Close the model's agent and ask the server to unload it."""
+        agent = self.agents[model]
+        await agent.aclose()
+        try:
+            await agent.unload()
+        except Exception as e:
+            print(f"Failed to unload {model}: {e}")
+
+    async def _drain(self, model: str) -> None:
+        """Run the model's queued jobs, at most max_concurrency at a time."""
+        agent = self.agents[model]
+        queue = self._queues[model]
+        # In-flight tasks and the futures of their jobs
+        pending: Dict[asyncio.Task, asyncio.Future] = {}
+
+        async def execute(job: Job, future: asyncio.Future) -> None:
+            try:
+                result = await job(agent)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(result)
+            self._completed[model] += 1
+
+        try:
+            while queue or pending:
+                while queue and len(pending) < self.max_concurrency:
+                    job, future = queue.popleft()
+                    pending[asyncio.ensure_future(execute(job, future))] = future
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    del pending[task]
+        finally:
+            # Interrupted: stop the work in flight and release its callers
+            for task, future in pending.items():
+                task.cancel()
+                future.cancel()
+
+    def _fail(self, model: str, error: Exception) -> None:
+        """Fail every queued job of a model that could not be loaded."""
+        queue = self._queues[model]
+        while queue:
+            _, future = queue.popleft()
+            if not future.done():
+                future.set_exception(error)
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        Drain all queues, one model at a time, then unload the resident models.
+
+        Returns:
+            Scheduling statistics (see `stats`)
+        """
+        try:
+            while self.pending():
+                model = self._next_model()
+                try:
+                    await self._swap_in(model)
+                except Exception as e:
+                    print(f"Failed to load {model}: {e}")
+                    self._fail(model, e)
+                    continue
+                await self._drain(model)
+        finally:
+            # Interrupted: callers of jobs that never ran must not wait forever
+            for queue in self._queues.values():
+                while queue:
+                    _, future = queue.popleft()
+                    future.cancel()
+            while self._resident:
+                evicted, _ = self._resident.popitem(last=False)
+                await self._swap_out(evicted)
+        return self.stats()
+
+    def stats(self) -> Dict[str, Any]:
+        """Swap count, total time spent swapping models and completed jobs per model."""
+        return {
+            "swaps": self._swaps,
+            "swap_seconds": self._swap_seconds,
+            "resident": list(self._resident),
+            "completed": dict(self._completed),
+        }
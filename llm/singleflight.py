@@ -0,0 +1,72 @@
+"""
+Single-flight deduplication of identical in-flight requests.
+
+Concurrent callers asking for the same key share one underlying call: the first
+caller starts it, later callers await the same task. The call is cancelled only
+once every waiting caller has been cancelled.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class _Call:
+    """An in-flight call and the number of callers waiting on it."""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls sharing the same key into a single execution.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self._stats = {"calls": 0, "executed": 0, "coalesced": 0}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run `fn` unless a call with the same key is already in flight.
+        
+        Args:
+            key: Normalized request key
+            fn: Zero-argument coroutine function performing the call
+        
+        Returns:
+            The result of the (possibly shared) call
+        """
+        self._stats["calls"] += 1
+        call = self._calls.get(key)
+        if call is None:
+            self._stats["executed"] += 1
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _, key=key, call=call: self._forget(key, call))
+        else:
+            self._stats["coalesced"] += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if not call.task.done() and call.waiters == 1:
+                # Last interested caller gave up: free the request
+                call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+    def _forget(self, key: str, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    @property
+    def in_flight(self) -> int:
+        """Number of distinct calls currently running."""
+        return len(self._calls)
+
+    def stats(self) -> Dict[str, int]:
+        """Total, executed and coalesced call counters."""
+        return dict(self._stats, in_flight=self.in_flight)
@@ -0,0 +1,171 @@
+"""
+Direct HTTP transport to OpenAI-compatible `/chat/completions` endpoints.
+
+For plain-string judges the pydantic_ai Agent machinery (message history,
+result validation, tool handling) is not needed. `ChatCompletionsModel` and
+`ChatCompletionsAgent` send the request straight over a pooled httpx client and
+expose the small part of the pydantic_ai interface that LLMAgent uses
+(`run`, `run_stream`, `stream_text`, `usage`), so they plug in behind the same
+`generate` / `generate_stream` calls. Select it with `LLMConfig.transport="http"`.
+
+No retries are made here; use LLMAgent's `resilience` for transport retries.
+"""
+import json
+import asyncio
+import weakref
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+
+from schemas.config import LLMConfig
+
+
+# One pooled client per event loop for agents without their own client
+_shared_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def shared_http_client() -> httpx.AsyncClient:
+    """Pooled HTTP client shared by all direct-transport calls of the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _shared_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+        )
+        _shared_clients[loop] = client
+    return client
+
+
+@dataclass
+class ChatUsage:
+    """Token usage reported by the endpoint."""
+    total_tokens: Optional[int] = None
+
+
+@dataclass
+class ChatResult:
+    """Result of one chat completion, shaped like a pydantic_ai RunResult."""
+    data: str
+    _usage: ChatUsage
+
+    def usage(self) -> ChatUsage:
+        return self._usage
+
+
+class ChatStream:
+    """Streamed chat completion, shaped like a pydantic_ai StreamedRunResult."""
+
+    def __init__(self, response: httpx.Response):
+        self._response = response
+
+    async def stream_text(self, delta: bool = False, debounce_by: Optional[float] = None) -> AsyncIterator[str]:
+        """
+        Yield the completion text as it arrives.
+
+        Args:
+            delta: Yield only the new text of each chunk instead of the text so far
+            debounce_by: Accepted for interface compatibility, chunks are never grouped
+        """
+        text = ""
+        async for line in self._response.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            data = line[len("data:"):].strip()
+            if data == "[DONE]":
+                break
+            choices = json.loads(data).get("choices") or [{}]
+            chunk = (choices[0].get("delta") or {}).get("content")
+            if not chunk:
+                continue
+            text += chunk
+            yield chunk if delta else text
+
+
+def chat_messages(prompt: str, system_prompt: Optional[str] = None) -> List[Dict[str, str]]:
+    """Messages of a single-turn chat completion."""
+    messages = [{"role": "system", "content": system_prompt}] if system_prompt else []
+    messages.append({"role": "user", "content": prompt})
+    return messages
+
+
+class ChatCompletionsModel:
+    """
+    Endpoint, credentials and HTTP client of a direct-transport judge.
+    """
+
+    def __init__(self, config: LLMConfig, api_key: str, http_client: Optional[httpx.AsyncClient] = None):
+        """
+        Args:
+            config: LLM configuration
+            api_key: Resolved API key
+            http_client: Optional HTTP client, defaults to the shared pooled client
+        """
+        self.config = config
+        self.url = f"{config.base_url}/chat/completions"
+        self.headers = {"Authorization": f"Bearer {api_key}"}
+        self._http_client = http_client
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self._http_client or shared_http_client()
+
+    def payload(self, messages: List[Dict[str, str]], settings: Dict[str, Any], stream: bool = False) -> Dict[str, Any]:
+        """Request body of a chat completion."""
+        payload = {"model": self.config.name, "messages": messages, **settings}
+        if stream:
+            payload["stream"] = True
+        return payload
+
+    async def request(self, messages: List[Dict[str, str]], settings: Dict[str, Any]) -> Dict[str, Any]:
+        """Send a chat completion and return the response body with every choice."""
+        response = await self.client.post(
+            self.url, json=self.payload(messages, settings), headers=self.headers, timeout=self.config.timeout
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def complete(self, messages: List[Dict[str, str]], settings: Dict[str, Any]) -> ChatResult:
+        """Send a chat completion and return the first choice."""
+        body = await self.request(messages, settings)
+        return ChatResult(
+            data=body["choices"][0]["message"]["content"] or "",
+            _usage=ChatUsage(total_tokens=(body.get("usage") or {}).get("total_tokens"))
+        )
+
+    @asynccontextmanager
+    async def stream(self, messages: List[Dict[str, str]], settings: Dict[str, Any]):
+        """Open a streamed chat completion; leaving the context closes the connection."""
+        async with self.client.stream(
+            "POST", self.url, json=self.payload(messages, settings, stream=True),
+            headers=self.headers, timeout=self.config.timeout
+        ) as response:
+            response.raise_for_status()
+            yield ChatStream(response)
+
+
+class ChatCompletionsAgent:
+    """
+    Plain-string judge on a ChatCompletionsModel, used in place of a pydantic_ai Agent.
+    """
+
+    def __init__(
+        self,
+        model: ChatCompletionsModel,
+        system_prompt: Optional[str] = None,
+        model_settings: Optional[Dict[str, Any]] = None
+    ):
+        self.model = model
+        self.system_prompt = system_prompt
+        self.model_settings = model_settings or {}
+
+    async def run(self, prompt: str) -> ChatResult:
+        """Generate a completion of the prompt."""
+        return await self.model.complete(chat_messages(prompt, self.system_prompt), self.model_settings)
+
+    @asynccontextmanager
+    async def run_stream(self, prompt: str):
+        """Stream a completion of the prompt."""
+        async with self.model.stream(chat_messages(prompt, self.system_prompt), self.model_settings) as stream:
+            yield stream
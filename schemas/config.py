@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, validator
-from typing import Optional, Literal
+from typing import Dict, List, Optional, Literal
 
 
 class LLMConfig(BaseModel):
@@ -41,6 +41,33 @@ class LLMConfig(BaseModel):
         description="Number of retries",
         gt=0  # greater than 0
     )
+    transport: Literal["pydantic_ai", "http"] = Field(
+        default="pydantic_ai",
+        description="Client used for calls: pydantic_ai Agent, or direct HTTP to /chat/completions (plain-string results only)"
+    )
+    structured_output: bool = Field(
+        default=False,
+        description="Constrain plain-string judge output to the EvaluationResponse JSON schema (uses the http transport)"
+    )
+    requests_per_minute: Optional[int] = Field(
+        default=None,
+        description="Requests per minute allowed on the endpoint (None = unlimited)",
+        gt=0
+    )
+    tokens_per_minute: Optional[int] = Field(
+        default=None,
+        description="Prompt + completion tokens per minute allowed on the endpoint (None = unlimited)",
+        gt=0
+    )
+    pack_size: int = Field(
+        default=1,
+        description="Assessment questions packed into one judge call in packed evaluation",
+        gt=0
+    )
+    keep_alive: Optional[str] = Field(
+        default=None,
+        description="Ollama keep-alive hint for the loaded model, e.g. '30m' or '-1' (forever)"
+    )
 
 
     @validator('name')
@@ -60,4 +87,263 @@ class LLMConfig(BaseModel):
     class Config:
         """Pydantic configuration."""
         frozen = True  # Make the class immutable
-        extra = "forbid"  # Prevent extra fields
\ No newline at end of file
+        extra = "forbid"  # Prevent extra fields
+
+
+class HedgingConfig(BaseModel):
+    """Configuration for hedged (duplicated) judge requests."""
+
+    percentile: float = Field(
+        default=95.0,
+        description="Latency percentile of recent requests after which a hedge is sent",
+        gt=0.0,
+        lt=100.0
+    )
+    min_samples: int = Field(
+        default=20,
+        description="Completed requests required before hedging starts",
+        gt=0
+    )
+    window: int = Field(
+        default=200,
+        description="Number of recent latencies used for the percentile",
+        gt=0
+    )
+    min_delay: float = Field(
+        default=0.0,
+        description="Minimum seconds to wait before hedging",
+        ge=0.0
+    )
+
+    class Config:
+        """Pydantic configuration."""
+        frozen = True  # Make the class immutable
+        extra = "forbid"  # Prevent extra fields
+
+
+class ResilienceConfig(BaseModel):
+    """Configuration for transport retries and per-endpoint circuit breakers."""
+
+    max_attempts: int = Field(
+        default=4,
+        description="Maximum attempts per request on transport errors",
+        gt=0
+    )
+    backoff_base: float = Field(
+        default=0.5,
+        description="Backoff before the first retry in seconds (doubles per retry)",
+        gt=0.0
+    )
+    backoff_max: float = Field(
+        default=30.0,
+        description="Maximum backoff in seconds",
+        gt=0.0
+    )
+    failure_threshold: int = Field(
+        default=5,
+        description="Consecutive transport failures that open the circuit",
+        gt=0
+    )
+    reset_timeout: float = Field(
+        default=30.0,
+        description="Seconds the circuit stays open before a trial request",
+        gt=0.0
+    )
+    half_open_max_calls: int = Field(
+        default=1,
+        description="Trial requests allowed while the circuit is half-open",
+        gt=0
+    )
+
+    class Config:
+        """Pydantic configuration."""
+        frozen = True  # Make the class immutable
+        extra = "forbid"  # Prevent extra fields
+
+
+class LLMPoolConfig(BaseModel):
+    """Configuration for one logical judge served by several endpoints."""
+
+    # Required fields
+    judge: LLMConfig = Field(..., description="Judge configuration shared by all endpoints")
+    base_urls: List[str] = Field(
+        ...,
+        description="Base URLs of the endpoints serving the judge model",
+        min_length=1
+    )
+
+    # Optional fields with defaults
+    routing: Literal["least_outstanding", "ewma"] = Field(
+        default="least_outstanding",
+        description="Routing policy: fewest in-flight requests, or EWMA latency weighted by load"
+    )
+    ewma_alpha: float = Field(
+        default=0.3,
+        description="Weight of the newest latency in the EWMA",
+        gt=0.0,
+        le=1.0
+    )
+    max_failures: int = Field(
+        default=3,
+        description="Consecutive failures before an endpoint is ejected",
+        gt=0
+    )
+    cooldown: float = Field(
+        default=30.0,
+        description="Seconds an ejected endpoint stays out of rotation",
+        gt=0
+    )
+    health_check_interval: Optional[float] = Field(
+        default=None,
+        description="Seconds between background health checks (None = disabled)",
+        gt=0
+    )
+    failover_timeout: Optional[float] = Field(
+        default=None,
+        description="Seconds from the start of a request after which it is no longer failed over (None = judge timeout)",
+        gt=0
+    )
+
+    @validator('base_urls')
+    def validate_base_urls(cls, v: List[str]) -> List[str]:
+        """Validate base URL formats and remove duplicates."""
+        urls = []
+        for url in v:
+            if not url.startswith(('http://', 'https://')):
+                raise ValueError("Base URL must start with http:// or https://")
+            url = url.rstrip('/')
+            if url not in urls:
+                urls.append(url)
+        return urls
+
+    def endpoint_configs(self) -> List[LLMConfig]:
+        """One judge configuration per endpoint."""
+        return [self.judge.model_copy(update={"base_url": url}) for url in self.base_urls]
+
+    class Config:
+        """Pydantic configuration."""
+        frozen = True  # Make the class immutable
+        extra = "forbid"  # Prevent extra fields
+
+
+class CascadeConfig(BaseModel):
+    """Configuration for cascade judging: cheap judges first, escalate uncertain items."""
+
+    # Required fields
+    judges: List[LLMConfig] = Field(
+        ...,
+        description="Judges from the cheapest to the most capable",
+        min_length=2
+    )
+
+    # Optional fields with defaults
+    escalate: Dict[Literal["High", "Medium", "Low"], bool] = Field(
+        default={"High": False, "Medium": True, "Low": True},
+        description="Whether a verdict with this confidence is re-judged by the next judge"
+    )
+    escalate_on_failure: bool = Field(
+        default=True,
+        description="Re-judge items whose output could not be parsed or scored, or that failed"
+    )
+    costs: Optional[List[float]] = Field(
+        default=None,
+        description="Relative cost of one call to each judge (None = 1.0 each)"
+    )
+
+    @validator('costs')
+    def validate_costs(cls, v: Optional[List[float]], values) -> Optional[List[float]]:
+        """Validate one non-negative cost per judge."""
+        if v is None:
+            return v
+        if 'judges' in values and len(v) != len(values['judges']):
+            raise ValueError("costs must have one entry per judge")
+        if any(cost < 0 for cost in v):
+            raise ValueError("costs must be non-negative")
+        return v
+
+    def cost_of(self, tier: int) -> float:
+        """Cost of one call to the judge at this position."""
+        return self.costs[tier] if self.costs is not None else 1.0
+
+    class Config:
+        """Pydantic configuration."""
+        frozen = True  # Make the class immutable
+        extra = "forbid"  # Prevent extra fields
+
+
+class SelfConsistencyConfig(BaseModel):
+    """Configuration for adaptive self-consistency sampling of a judge."""
+
+    min_samples: int = Field(
+        default=3,
+        description="Samples always drawn before the stopping rule is checked",
+        gt=0
+    )
+    max_samples: int = Field(
+        default=9,
+        description="Maximum samples drawn per item",
+        gt=0
+    )
+    batch_size: int = Field(
+        default=1,
+        description="Samples drawn per round after the first min_samples",
+        gt=0
+    )
+    confidence: float = Field(
+        default=0.95,
+        description="Posterior probability that the majority verdict is right required to stop early",
+        gt=0.5,
+        lt=1.0
+    )
+
+    @validator('max_samples')
+    def validate_max_samples(cls, v: int, values) -> int:
+        """Validate max_samples is at least min_samples."""
+        if 'min_samples' in values and v < values['min_samples']:
+            raise ValueError("max_samples must be at least min_samples")
+        return v
+
+    class Config:
+        """Pydantic configuration."""
+        frozen = True  # Make the class immutable
+        extra = "forbid"  # Prevent extra fields
+
+
+class LogprobConfig(BaseModel):
+    """Configuration for verdict-only judging from token log probabilities."""
+
+    max_tokens: int = Field(
+        default=3,
+        description="Maximum tokens generated for the verdict",
+        gt=0
+    )
+    top_logprobs: int = Field(
+        default=5,
+        description="Most likely alternatives requested per generated token",
+        gt=0,
+        le=20
+    )
+    medium_threshold: float = Field(
+        default=0.7,
+        description="Probability of the chosen verdict from which confidence is Medium",
+        ge=0.5,
+        le=1.0
+    )
+    high_threshold: float = Field(
+        default=0.9,
+        description="Probability of the chosen verdict from which confidence is High",
+        gt=0.5,
+        le=1.0
+    )
+
+    @validator('high_threshold')
+    def validate_thresholds(cls, v: float, values) -> float:
+        """Validate the High threshold is above the Medium one."""
+        if 'medium_threshold' in values and v <= values['medium_threshold']:
+            raise ValueError("high_threshold must be greater than medium_threshold")
+        return v
+
+    class Config:
+        """Pydantic configuration."""
+        frozen = True  # Make the class immutable
+        extra = "forbid"  # Prevent extra fields
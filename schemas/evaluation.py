@@ -1,6 +1,7 @@
 import json
 import re
 import ast
+from collections import Counter
 from pydantic import BaseModel, Field, field_validator
 from typing import Literal, Dict, Any, Optional, List, ClassVar
 
@@ -30,6 +31,9 @@ class EvaluationResponse(BaseModel):
     # Class variable to store parsing methods
     _parsing_methods: ClassVar[List[callable]] = []
 
+    # Class variable counting which parsing method succeeded, per model
+    _parse_stats: ClassVar[Dict[str, Counter]] = {}
+
     def to_json(self) -> Dict[str, Any]:
         """Convert the Evaluation object to a JSON dictionary."""
         try:
@@ -66,11 +70,56 @@ class EvaluationResponse(BaseModel):
         """
         cls._parsing_methods.append(method)
 
+    @classmethod
+    def response_format(cls) -> Dict[str, Any]:
+        """
+        Structured-output constraint for OpenAI-compatible endpoints (OpenAI and Ollama).
+
+        Returns:
+            dict: `response_format` value holding the JSON schema of EvaluationResponse.
+        """
+        schema = cls.model_json_schema()
+        schema["additionalProperties"] = False
+        return {
+            "type": "json_schema",
+            "json_schema": {"name": "evaluation_response", "schema": schema, "strict": True}
+        }
+
+    @classmethod
+    def parse_stats(cls, model: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Count of evaluations parsed by each parsing method, and the share that
+        needed a fallback parser (anything but plain JSON) or failed.
+
+        Args:
+            model (str): Restrict to one model. Defaults to every model.
+
+        Returns:
+            dict: {"total", "methods", "fallback_rate", "failure_rate"}, or a
+                  dict of those keyed by model name when no model is given.
+        """
+        if model is None:
+            return {name: cls.parse_stats(name) for name in cls._parse_stats}
+        counts = cls._parse_stats.get(model, Counter())
+        total = sum(counts.values())
+        return {
+            "total": total,
+            "methods": dict(counts),
+            "fallback_rate": (total - counts["_parse_json"]) / total if total else 0.0,
+            "failure_rate": counts["failed"] / total if total else 0.0,
+        }
+
+    @classmethod
+    def reset_parse_stats(cls) -> None:
+        """Clear the parse-path counters."""
+        cls._parse_stats.clear()
+
     @classmethod
     def parse_raw_evaluation(
         cls, 
         raw_result: str, 
-        required_keys: Optional[List[str]] = None
+        required_keys: Optional[List[str]] = None,
+        model: Optional[str] = None
     ) -> Optional[Dict[str, Any]]:
         """
         Attempt to parse the input into a dictionary using different parsers 
@@ -80,6 +129,8 @@ class EvaluationResponse(BaseModel):
             raw_result (str): The raw input string to parse.
             required_keys (list): List of keys required in the output dictionary.
                                   Defaults to ["reasoning", "verdict", "confidence"].
+            model (str): Name of the model that produced the input, to record
+                         which parser succeeded in `parse_stats`.
 
         Returns:
             dict: Parsed dictionary if successful and contains all required keys.
@@ -102,14 +153,78 @@ class EvaluationResponse(BaseModel):
             try:
                 parsed_result = method(raw_result)
                 if parsed_result and required_keys_set.issubset(parsed_result.keys()):
+                    if model is not None:
+                        cls._parse_stats.setdefault(model, Counter())[getattr(method, "__name__", "custom")] += 1
                     return parsed_result
             except Exception:
                 # Silently continue to next method
                 continue
 
         # If all parsers fail
+        if model is not None:
+            cls._parse_stats.setdefault(model, Counter())["failed"] += 1
         return None
 
+    @classmethod
+    def parse_raw_evaluations(
+        cls,
+        raw_result: str,
+        count: int
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Parse a JSON array of evaluations answering `count` packed questions.
+
+        Elements are matched to questions by their "question" number (1-based)
+        when present and valid, otherwise by position. Each element is validated
+        against EvaluationResponse; invalid elements are left out so that only
+        those questions need to be asked again.
+
+        Args:
+            raw_result (str): The raw judge output containing a JSON array.
+            count (int): Number of questions in the packed prompt.
+
+        Returns:
+            dict: Validated evaluations keyed by 0-based question position.
+        """
+        elements = cls._extract_json_array(raw_result)
+        evaluations = {}
+        for position, element in enumerate(elements):
+            if not isinstance(element, dict):
+                continue
+            number = element.get("question")
+            if isinstance(number, int) and 1 <= number <= count:
+                position = number - 1
+            if position >= count or position in evaluations:
+                continue
+            try:
+                evaluation = cls(
+                    reasoning=element.get("reasoning", ""),
+                    verdict=str(element.get("verdict", "")).strip().capitalize(),
+                    confidence=str(element.get("confidence", "")).strip().capitalize()
+                )
+            except ValueError:
+                continue
+            evaluations[position] = evaluation.to_json()
+        return evaluations
+
+    @staticmethod
+    def _extract_json_array(raw_result: str) -> List[Any]:
+        """Parse input as a JSON array, or the outermost array found in the text."""
+        try:
+            parsed = json.loads(raw_result)
+        except (json.JSONDecodeError, TypeError):
+            start, end = raw_result.find('['), raw_result.rfind(']')
+            if start == -1 or end <= start:
+                return []
+            try:
+                parsed = json.loads(raw_result[start:end + 1])
+            except json.JSONDecodeError:
+                return []
+        if isinstance(parsed, dict):
+            # A single object answers a single question
+            parsed = [parsed]
+        return parsed if isinstance(parsed, list) else []
+
     @staticmethod
     def _parse_json(raw_result: str) -> Optional[Dict[str, Any]]:
         """Parse input as JSON."""
@@ -218,4 +333,159 @@ class EvaluationResponse(BaseModel):
     class Config:
         """Pydantic configuration for the model."""
         extra = 'forbid'
-        frozen = True
\ No newline at end of file
+        frozen = True
+
+class IncrementalEvaluationParser:
+    """
+    Incremental version of `EvaluationResponse.parse_raw_evaluation` for streamed output.
+
+    Chunks are fed as they arrive. A full parse is only attempted when the text may
+    have just become complete: a closing brace (JSON-like output) or a confidence
+    level after "confidence" (unstructured output).
+    """
+    _CONFIDENCE_PATTERN = re.compile(r'confidence\W*(high|medium|low)\b', re.IGNORECASE)
+
+    def __init__(self, required_keys: Optional[List[str]] = None):
+        """
+        Args:
+            required_keys: Keys that must be present, defaults to
+                           ["reasoning", "verdict", "confidence"]
+        """
+        self.required_keys = required_keys
+        self.text = ""
+        self.result: Optional[Dict[str, Any]] = None
+
+    @property
+    def complete(self) -> bool:
+        return self.result is not None
+
+    def feed(self, chunk: str) -> Optional[Dict[str, Any]]:
+        """
+        Add a chunk of output.
+        
+        Args:
+            chunk: Newly received text
+        
+        Returns:
+            The parsed evaluation once all required keys are complete, else None
+        """
+        if self.result is not None:
+            return self.result
+
+        start = len(self.text)
+        self.text += chunk
+
+        triggered = "}" in chunk
+        if not triggered:
+            # Look back a little so a level split across chunks is still seen
+            tail = self.text[max(0, start - 32):]
+            triggered = self._CONFIDENCE_PATTERN.search(tail) is not None
+
+        if triggered:
+            candidate = self.text
+            if "}" in candidate:
+                candidate = candidate[:candidate.rindex("}") + 1]
+            self.result = EvaluationResponse.parse_raw_evaluation(candidate, self.required_keys)
+        return self.result
+
+
+class EvaluationItem(BaseModel):
+    """A single (question, instruction, response) triple to evaluate"""
+    assessment_question: str = Field(..., description="Assessment question asked to the judge")
+    student_instruction: str = Field(..., description="Instruction given to the student")
+    student_response: str = Field(..., description="Student response to evaluate")
+    student_role: str = Field(default="", description="Optional role given to the student")
+    item_id: Optional[str] = Field(default=None, description="Optional caller-side identifier")
+
+    @classmethod
+    def coerce(cls, item: Any) -> "EvaluationItem":
+        """
+        Build an EvaluationItem from an item, a dict or a
+        (question, instruction, response) tuple or list.
+
+        Raises:
+            TypeError: If the item is of any other type (e.g. a string or a set)
+            ValueError: If a tuple or list does not have exactly three fields
+        """
+        if isinstance(item, cls):
+            return item
+        if isinstance(item, dict):
+            return cls(**item)
+        if not isinstance(item, (tuple, list)):
+            raise TypeError(f"Cannot build an EvaluationItem from {type(item).__name__}")
+        question, instruction, response = item
+        return cls(
+            assessment_question=question,
+            student_instruction=instruction,
+            student_response=response
+        )
+
+    def format_prompt(self, user_prompt_template: str) -> str:
+        """Fill a user prompt template with the item fields."""
+        return user_prompt_template.format(
+            assessment_question=self.assessment_question,
+            student_instruction=self.student_instruction,
+            student_response=self.student_response,
+            student_role=self.student_role
+        )
+
+    class Config:
+        """Pydantic configuration for the model."""
+        extra = 'forbid'
+        frozen = True
+
+
+class EvaluationResult(BaseModel):
+    """Outcome of evaluating a single EvaluationItem"""
+    index: int = Field(..., description="Position of the item in the input")
+    item: Optional[EvaluationItem] = Field(default=None, description="The evaluated item")
+    raw: Optional[str] = Field(default=None, description="Raw judge output")
+    evaluation: Optional[Dict[str, Any]] = Field(default=None, description="Parsed evaluation")
+    score: Optional[float] = Field(default=None, description="Score of the evaluation")
+    error: Optional[str] = Field(default=None, description="Error message if the item failed")
+    status: Literal["ok", "timeout", "parse_error", "error"] = Field(
+        default="ok",
+        description="Outcome: scored, timed out, unparseable judge output or other failure"
+    )
+
+    @property
+    def ok(self) -> bool:
+        """Whether the item was parsed and scored successfully."""
+        return self.status == "ok" and self.score is not None
+
+    @property
+    def timed_out(self) -> bool:
+        """Whether the judge request timed out (worth retrying as is)."""
+        return self.status == "timeout"
+
+
+class PanelResult(BaseModel):
+    """Aggregated outcome of evaluating a single EvaluationItem with a panel of judges"""
+    index: int = Field(..., description="Position of the item in the input")
+    item: Optional[EvaluationItem] = Field(default=None, description="The evaluated item")
+    verdict: Optional[Literal["Pass", "Fail"]] = Field(default=None, description="Panel verdict (None on a tie or without votes)")
+    score: Optional[float] = Field(default=None, description="Aggregated score of the panel")
+    votes: Dict[str, EvaluationResult] = Field(default_factory=dict, description="Result of every judge that was called, by judge name")
+    skipped: List[str] = Field(default_factory=list, description="Judges not needed once the verdict was decided")
+    error: Optional[str] = Field(default=None, description="Error message if the item could not be evaluated")
+
+    @property
+    def ok(self) -> bool:
+        """Whether the panel reached a verdict."""
+        return self.verdict is not None
+
+
+class CascadeResult(EvaluationResult):
+    """Outcome of evaluating a single EvaluationItem through a judge cascade"""
+    judge: Optional[str] = Field(default=None, description="Name of the judge whose result was kept")
+    tier: int = Field(default=0, description="Position of the last judge called in the cascade")
+    escalated: List[EvaluationResult] = Field(default_factory=list, description="Results of the judges that escalated the item")
+    cost: float = Field(default=0.0, description="Total cost of the judge calls made for the item")
+
+
+class SelfConsistencyResult(EvaluationResult):
+    """Outcome of evaluating a single EvaluationItem with repeated judge samples"""
+    votes: Dict[str, int] = Field(default_factory=dict, description="Number of samples per verdict")
+    samples_used: int = Field(default=0, description="Number of samples drawn for the item")
+    stopped_early: bool = Field(default=False, description="Whether sampling stopped before max_samples")
+    agreement: Optional[float] = Field(default=None, description="Posterior probability that the majority verdict is right")
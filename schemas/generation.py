@@ -0,0 +1,45 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, Optional
+
+
+class GenerationResult(BaseModel):
+    """Judge output that was not produced by a live pydantic_ai run (e.g. a cache hit).
+
+    Exposes `data` like pydantic_ai's RunResult so callers can use either.
+    """
+    data: Any = Field(..., description="Generated output, validated against result_type if any")
+    cached: bool = Field(default=False, description="Whether the output was served from cache")
+    evaluation: Optional[Dict[str, Any]] = Field(default=None, description="Evaluation parsed while streaming")
+    stopped_early: bool = Field(default=False, description="Whether generation was cancelled once parsed")
+    output_tokens: Optional[int] = Field(default=None, description="Estimated tokens generated")
+    max_tokens_unused: Optional[int] = Field(default=None, description="max_tokens budget left unused when stopped early (an upper bound on the tokens saved)")
+
+    class Config:
+        """Pydantic configuration for the model."""
+        frozen = True
+
+
+class GenerationTimeout(BaseModel):
+    """Judge request that did not finish before its timeout or its batch deadline.
+
+    Deliberately has no `data`, so it is never mistaken for a generated output.
+    """
+    timeout: float = Field(..., description="Seconds the request was allowed")
+    deadline_exceeded: bool = Field(default=False, description="Whether the batch deadline (not the request timeout) expired")
+
+    class Config:
+        """Pydantic configuration for the model."""
+        frozen = True
+
+
+class GenerationError(BaseModel):
+    """Judge request that failed with an error other than a timeout.
+
+    Deliberately has no `data`, so it is never mistaken for a generated output.
+    """
+    error: str = Field(..., description="Error message")
+    transport: bool = Field(default=False, description="Whether reaching the endpoint failed (connection error, 429, 5xx) rather than its answer being unusable")
+
+    class Config:
+        """Pydantic configuration for the model."""
+        frozen = True
@@ -84,4 +84,27 @@ class ScoreSchemaRVC(BaseModel):
         confidence = ConfidenceLevel.from_string(model_output['confidence'])
         
         score_key = f"{verdict.value}_{confidence.value}"
-        return getattr(self, score_key)
\ No newline at end of file
+        return getattr(self, score_key)
+
+
+class ProbabilityScoreSchema(ScoreSchemaRVC):
+    """Score schema using the judge's probability of Pass when available.
+
+    Evaluations produced from token log probabilities (llm.logprob) carry a
+    `p_pass` entry; it is used as a continuous score between 0 and 1. Other
+    evaluations fall back to the verdict-confidence scores.
+    """
+
+    def get_score(self, model_output: Dict[str, str]) -> float:
+        """Get the score from a model output dictionary.
+        
+        Args:
+            model_output: Dictionary with keys 'verdict', 'confidence' and optionally 'p_pass'
+
+        Returns:
+            float: Score between 0 and 1
+        """
+        p_pass = model_output.get('p_pass')
+        if p_pass is not None:
+            return float(p_pass)
+        return super().get_score(model_output)
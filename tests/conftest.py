@@ -0,0 +1,29 @@
+import socket
+
+import pytest
+
+from schemas.config import LLMConfig
+from tools.mock_server import MockServerConfig, serve_in_process
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(scope="session")
+def mock_server():
+    """Mock OpenAI-compatible judge server answering in JSON, shared by the session."""
+    config = MockServerConfig(port=free_port(), latency=0.01, output_format="json", models=["judge-a", "judge-b"])
+    server = serve_in_process(config)
+    yield f"http://{config.host}:{config.port}/v1"
+    server.terminate()
+
+
+@pytest.fixture
+def judge_config(mock_server):
+    """Build an LLMConfig of a judge served by the mock server."""
+    def make(name="judge-a", **kwargs):
+        return LLMConfig(name=name, base_url=mock_server, platform="openai", api_key="test", **kwargs)
+    return make
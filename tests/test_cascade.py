@@ -0,0 +1,23 @@
+import asyncio
+
+from llm.cascade import CascadeJudge
+from schemas.config import CascadeConfig
+
+ITEM = ("Is the response polite?", "Write a greeting.", "Hello there!")
+TEMPLATE = "{assessment_question}\n{student_instruction}\n{student_response}"
+
+
+def test_cascade_with_default_arguments_decides_on_the_cheap_judge(judge_config):
+    cascade_config = CascadeConfig(
+        judges=[judge_config("judge-a"), judge_config("judge-b")],
+        escalate={"High": False, "Medium": False, "Low": False}
+    )
+
+    async def run():
+        async with CascadeJudge(cascade_config) as cascade:
+            return [result async for result in cascade.evaluate_many([ITEM] * 4, TEMPLATE)], cascade.stats()
+
+    results, stats = asyncio.run(run())
+
+    assert all(result.ok and result.tier == 0 for result in results)
+    assert stats["escalation_rate"] == 0.0
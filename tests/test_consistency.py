@@ -0,0 +1,44 @@
+import asyncio
+from types import SimpleNamespace
+
+from llm.consistency import SelfConsistencyJudge
+from schemas.config import SelfConsistencyConfig
+from schemas.evaluation import EvaluationItem
+
+
+class UnparseableAgent:
+    """Judge stub whose samples never contain an evaluation."""
+
+    def __init__(self):
+        self.config = SimpleNamespace(name="stub", temperature=0.7)
+
+    async def generate_samples(self, prompt, system_prompt=None, n=1):
+        return ["I cannot evaluate this response."] * n
+
+
+ITEM = ("Is the response polite?", "Write a greeting.", "Hello there!")
+TEMPLATE = "{assessment_question}\n{student_instruction}\n{student_response}"
+
+
+def test_evaluate_item_with_no_parseable_sample_returns_error():
+    judge = SelfConsistencyJudge(UnparseableAgent(), SelfConsistencyConfig(min_samples=3, max_samples=5))
+
+    result = asyncio.run(judge.evaluate_item(EvaluationItem.coerce(ITEM), TEMPLATE, index=4))
+
+    assert result.status == "error"
+    assert result.error == "No judge sample could be parsed"
+    assert result.index == 4
+    assert result.samples_used == 5
+    assert result.votes == {"Pass": 0, "Fail": 0}
+
+
+def test_evaluate_many_keeps_going_when_no_sample_parses():
+    judge = SelfConsistencyJudge(UnparseableAgent(), SelfConsistencyConfig(min_samples=3, max_samples=3))
+
+    async def collect():
+        return [result async for result in judge.evaluate_many([ITEM] * 4, TEMPLATE, max_concurrency=2)]
+
+    results = asyncio.run(collect())
+
+    assert sorted(result.index for result in results) == [0, 1, 2, 3]
+    assert all(result.status == "error" for result in results)
@@ -0,0 +1,17 @@
+import pytest
+
+from schemas.evaluation import EvaluationItem
+
+
+def test_coerce_accepts_tuples_lists_dicts_and_items():
+    item = EvaluationItem.coerce(("Question?", "Instruction", "Response"))
+
+    assert EvaluationItem.coerce(["Question?", "Instruction", "Response"]) == item
+    assert EvaluationItem.coerce(item.model_dump()) == item
+    assert EvaluationItem.coerce(item) is item
+
+
+@pytest.mark.parametrize("raw_item", ["abc", {"a", "b", "c"}, iter(("q", "i", "r")), None])
+def test_coerce_rejects_other_types(raw_item):
+    with pytest.raises(TypeError):
+        EvaluationItem.coerce(raw_item)
@@ -0,0 +1,52 @@
+import asyncio
+
+from llm.hedging import Hedger
+from schemas.config import HedgingConfig
+
+
+def warmed_hedger():
+    """Hedger whose hedge delay is about 20ms."""
+    hedger = Hedger(HedgingConfig(min_samples=1, min_delay=0.02))
+    hedger._recent.append(0.001)
+    return hedger
+
+
+def test_time_queued_for_a_slot_does_not_trigger_a_hedge():
+    hedger = warmed_hedger()
+
+    async def run():
+        started = asyncio.Event()
+
+        async def primary():
+            await asyncio.sleep(0.1)  # waiting for rate limits or a concurrency slot
+            started.set()
+            await asyncio.sleep(0.005)
+            return "primary"
+
+        async def backup():
+            return "backup"
+
+        return await hedger.run(primary, backup, started=started)
+
+    assert asyncio.run(run()) == "primary"
+    assert hedger.stats()["hedges"] == 0
+
+
+def test_slow_request_is_hedged_once_sent():
+    hedger = warmed_hedger()
+
+    async def run():
+        started = asyncio.Event()
+
+        async def primary():
+            started.set()
+            await asyncio.sleep(1)
+            return "primary"
+
+        async def backup():
+            return "backup"
+
+        return await hedger.run(primary, backup, started=started)
+
+    assert asyncio.run(run()) == "backup"
+    assert hedger.stats()["hedges"] == 1
@@ -0,0 +1,39 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+from llm.evaluator import evaluate_packed
+from schemas.generation import GenerationResult
+
+ANSWER = {"reasoning": "Polite and short.", "verdict": "Pass", "confidence": "High"}
+
+
+class PackShyAgent:
+    """Judge stub that cannot answer packed prompts but answers single questions."""
+
+    def __init__(self):
+        self.config = SimpleNamespace(name="stub", pack_size=3)
+        self.calls = []
+
+    async def generate(self, prompt, system_prompt=None, use_cache=True):
+        questions = sum(line.startswith(("1. ", "2. ", "3. ")) for line in prompt.splitlines())
+        self.calls.append((questions, use_cache))
+        if questions > 1:
+            return GenerationResult(data="I will answer each question in turn.")
+        return GenerationResult(data=json.dumps([ANSWER]))
+
+
+ITEMS = [(f"Question {i}?", "Write a greeting.", "Hello there!") for i in range(3)]
+TEMPLATE = "{assessment_questions}\n{student_instruction}\n{student_response}"
+
+
+def test_unparseable_pack_is_reasked_one_question_per_call_without_cache():
+    agent = PackShyAgent()
+
+    async def run():
+        return [result async for result in evaluate_packed(agent, ITEMS, TEMPLATE, max_reasks=1)]
+
+    results = asyncio.run(run())
+
+    assert all(result.ok for result in results)
+    assert agent.calls == [(3, True), (1, False), (1, False), (1, False)]
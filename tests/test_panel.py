@@ -0,0 +1,19 @@
+import asyncio
+
+from llm.panel import JudgePanel
+from schemas.evaluation import EvaluationItem
+
+ITEM = ("Is the response polite?", "Write a greeting.", "Hello there!")
+TEMPLATE = "{assessment_question}\n{student_instruction}\n{student_response}"
+
+
+def test_panel_with_default_arguments_reaches_verdicts(judge_config):
+    async def run():
+        async with JudgePanel([judge_config("judge-a"), judge_config("judge-b"), judge_config("judge-a")]) as panel:
+            return [result async for result in panel.evaluate_many([ITEM] * 3, TEMPLATE)]
+
+    results = asyncio.run(run())
+
+    assert len(results) == 3
+    assert all(result.verdict in ("Pass", "Fail") for result in results)
+    assert all(vote.ok for result in results for vote in result.votes.values())
@@ -0,0 +1,38 @@
+import asyncio
+
+from llm.pool import LLMAgentPool
+from llm.singleflight import SingleFlight
+from schemas.config import LLMPoolConfig
+
+
+def pool_config(judge_config, mock_server):
+    # Two endpoints of the same mock server
+    return LLMPoolConfig(
+        judge=judge_config(),
+        base_urls=[mock_server, mock_server.replace("127.0.0.1", "localhost")]
+    )
+
+
+def test_pool_with_default_arguments_keeps_endpoints_healthy(judge_config, mock_server):
+    async def run():
+        async with LLMAgentPool(pool_config(judge_config, mock_server)) as pool:
+            responses = await asyncio.gather(*(pool.generate(f"Prompt {i}") for i in range(6)))
+            return responses, pool.metrics()
+
+    responses, metrics = asyncio.run(run())
+
+    assert all(hasattr(response, "data") for response in responses)
+    assert all(metrics[url]["failures"] == 0 and metrics[url]["requests"] > 0 for url in pool_config(judge_config, mock_server).base_urls)
+
+
+def test_pool_coalesces_identical_requests_across_endpoints(judge_config, mock_server):
+    async def run():
+        async with LLMAgentPool(pool_config(judge_config, mock_server), single_flight=SingleFlight()) as pool:
+            responses = await asyncio.gather(*(pool.generate("Same prompt") for _ in range(4)))
+            return responses, pool.metrics()
+
+    responses, metrics = asyncio.run(run())
+
+    assert all(hasattr(response, "data") for response in responses)
+    assert metrics["single_flight"]["executed"] == 1
+    assert metrics["single_flight"]["coalesced"] == 3
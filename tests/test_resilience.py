@@ -0,0 +1,72 @@
+import asyncio
+
+import httpx
+import pytest
+
+from llm.deadline import DeadlineExceeded
+from llm.resilience import CircuitBreaker, CircuitOpenError, Resilience
+from schemas.config import ResilienceConfig
+
+URL = "http://judge/v1"
+
+
+def half_open_resilience():
+    """Resilience whose breaker for URL is half-open with one trial slot."""
+    resilience = Resilience(ResilienceConfig(max_attempts=1, failure_threshold=1, reset_timeout=0.01))
+
+    async def down():
+        raise httpx.ConnectError("connection refused")
+
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(resilience.call(URL, down))
+    asyncio.run(asyncio.sleep(0.02))
+    assert resilience.breaker(URL).state == CircuitBreaker.HALF_OPEN
+    return resilience
+
+
+async def answer():
+    return "answer"
+
+
+def test_cancelled_trial_gives_back_its_half_open_slot():
+    resilience = half_open_resilience()
+
+    async def cancel_trial():
+        task = asyncio.ensure_future(resilience.call(URL, lambda: asyncio.sleep(10)))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_trial())
+
+    assert resilience.breaker(URL).state == CircuitBreaker.HALF_OPEN
+    assert asyncio.run(resilience.call(URL, answer)) == "answer"
+    assert resilience.breaker(URL).state == CircuitBreaker.CLOSED
+
+
+def test_expired_deadline_does_not_close_the_breaker():
+    resilience = half_open_resilience()
+
+    async def expired():
+        raise DeadlineExceeded(1.0)
+
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(resilience.call(URL, expired))
+
+    breaker = resilience.breaker(URL)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.metrics()["successes"] == 0
+    assert asyncio.run(resilience.call(URL, answer)) == "answer"
+
+
+def test_open_breaker_rejects_calls():
+    resilience = Resilience(ResilienceConfig(max_attempts=1, failure_threshold=1, reset_timeout=30))
+
+    async def down():
+        raise httpx.ConnectError("connection refused")
+
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(resilience.call(URL, down))
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(resilience.call(URL, answer))
@@ -0,0 +1,358 @@
+"""
+Deterministic mock LLM server for load tests and benchmarks (stdlib only).
+
+Serves the OpenAI-compatible API used by LLMAgent (`/v1/chat/completions`,
+JSON or streamed, with `n` and `logprobs`; `/v1/models`) and the Ollama native
+calls used for warm-up and benchmarks (`/api/tags`, `/api/generate`,
+`/api/chat`). Judge outputs are generated from a template in each format the
+parsers handle:
+
+- "json": clean JSON object
+- "blob": JSON object embedded in prose
+- "text": unstructured "Reasoning: ... Verdict: ... Confidence: ..."
+- "mixed": one of the above per completion
+
+Requests with a `response_format` always get clean JSON. Latency (time to first
+token, lognormal around the median), decode speed, error rate and number of
+concurrent generation slots are configurable. Completion texts depend only on
+the seed and the request body (and how many times that body was seen), never on
+timing; latency and error draws follow the seeded sequence of requests.
+
+Usage:
+    python -m tools.mock_server --port 8000 --latency 0.2 --tokens-per-second 50 --slots 4
+"""
+import json
+import math
+import time
+import random
+import socket
+import asyncio
+import hashlib
+import argparse
+import multiprocessing
+from collections import Counter
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, List, Optional, Tuple
+
+
+FORMATS = ("json", "blob", "text")
+
+WORDS = (
+    "the response addresses the instruction and covers the requested points with "
+    "clear structure relevant examples and a consistent tone although some details "
+    "could be more specific the student follows the required format and stays on topic"
+).split()
+
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 429: "Too Many Requests", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+@dataclass
+class MockServerConfig:
+    """Behaviour of the mock server."""
+    host: str = "127.0.0.1"
+    port: int = 8000
+    models: List[str] = field(default_factory=lambda: ["mock"])
+    output_format: str = "mixed"
+    output_tokens: int = 60
+    pass_rate: float = 0.7
+    latency: float = 0.05
+    latency_sigma: float = 0.0
+    tokens_per_second: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 500
+    slots: int = 0
+    seed: int = 0
+
+    def __post_init__(self):
+        if self.output_format not in FORMATS + ("mixed",):
+            raise ValueError(f"Unknown output format: {self.output_format}")
+
+
+def judge_output(rng: random.Random, output_format: str, output_tokens: int, pass_rate: float) -> Tuple[str, Dict[str, str]]:
+    """
+    Generate one judge output.
+
+    Args:
+        rng: Random generator of the completion
+        output_format: "json", "blob", "text" or "mixed"
+        output_tokens: Approximate length of the reasoning in words
+        pass_rate: Probability of a Pass verdict
+
+    Returns:
+        (raw output, evaluation it encodes)
+    """
+    evaluation = {
+        "reasoning": " ".join(rng.choice(WORDS) for _ in range(max(1, output_tokens))).capitalize() + ".",
+        "verdict": "Pass" if rng.random() < pass_rate else "Fail",
+        "confidence": rng.choice(["High", "High", "Medium", "Low"]),
+    }
+    if output_format == "mixed":
+        output_format = rng.choice(FORMATS)
+    if output_format == "json":
+        return json.dumps(evaluation), evaluation
+    if output_format == "blob":
+        return f"Here is my evaluation of the student response:\n{json.dumps(evaluation)}\nLet me know if you need more details.", evaluation
+    return (
+        f"Reasoning: {evaluation['reasoning']}\n"
+        f"Verdict: {evaluation['verdict']}\n"
+        f"Confidence: {evaluation['confidence']}"
+    ), evaluation
+
+
+class MockLLMServer:
+    """
+    asyncio HTTP/1.1 server emulating an OpenAI-compatible / Ollama judge endpoint.
+    """
+
+    def __init__(self, config: Optional[MockServerConfig] = None):
+        self.config = config or MockServerConfig()
+        self._rng = random.Random(self.config.seed)
+        self._seen: Counter = Counter()
+        self._slots = asyncio.Semaphore(self.config.slots) if self.config.slots else None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._stats = {"requests": 0, "errors": 0, "in_flight": 0, "max_in_flight": 0}
+
+    @property
+    def url(self) -> str:
+        """OpenAI-compatible base URL of the server."""
+        return f"http://{self.config.host}:{self.config.port}/v1"
+
+    async def start(self) -> "MockLLMServer":
+        self._server = await asyncio.start_server(self._handle, self.config.host, self.config.port)
+        if not self.config.port:
+            self.config.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def __aenter__(self) -> "MockLLMServer":
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.stop()
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self._stats)
+
+    # HTTP plumbing
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                method, path, _ = request_line.split(" ", 2)
+                headers = {}
+                for line in header_lines:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                await self._route(method, path.split("?")[0], body, writer)
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int, payload: Any, extra_headers: str = "") -> None:
+        data = json.dumps(payload).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {STATUS_TEXT.get(status, 'Error')}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\n{extra_headers}\r\n".encode() + data
+        )
+        await writer.drain()
+
+    async def _route(self, method: str, path: str, body: bytes, writer: asyncio.StreamWriter) -> None:
+        try:
+            request = json.loads(body) if body else {}
+        except json.JSONDecodeError:
+            return await self._respond(writer, 400, {"error": {"message": "Invalid JSON body"}})
+
+        if method == "GET" and path in ("/v1/models", "/models"):
+            return await self._respond(writer, 200, {
+                "object": "list", "data": [{"id": name, "object": "model"} for name in self.config.models]
+            })
+        if method == "GET" and path == "/api/tags":
+            return await self._respond(writer, 200, {"models": [{"name": name, "model": name} for name in self.config.models]})
+        if method == "POST" and path in ("/v1/chat/completions", "/chat/completions", "/api/chat", "/api/generate"):
+            return await self._generate(path, request, body, writer)
+        return await self._respond(writer, 404, {"error": {"message": f"No route for {method} {path}"}})
+
+    # Generation
+
+    def _completion_rng(self, body: bytes, choice: int) -> random.Random:
+        """Random generator depending only on the seed, the body, its occurrence and the choice index."""
+        digest = hashlib.sha256(body).hexdigest()
+        return random.Random(f"{self.config.seed}:{digest}:{self._seen[digest]}:{choice}")
+
+    def _latency(self) -> float:
+        if self.config.latency_sigma <= 0:
+            return self.config.latency
+        return self.config.latency * math.exp(self._rng.gauss(0.0, self.config.latency_sigma))
+
+    def _decode_time(self, tokens: int) -> float:
+        return tokens / self.config.tokens_per_second if self.config.tokens_per_second > 0 else 0.0
+
+    async def _generate(self, path: str, request: Dict[str, Any], body: bytes, writer: asyncio.StreamWriter) -> None:
+        self._stats["requests"] += 1
+        if path == "/api/generate" and not request.get("prompt"):
+            # Ollama load / unload request
+            reason = "unload" if request.get("keep_alive") in (0, "0") else "load"
+            await asyncio.sleep(self._latency())
+            return await self._respond(writer, 200, {"model": request.get("model"), "response": "", "done": True, "done_reason": reason})
+
+        if self._rng.random() < self.config.error_rate:
+            self._stats["errors"] += 1
+            retry_after = "Retry-After: 1\r\n" if self.config.error_status == 429 else ""
+            return await self._respond(writer, self.config.error_status, {"error": {"message": "Mock server error"}}, retry_after)
+
+        digest = hashlib.sha256(body).hexdigest()
+        self._seen[digest] += 1
+        n = max(1, int(request.get("n") or 1)) if path.endswith("/chat/completions") else 1
+        output_format = "json" if request.get("response_format") or request.get("format") else self.config.output_format
+        max_tokens = request.get("max_tokens") or (request.get("options") or {}).get("num_predict")
+        choices = []
+        for index in range(n):
+            rng = self._completion_rng(body, index)
+            if request.get("logprobs"):
+                choices.append(self._verdict_choice(rng, index))
+                continue
+            text, _ = judge_output(rng, output_format, self.config.output_tokens, self.config.pass_rate)
+            words = text.split(" ")
+            if max_tokens and len(words) > max_tokens:
+                text = " ".join(words[:max_tokens])
+            choices.append({"index": index, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"})
+
+        prompt_tokens = sum(len(str(m.get("content", "")).split()) for m in request.get("messages", [])) or len(str(request.get("prompt", "")).split())
+        completion_tokens = sum(len(c["message"]["content"].split()) for c in choices)
+
+        if self._slots is not None:
+            await self._slots.acquire()
+        self._stats["in_flight"] += 1
+        self._stats["max_in_flight"] = max(self._stats["max_in_flight"], self._stats["in_flight"])
+        try:
+            await asyncio.sleep(self._latency())
+            if request.get("stream") and path.endswith("/chat/completions"):
+                return await self._stream(request, choices[0]["message"]["content"], writer)
+            await asyncio.sleep(self._decode_time(completion_tokens))
+        finally:
+            self._stats["in_flight"] -= 1
+            if self._slots is not None:
+                self._slots.release()
+
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens}
+        content = choices[0]["message"]["content"]
+        if path == "/api/chat":
+            return await self._respond(writer, 200, {
+                "model": request.get("model"), "message": {"role": "assistant", "content": content}, "done": True,
+                "prompt_eval_count": prompt_tokens, "prompt_eval_duration": int(self.config.latency * 1e9),
+                "eval_count": completion_tokens, "eval_duration": int(self._decode_time(completion_tokens) * 1e9),
+            })
+        if path == "/api/generate":
+            return await self._respond(writer, 200, {"model": request.get("model"), "response": content, "done": True})
+        return await self._respond(writer, 200, {
+            "id": f"mock-{digest[:12]}", "object": "chat.completion", "created": int(time.time()),
+            "model": request.get("model"), "choices": choices, "usage": usage,
+        })
+
+    def _verdict_choice(self, rng: random.Random, index: int) -> Dict[str, Any]:
+        """One-word verdict with OpenAI-style token logprobs."""
+        p_pass = min(max(rng.betavariate(2, 1) if rng.random() < self.config.pass_rate else rng.betavariate(1, 2), 1e-6), 1 - 1e-6)
+        verdict = "Pass" if p_pass >= 0.5 else "Fail"
+        top = [{"token": "Pass", "logprob": math.log(p_pass)}, {"token": "Fail", "logprob": math.log(1 - p_pass)}]
+        top.sort(key=lambda t: -t["logprob"])
+        return {
+            "index": index,
+            "message": {"role": "assistant", "content": verdict},
+            "logprobs": {"content": [{"token": verdict, "logprob": top[0]["logprob"], "top_logprobs": top}]},
+            "finish_reason": "stop",
+        }
+
+    async def _stream(self, request: Dict[str, Any], text: str, writer: asyncio.StreamWriter) -> None:
+        """Send the completion as server-sent events, one word per chunk, at the configured speed."""
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nTransfer-Encoding: chunked\r\n\r\n")
+        delay = self._decode_time(1)
+        words = text.split(" ")
+        for position, word in enumerate(words):
+            chunk = {
+                "id": "mock", "object": "chat.completion.chunk", "created": int(time.time()), "model": request.get("model"),
+                "choices": [{"index": 0, "delta": {"role": "assistant", "content": word if position == 0 else " " + word}, "finish_reason": None}],
+            }
+            data = f"data: {json.dumps(chunk)}\n\n".encode()
+            writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            await writer.drain()
+            if delay:
+                await asyncio.sleep(delay)
+        data = b"data: [DONE]\n\n"
+        writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n0\r\n\r\n")
+        await writer.drain()
+
+
+def _serve(config: MockServerConfig) -> None:
+    asyncio.run(MockLLMServer(config).serve_forever())
+
+
+def serve_in_process(config: MockServerConfig, timeout: float = 10.0) -> multiprocessing.Process:
+    """
+    Run the mock server in a child process (so it does not use the caller's CPU)
+    and wait until it accepts connections.
+
+    Args:
+        config: Server configuration (a fixed port is required)
+        timeout: Seconds to wait for the server to start
+
+    Returns:
+        The server process; call `terminate()` to stop it
+    """
+    process = multiprocessing.Process(target=_serve, args=(config,), daemon=True)
+    process.start()
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with socket.create_connection((config.host, config.port), timeout=0.5):
+                return process
+        except OSError:
+            if time.monotonic() > deadline or not process.is_alive():
+                process.terminate()
+                raise RuntimeError(f"Mock server did not start on {config.host}:{config.port}")
+            time.sleep(0.05)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    defaults = MockServerConfig()
+    parser.add_argument("--host", default=defaults.host)
+    parser.add_argument("--port", type=int, default=defaults.port)
+    parser.add_argument("--models", nargs="+", default=defaults.models, help="Model names listed by the server")
+    parser.add_argument("--output-format", choices=FORMATS + ("mixed",), default=defaults.output_format)
+    parser.add_argument("--output-tokens", type=int, default=defaults.output_tokens, help="Words of reasoning per output")
+    parser.add_argument("--pass-rate", type=float, default=defaults.pass_rate)
+    parser.add_argument("--latency", type=float, default=defaults.latency, help="Median seconds to first token")
+    parser.add_argument("--latency-sigma", type=float, default=defaults.latency_sigma, help="Lognormal spread of the latency (0 = fixed)")
+    parser.add_argument("--tokens-per-second", type=float, default=defaults.tokens_per_second, help="Decode speed (0 = instant)")
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate)
+    parser.add_argument("--error-status", type=int, default=defaults.error_status)
+    parser.add_argument("--slots", type=int, default=defaults.slots, help="Concurrent generations (0 = unlimited)")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    config = MockServerConfig(**{k: v for k, v in vars(parser.parse_args()).items()})
+    print(f"Mock LLM server on http://{config.host}:{config.port}/v1 ({json.dumps(asdict(config))})")
+    try:
+        _serve(config)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+import math
+
+
+def percentile(values, q):
+    """
+    Compute a percentile with linear interpolation.
+
+    Args:
+        values (iterable): Sample values.
+        q (float): Percentile between 0 and 100.
+
+    Returns:
+        float: The percentile, or None if there are no values.
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    rank = (len(ordered) - 1) * q / 100.0
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)